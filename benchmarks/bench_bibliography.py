@@ -0,0 +1,134 @@
+"""Benchmarks for BibliographyIndex lookups on a synthetic bibliography.
+
+Run from the repository root with ``python benchmarks/bench_bibliography.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from synthetic import synthetic_entries
+
+from lit_wiki.bibliography import BibliographyIndex
+from lit_wiki.models import BibliographyEntry, BibliographyQuery
+from lit_wiki.utils import normalize_text
+
+
+def _linear_same_author_entries(index: BibliographyIndex, citekey: str, limit: int = 5) -> list[BibliographyEntry]:
+    source = index.get(citekey)
+    if source is None:
+        return []
+    target_surnames = {normalize_text(person.surname) for person in source.authors}
+    related: list[BibliographyEntry] = []
+    for candidate in index.entries.values():
+        if candidate.citekey == citekey:
+            continue
+        candidate_surnames = {normalize_text(person.surname) for person in candidate.authors}
+        if target_surnames and target_surnames & candidate_surnames:
+            related.append(candidate)
+    related.sort(key=lambda entry: (entry.year, entry.title))
+    return related[:limit]
+
+
+def _timed(label: str, fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{label:<40} {elapsed * 1000:10.3f} ms")
+    return elapsed
+
+
+def bench_same_author(index: BibliographyIndex, samples: list[str]) -> None:
+    linear_samples = samples[:20]
+    for citekey in linear_samples:
+        expected = [entry.citekey for entry in _linear_same_author_entries(index, citekey)]
+        actual = [entry.citekey for entry in index.same_author_entries(citekey)]
+        assert expected == actual, citekey
+    linear = _timed("same_author_entries (linear scan)", lambda: [_linear_same_author_entries(index, key) for key in linear_samples], 1) / len(linear_samples)
+    indexed = _timed("same_author_entries (surname index)", lambda: [index.same_author_entries(key) for key in samples], 1) / len(samples)
+    print(f"{'per lookup: linear / indexed':<40} {linear * 1000:.3f} ms / {indexed * 1000:.4f} ms ({linear / indexed:.0f}x)")
+
+
+def _perturb_title(rng: random.Random, title: str) -> str:
+    words = title.split()
+    if rng.random() < 0.5 and len(words) > 4:
+        words = words[: max(3, int(len(words) * 0.6))]
+    else:
+        position = rng.randrange(len(words))
+        word = words[position]
+        if len(word) > 3:
+            cut = rng.randrange(1, len(word) - 1)
+            words[position] = word[:cut] + word[cut + 1:]
+    return " ".join(words)
+
+
+def bench_title_candidates(index: BibliographyIndex, samples: list[str]) -> None:
+    rng = random.Random(5)
+    queries = [(citekey, _perturb_title(rng, index.entries[citekey].title)) for citekey in samples]
+    elapsed = _timed("find_title_candidates (all samples)", lambda: [index.find_title_candidates(query) for _key, query in queries], 1)
+    hits = 0
+    for citekey, query in queries:
+        candidates = index.find_title_candidates(query, limit=1)
+        if candidates and candidates[0][0].citekey == citekey:
+            hits += 1
+    print(f"{'per fuzzy title lookup':<40} {elapsed / len(queries) * 1000:10.3f} ms")
+    print(f"{'fuzzy title recall@1 (perturbed)':<40} {hits / len(queries):10.3f}")
+
+
+def _linear_query(index: BibliographyIndex, query: BibliographyQuery) -> list[BibliographyEntry]:
+    keywords = [normalize_text(keyword) for keyword in query.keywords]
+    types = {entry_type.lower() for entry_type in query.entry_types}
+    matches = []
+    for entry in index.entries.values():
+        year = int(entry.year) if entry.year else None
+        if query.year_from is not None and (year is None or year < query.year_from):
+            continue
+        if query.year_to is not None and (year is None or year > query.year_to):
+            continue
+        if types and entry.entry_type.lower() not in types:
+            continue
+        entry_keywords = {normalize_text(keyword) for keyword in entry.keywords}
+        if any(keyword not in entry_keywords for keyword in keywords):
+            continue
+        if query.publisher and normalize_text(entry.publisher) != normalize_text(query.publisher):
+            continue
+        matches.append(entry)
+    return matches
+
+
+def bench_query(index: BibliographyIndex) -> None:
+    queries = [
+        BibliographyQuery(year_from=2015, year_to=2020, keywords=["BIM"], entry_types=["article"]),
+        BibliographyQuery(year_from=1990, keywords=["Learning", "Skills"]),
+        BibliographyQuery(entry_types=["book", "report"], publisher="Routledge"),
+        BibliographyQuery(year_to=1970),
+    ]
+    for query in queries:
+        expected = [entry.citekey for entry in _linear_query(index, query)]
+        assert [entry.citekey for entry in index.query(query)] == expected, query
+    linear = _timed("query (linear scan, 4 queries)", lambda: [_linear_query(index, query) for query in queries], 3)
+    indexed = _timed("query (facet indexes, 4 queries)", lambda: [index.query(query) for query in queries], 20)
+    print(f"{'per query: linear / indexed':<40} {linear / 4 * 1000:.3f} ms / {indexed / 4 * 1000:.3f} ms ({linear / indexed:.0f}x)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=50_000)
+    parser.add_argument("--samples", type=int, default=500)
+    args = parser.parse_args()
+
+    entries = synthetic_entries(args.entries)
+    start = time.perf_counter()
+    index = BibliographyIndex(entries)
+    print(f"{'build index (' + str(args.entries) + ' entries)':<40} {(time.perf_counter() - start) * 1000:10.3f} ms")
+    samples = random.Random(11).sample(list(index.entries), min(args.samples, len(index.entries)))
+    bench_same_author(index, samples)
+    bench_title_candidates(index, samples)
+    bench_query(index)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Peak memory and time of ``extract_to_file`` on a large synthetic book.
+
+Writes ``--pages`` pages of page-extracted prose as a markdown source and extracts it under
+tracemalloc. The cleaner works block by block, so the peak above the raw and cleaned text
+should stay roughly flat as ``--pages`` grows. ftfy only sees lines that are not plain ASCII,
+so ``--accented-share`` sets how much of the text goes through it.
+
+Run from the repository root with ``python benchmarks/bench_clean_stream.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from synthetic import synthetic_book_text
+
+from lit_wiki.extraction import extract_to_file
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, nargs="+", default=[250, 1000, 4000])
+    parser.add_argument("--accented-share", type=float, default=0.0, help="share of lines that are not pure ASCII")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        for pages in args.pages:
+            source = root / f"book-{pages}.md"
+            source.write_text(synthetic_book_text(pages, accented_share=args.accented_share), encoding="utf-8")
+            raw_bytes = source.stat().st_size
+            gc.collect()
+
+            tracemalloc.start()
+            started = time.perf_counter()
+            text = extract_to_file(source, root / "extracted" / f"book-{pages}.md")
+            elapsed = time.perf_counter() - started
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            print(
+                f"pages={pages:<6} raw {raw_bytes / 2**20:6.1f} MiB  cleaned {len(text) / 2**20:6.1f} MiB  "
+                f"peak {peak / 2**20:7.1f} MiB ({peak / raw_bytes:.2f}x raw)  {elapsed:6.2f} s"
+            )
+            del text
+
+
+if __name__ == "__main__":
+    main()
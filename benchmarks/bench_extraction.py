@@ -0,0 +1,51 @@
+"""Extraction cost with and without the content-addressed extraction cache.
+
+Run from the repository root with ``python benchmarks/bench_extraction.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic import synthetic_pdf
+
+from lit_wiki.extraction import extract_to_file
+from lit_wiki.utils import file_sha256
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        source = root / "synthetic.pdf"
+        source.write_bytes(synthetic_pdf(args.pages))
+        cache_dir = root / "cache" / "extraction"
+        print(f"pages: {args.pages} ({source.stat().st_size / 2**20:.1f} MiB)")
+
+        started = time.perf_counter()
+        expected = extract_to_file(source, root / "uncached.md")
+        print(f"  uncached extract:     {time.perf_counter() - started:8.3f} s")
+
+        started = time.perf_counter()
+        raw_hash = file_sha256(source)
+        cold = extract_to_file(source, root / "cold.md", raw_hash, cache_dir, 2**30)
+        print(f"  hash + cache miss:    {time.perf_counter() - started:8.3f} s")
+
+        best = float("inf")
+        for repeat in range(args.repeats):
+            started = time.perf_counter()
+            warm = extract_to_file(source, root / f"warm-{repeat}.md", file_sha256(source), cache_dir, 2**30)
+            best = min(best, time.perf_counter() - started)
+        print(f"  hash + cache hit:     {best:8.3f} s")
+        assert expected == cold == warm
+
+
+if __name__ == "__main__":
+    main()
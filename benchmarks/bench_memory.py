@@ -0,0 +1,65 @@
+"""Memory footprint of a parsed BibliographyIndex built from a synthetic .bib file.
+
+Run from the repository root with ``python benchmarks/bench_memory.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import resource
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from synthetic import synthetic_bibtex
+
+from lit_wiki.bibliography import parse_bibliography
+
+
+def _resident_bytes() -> int:
+    try:
+        with open("/proc/self/statm", encoding="ascii") as handle:
+            pages = int(handle.read().split()[1])
+        return pages * resource.getpagesize()
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _unique_people(index) -> tuple[int, int]:
+    references = [person for entry in index.entries.values() for person in entry.authors + entry.editors]
+    return len(references), len({id(person) for person in references})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=50_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        bib_path = Path(tmpdir) / "synthetic.bib"
+        bib_path.write_text(synthetic_bibtex(args.entries), encoding="utf-8")
+        gc.collect()
+
+        resident_before = _resident_bytes()
+        tracemalloc.start()
+        started = time.perf_counter()
+        index = parse_bibliography(bib_path)
+        elapsed = time.perf_counter() - started
+        gc.collect()
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        resident_after = _resident_bytes()
+
+    references, unique = _unique_people(index)
+    print(f"entries:          {len(index.entries)}")
+    print(f"parse time:       {elapsed:.2f} s (under tracemalloc)")
+    print(f"retained:         {retained / 2**20:.1f} MiB ({retained / len(index.entries):.0f} B/entry)")
+    print(f"parse peak:       {peak / 2**20:.1f} MiB")
+    print(f"resident growth:  {(resident_after - resident_before) / 2**20:.1f} MiB")
+    print(f"person objects:   {unique} for {references} author/editor references")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Micro-benchmark for ``normalize_text`` against the original regex implementation.
+
+Run from the repository root with ``python benchmarks/bench_normalize.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import time
+import unicodedata
+
+from synthetic import synthetic_entries
+
+from lit_wiki import utils
+from lit_wiki.utils import normalize_text
+
+EDGE_CASES = [
+    "",
+    "   ",
+    "Ångström — résumé of naïve façade",
+    "Schrödinger's Cat: ﬁnal ﬁgures (2nd ed.)",
+    "Łódź, Kraków and Gdańsk",
+    "北京 Beijing 2020",
+    "ＦＵＬＬＷＩＤＴＨ ＴＥＸＴ ¹²³",
+    "tabs\tand\nnewlines\r\nmixed",
+    "10.1016/J.AUTCON.2019.102940",
+    "{\\'E}tienne de la Vall{\\'e}e Poussin",
+    "___--__ underscores __",
+    "ß and ẞ and Æsir",
+]
+
+
+def _reference_normalize_text(value: str) -> str:
+    normalized = unicodedata.normalize("NFKD", value or "")
+    ascii_value = normalized.encode("ascii", "ignore").decode("ascii")
+    ascii_value = ascii_value.lower()
+    ascii_value = re.sub(r"[^a-z0-9]+", " ", ascii_value)
+    return re.sub(r"\s+", " ", ascii_value).strip()
+
+
+def _corpora(count: int) -> dict[str, list[str]]:
+    entries = list(synthetic_entries(count).values())
+    return {
+        "titles": [entry.title for entry in entries],
+        "DOIs": [entry.doi for entry in entries if entry.doi],
+        "surnames": [person.surname for entry in entries for person in entry.authors],
+        "edge cases": EDGE_CASES + [chr(code) for code in range(0x3000)],
+    }
+
+
+def _timed(function, values: list[str], repeats: int = 3) -> tuple[float, list[str]]:
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        outputs = [function(value) for value in values]
+        best = min(best, time.perf_counter() - started)
+    return best * 1e6 / len(values), outputs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=50_000)
+    args = parser.parse_args()
+
+    for label, values in _corpora(args.entries).items():
+        utils._normalize_cached.cache_clear()
+        reference_time, expected = _timed(_reference_normalize_text, values)
+        kernel_time, kernel = _timed(utils._normalize_uncached, values)
+        cold_time, cold = _timed(normalize_text, values, repeats=1)
+        warm_time, warm = _timed(normalize_text, values)
+
+        mismatches = [value for value, left, right in zip(values, expected, kernel) if left != right]
+        assert not mismatches, f"normalize_text differs for {mismatches[:5]!r}"
+        assert expected == cold == warm
+
+        print(f"{label}: {len(values)} values, identical outputs")
+        print(f"  regex reference:     {reference_time:.2f} us/call")
+        print(f"  translate kernel:    {kernel_time:.2f} us/call")
+        print(f"  normalize_text cold: {cold_time:.2f} us/call")
+        print(f"  normalize_text warm: {warm_time:.2f} us/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Scaling of sharded bibliography parsing across worker processes.
+
+Run from the repository root with ``python benchmarks/bench_parse.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic import synthetic_bibtex
+
+from lit_wiki.bibliography import parse_bibliography
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=50_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        bib_path = Path(tmpdir) / "synthetic.bib"
+        bib_path.write_text(synthetic_bibtex(args.entries), encoding="utf-8")
+        print(f"entries: {args.entries} ({bib_path.stat().st_size / 2**20:.1f} MiB)")
+
+        baseline = None
+        expected = None
+        for workers in args.workers:
+            started = time.perf_counter()
+            index = parse_bibliography(bib_path, workers=workers)
+            elapsed = time.perf_counter() - started
+            entries = [entry.as_dict() for entry in index.entries.values()]
+            if expected is None:
+                expected = entries
+            assert entries == expected, f"{workers} workers produced a different index"
+            baseline = baseline or elapsed
+            print(f"  {workers} worker(s): {elapsed:6.2f} s  speedup {baseline / elapsed:4.2f}x")
+
+
+if __name__ == "__main__":
+    main()
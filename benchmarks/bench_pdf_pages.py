@@ -0,0 +1,46 @@
+"""Per-page PDF extraction with a serial reader against the page-range process pool.
+
+Builds a synthetic ``--pages`` page PDF and times ``_extract_pdf_text`` for each worker count,
+checking that every run returns the same text as the serial pass.
+
+Run from the repository root with ``python benchmarks/bench_pdf_pages.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic import synthetic_pdf
+
+from lit_wiki.extraction import _extract_pdf_text
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=1000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        source = Path(tmpdir) / "synthetic.pdf"
+        source.write_bytes(synthetic_pdf(args.pages))
+        print(f"pages: {args.pages} ({source.stat().st_size / 2**20:.1f} MiB), cpus: {os.cpu_count()}")
+
+        expected = None
+        baseline = None
+        for workers in args.workers:
+            started = time.perf_counter()
+            text = _extract_pdf_text(source, workers)
+            elapsed = time.perf_counter() - started
+            expected = expected if expected is not None else text
+            baseline = baseline if baseline is not None else elapsed
+            assert text == expected, f"{workers} workers changed the extracted text"
+            print(f"  workers={workers:<3} {elapsed:8.2f} s  x{baseline / elapsed:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Per-record saves into the source registry: JSON rewrite versus SQLite upsert.
+
+Run from the repository root with ``python benchmarks/bench_registry.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from lit_wiki.models import SourceRecord
+from lit_wiki.registry import SourceRegistry, utc_now_iso
+
+SAVES_PER_SOURCE = 6
+
+
+def _record(number: int) -> SourceRecord:
+    return SourceRecord(
+        citekey=f"Author{number:06d}-aa",
+        source_path=f"/library/watch/processed/source-{number:06d}.pdf",
+        source_format="pdf",
+        raw_hash=f"{number:064x}",
+        match_reason="doi match",
+        confidence=0.98,
+        needs_review=False,
+    )
+
+
+def _json_save_record(path: Path, record: SourceRecord) -> None:
+    records: dict[str, dict] = {}
+    if path.exists():
+        with path.open("r", encoding="utf-8") as handle:
+            records = json.load(handle).get("sources", {})
+    now = utc_now_iso()
+    record.registered_at = records.get(record.citekey, {}).get("registered_at") or now
+    record.updated_at = now
+    records[record.citekey] = record.as_dict()
+    with path.open("w", encoding="utf-8") as handle:
+        json.dump({"sources": dict(sorted(records.items()))}, handle, indent=2, ensure_ascii=False)
+
+
+def _sqlite_save_record(path: Path, record: SourceRecord) -> None:
+    SourceRegistry.load(path).upsert(record)
+
+
+def _seed(path: Path, existing: int) -> None:
+    # The SQLite registry imports the JSON file next to it the first time it is opened.
+    records = {record.citekey: record.as_dict() for record in map(_record, range(existing))}
+    with path.with_suffix(".json").open("w", encoding="utf-8") as handle:
+        json.dump({"sources": records}, handle, indent=2, ensure_ascii=False)
+
+
+def _run(label: str, save, path: Path, existing: int, sources: int) -> None:
+    _seed(path, existing)
+    started = time.perf_counter()
+    for number in range(existing, existing + sources):
+        record = _record(number)
+        for save_number in range(SAVES_PER_SOURCE):
+            record.processing_state = f"state-{save_number}"
+            save(path, record)
+    elapsed = time.perf_counter() - started
+    saves = sources * SAVES_PER_SOURCE
+    print(f"{label:<8} {existing:>6} existing: {elapsed * 1e3 / saves:8.3f} ms/save, {elapsed:6.2f} s for {sources} sources")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--existing", type=int, nargs="+", default=[0, 1000, 5000])
+    parser.add_argument("--sources", type=int, default=50)
+    args = parser.parse_args()
+
+    for existing in args.existing:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            _run("json", _json_save_record, Path(tmpdir) / "source_registry.json", existing, args.sources)
+            _run("sqlite", _sqlite_save_record, Path(tmpdir) / "source_registry.sqlite", existing, args.sources)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Boilerplate and publish checks: one regex scan per pattern against the prefiltered scanner.
+
+Cleans a synthetic ``--pages`` page book, then times the per-line boilerplate check and the
+document-wide publish check both ways on the same text, checking that they agree.
+
+Run from the repository root with ``python benchmarks/bench_scanner.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import time
+
+from synthetic import synthetic_book_text
+
+from lit_wiki.extraction import CLEAN_BLOCK_CHARS, _iter_kept_lines
+from lit_wiki.scanner import (
+    CONTROL_CHARS_RE,
+    DEFAULT_BOILERPLATE_PATTERNS,
+    DEFAULT_CONTAMINATION_PATTERNS,
+    boilerplate_scanner,
+    contamination_scanner,
+)
+
+
+def _timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - started
+
+
+def _lines_per_pattern(lines: list[str]) -> list[str]:
+    patterns = [re.compile(pattern, re.IGNORECASE) for pattern in DEFAULT_BOILERPLATE_PATTERNS]
+    return [line for line in lines if not line or not any(pattern.search(line) for pattern in patterns)]
+
+
+def _lines_scanner(lines: list[str]) -> list[str]:
+    return list(_iter_kept_lines(lines, boilerplate_scanner()))
+
+
+def _document_per_pattern(text: str) -> tuple[bool, bool]:
+    contaminated = any(re.search(pattern, text, re.IGNORECASE) for pattern in DEFAULT_CONTAMINATION_PATTERNS)
+    return contaminated, any(ord(char) < 32 and char not in "\n\t\r" for char in text)
+
+
+def _document_scanner(text: str) -> tuple[bool, bool]:
+    return contamination_scanner().search(text), CONTROL_CHARS_RE.search(text) is not None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=2000)
+    args = parser.parse_args()
+
+    raw = synthetic_book_text(args.pages)
+    lines = [line.strip() for line in raw.split("\n")]
+    # A cleaned document: the footers are gone, so the publish check has to read all of it.
+    cleaned = "\n".join(_lines_scanner(lines))
+    print(f"pages: {args.pages}, lines: {len(lines)}, cleaned text: {len(cleaned) / 2**20:.1f} MiB")
+    print(f"  lines are screened in blocks of {CLEAN_BLOCK_CHARS} characters")
+
+    expected, before = _timed(_lines_per_pattern, lines)
+    actual, after = _timed(_lines_scanner, lines)
+    assert actual == expected, "boilerplate scanner disagrees with the per-pattern check"
+    print(f"  boilerplate lines   per pattern {before:6.3f} s  scanner {after:6.3f} s  x{before / after:.1f}")
+
+    expected_issues, before = _timed(_document_per_pattern, cleaned)
+    actual_issues, after = _timed(_document_scanner, cleaned)
+    assert actual_issues == expected_issues, "publish scanner disagrees with the per-pattern check"
+    print(f"  publish check       per pattern {before:6.3f} s  scanner {after:6.3f} s  x{before / after:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Per-file overhead of ``process_watch_folder`` on a synthetic project.
+
+Creates a throwaway project with a synthetic ``regex-tag.bib`` and one markdown source per
+citekey, then times a full watch run with the heuristic provider. ``--provider-latency``
+adds a sleep to every provider call to stand in for a local LLM server, and
+``--extract-workers``/``--provider-workers`` set the watch pipeline stage concurrency.
+
+Run from the repository root with ``python benchmarks/bench_watch.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+from synthetic import synthetic_bibtex, synthetic_entries
+
+from lit_wiki import providers
+from lit_wiki.config import load_config
+from lit_wiki.service import process_watch_folder, sync_bibliography
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _write_project(root: Path, entries: int, files: int, pipeline: dict[str, int]) -> None:
+    (root / "specs").mkdir()
+    shutil.copy(REPO_ROOT / "specs" / "lit-note-template.md", root / "specs" / "lit-note-template.md")
+    (root / "regex-tag.bib").write_text(synthetic_bibtex(entries), encoding="utf-8")
+    config = {"show_completion_dialog": False, "watch_dir": "watch", "watch_pipeline": pipeline}
+    (root / "config.yaml").write_text(yaml.safe_dump(config), encoding="utf-8")
+    watch_dir = root / "watch"
+    watch_dir.mkdir()
+    for number, entry in enumerate(list(synthetic_entries(entries).values())[:files]):
+        (watch_dir / f"source-{number:05d}.md").write_text(
+            f"---\ncitation-key: {entry.citekey}\n---\n{entry.abstract}\n",
+            encoding="utf-8",
+        )
+
+
+def _with_latency(run_provider, latency: float):
+    def delayed(*args, **kwargs):
+        time.sleep(latency)
+        return run_provider(*args, **kwargs)
+
+    return delayed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=20_000)
+    parser.add_argument("--files", type=int, default=50)
+    parser.add_argument("--provider-latency", type=float, default=0.0, help="seconds added to each provider call")
+    parser.add_argument("--extract-workers", type=int, default=1)
+    parser.add_argument("--provider-workers", type=int, default=1)
+    parser.add_argument("--queue-size", type=int, default=4)
+    args = parser.parse_args()
+    if args.provider_latency:
+        providers._run_provider = _with_latency(providers._run_provider, args.provider_latency)
+
+    pipeline = {
+        "extract_workers": args.extract_workers,
+        "provider_workers": args.provider_workers,
+        "queue_size": args.queue_size,
+    }
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        _write_project(root, args.entries, args.files, pipeline)
+        config = load_config(root)
+        sync_bibliography(config)
+
+        started = time.perf_counter()
+        summary = process_watch_folder(config)
+        elapsed = time.perf_counter() - started
+
+    print(
+        f"entries: {args.entries}, files: {args.files}, ingested: {summary.success_count}, "
+        f"stages: {args.extract_workers} extract / {args.provider_workers} provider"
+    )
+    print(f"watch run: {elapsed:6.2f} s ({elapsed * 1e3 / args.files:.1f} ms/file)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Wiki bookkeeping cost per ingested source: per-source updates against one ``WikiBatch``.
+
+Writes the entity, concept, index, log and overview files for ``--sources`` synthetic entries
+into two throwaway wiki directories, once with the per-source functions that ``ingest_source``
+uses and once through ``WikiBatch``, and checks that both produce identical files.
+
+Run from the repository root with ``python benchmarks/bench_wiki_batch.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic import synthetic_entries
+
+from lit_wiki.bibliography import BibliographyIndex
+from lit_wiki.config import load_config
+from lit_wiki.wiki import WikiBatch, ensure_concept_pages, ensure_person_pages, update_index, update_log, update_overview
+
+CONCEPTS = ["Gene Finding", "Sequence Alignment", "Hidden Markov Models", "Protein Folding", "Phylogenetics", "Metagenomics"]
+
+
+def _sections(number: int) -> dict[str, object]:
+    return {"see_also_links": [f"[[{CONCEPTS[(number + offset) % len(CONCEPTS)]}]]" for offset in range(2)]}
+
+
+def _project(root: Path, entries) -> tuple:
+    config = load_config(root)
+    config.wiki_sources_dir.mkdir(parents=True)
+    for entry in entries:
+        (config.wiki_sources_dir / f"{entry.citekey}_wiki.md").write_text(f"# {entry.title}\n", encoding="utf-8")
+    return config
+
+
+def _snapshot(wiki_dir: Path) -> dict[str, bytes]:
+    return {str(path.relative_to(wiki_dir)): path.read_bytes() for path in sorted(wiki_dir.rglob("*.md"))}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sources", type=int, default=500)
+    args = parser.parse_args()
+
+    entries = list(synthetic_entries(args.sources).values())
+    bibliography = BibliographyIndex({entry.citekey: entry for entry in entries})
+    with tempfile.TemporaryDirectory() as per_source_root, tempfile.TemporaryDirectory() as batch_root:
+        config = _project(Path(per_source_root), entries)
+        started = time.perf_counter()
+        for number, entry in enumerate(entries):
+            ensure_person_pages(config, entry)
+            ensure_concept_pages(config, entry, _sections(number))
+            update_index(config, entry)
+            update_log(config, entry)
+            update_overview(config, bibliography)
+        per_source = time.perf_counter() - started
+
+        batch_config = _project(Path(batch_root), entries)
+        started = time.perf_counter()
+        batch = WikiBatch(batch_config)
+        for number, entry in enumerate(entries):
+            batch.add_source(entry, _sections(number))
+        batch.apply(bibliography)
+        batched = time.perf_counter() - started
+
+        assert _snapshot(config.wiki_dir) == _snapshot(batch_config.wiki_dir), "batched bookkeeping differs"
+
+    print(f"{args.sources} sources, identical wiki files")
+    print(f"  per-source updates: {per_source:.2f} s ({per_source * 1000 / args.sources:.2f} ms/source)")
+    print(f"  WikiBatch:          {batched:.2f} s ({batched * 1000 / args.sources:.2f} ms/source)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""Deterministic synthetic bibliographies for the benchmark scripts."""
+
+from __future__ import annotations
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from lit_wiki.models import BibliographyEntry, PersonRecord
+
+SYLLABLES = ["an", "ber", "cal", "dor", "el", "fen", "gar", "hol", "is", "jon", "ka", "lin", "mor", "nel", "os", "per", "quin", "ros", "sten", "tor", "ul", "ver", "wal", "yor", "zen"]
+GIVEN_NAMES = ["Alice", "Bob", "Carol", "Dana", "Emma", "Farid", "Grace", "Hiro", "Ines", "Jamal", "Kofi", "Lena", "Mei", "Nina", "Omar", "Priya", "Rosa", "Sven", "Tariq", "Uma"]
+TITLE_WORDS = [
+    "learning", "construction", "digital", "apprenticeship", "knowledge", "workplace", "practice", "building",
+    "information", "modelling", "communities", "expertise", "design", "industry", "innovation", "education",
+    "theory", "analysis", "systems", "organisational", "change", "skills", "training", "management", "site",
+    "collaboration", "technology", "identity", "participation", "vocational", "policy", "framework", "data",
+]
+ENTRY_TYPES = ["article", "book", "inbook", "report", "inproceedings", "misc", "online", "phdthesis"]
+JOURNALS = [f"Journal of {word.title()} Studies" for word in TITLE_WORDS[:20]]
+PUBLISHERS = ["Routledge", "Springer", "Elsevier", "Wiley", "Sage", "Cambridge University Press", "Oxford University Press", "MIT Press"]
+KEYWORDS = ["BIM", "Learning", "Apprenticeship", "Construction", "Digital Twin", "Workplace", "Expertise", "Policy", "Education", "Skills"]
+
+
+def _surname_pool(rng: random.Random, size: int) -> list[str]:
+    pool: set[str] = set()
+    while len(pool) < size:
+        pool.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).title())
+    return sorted(pool)
+
+
+def _title_vocabulary(rng: random.Random, size: int) -> list[str]:
+    words = {word for word in TITLE_WORDS}
+    while len(words) < size:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def _title(rng: random.Random, vocabulary: list[str]) -> str:
+    words = []
+    for _ in range(rng.randint(4, 10)):
+        pool = TITLE_WORDS if rng.random() < 0.6 else vocabulary
+        words.append(rng.choice(pool))
+    return " ".join(words).capitalize()
+
+
+def synthetic_entries(count: int = 50_000, seed: int = 7) -> dict[str, BibliographyEntry]:
+    rng = random.Random(seed)
+    surnames = _surname_pool(rng, max(50, count // 10))
+    vocabulary = _title_vocabulary(rng, 5_000)
+    entries: dict[str, BibliographyEntry] = {}
+    for index in range(count):
+        year = str(rng.randint(1960, 2025))
+        people = []
+        for _ in range(rng.choice([1, 1, 2, 2, 3, 4])):
+            given = rng.choice(GIVEN_NAMES)
+            surname = rng.choice(surnames)
+            display_name = f"{given} {surname}"
+            people.append(PersonRecord(display_name=display_name, wiki_link=f"[[{display_name}]]", surname=surname))
+        title = _title(rng, vocabulary)
+        entry_type = rng.choice(ENTRY_TYPES)
+        citekey = f"{people[0].surname}{year}-{index:05d}"
+        entries[citekey] = BibliographyEntry(
+            citekey=citekey,
+            title=title,
+            entry_type=entry_type,
+            year=year,
+            date=f"{year}-{rng.randint(1, 12):02d}-01",
+            abstract=" ".join(rng.choice(TITLE_WORDS) for _ in range(40)).capitalize() + ".",
+            keywords=sorted(set(rng.sample(KEYWORDS, rng.randint(0, 3)))),
+            authors=people,
+            editors=[],
+            doi=f"10.{1000 + index % 9000}/synthetic.{index}" if rng.random() < 0.5 else "",
+            isbn=f"978{rng.randint(10**9, 10**10 - 1)}" if entry_type == "book" else "",
+            url="",
+            publisher=rng.choice(PUBLISHERS) if entry_type in {"book", "inbook", "report"} else "",
+            journaltitle=rng.choice(JOURNALS) if entry_type == "article" else "",
+            institution="",
+        )
+    return entries
+
+
+def _bib_field(name: str, value: str) -> str:
+    return f"  {name} = {{{value}}},"
+
+
+def synthetic_bibtex(count: int = 50_000, seed: int = 7) -> str:
+    chunks: list[str] = []
+    for entry in synthetic_entries(count, seed).values():
+        lines = [f"@{entry.entry_type.upper()}{{{entry.citekey},"]
+        lines.append(_bib_field("title", entry.title))
+        if entry.authors:
+            authors = " and ".join(f"{person.surname}, {person.display_name.split()[0]}" for person in entry.authors)
+            lines.append(_bib_field("author", authors))
+        lines.append(_bib_field("date", entry.date))
+        lines.append(_bib_field("abstract", entry.abstract))
+        for name in ("doi", "isbn", "publisher", "journaltitle"):
+            value = getattr(entry, name)
+            if value:
+                lines.append(_bib_field(name, value))
+        if entry.keywords:
+            lines.append(_bib_field("keywords", ";".join(entry.keywords)))
+        lines[-1] = lines[-1].rstrip(",")
+        lines.append("}")
+        chunks.append("\n".join(lines))
+    return "\n\n".join(chunks) + "\n"
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def synthetic_pdf(pages: int = 50, lines_per_page: int = 40, seed: int = 7) -> bytes:
+    """A plain-text PDF with ``pages`` pages of Helvetica prose, built without a PDF library."""
+    rng = random.Random(seed)
+    objects: list[bytes] = [b"", b"", b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids: list[int] = []
+    for page_number in range(pages):
+        commands = ["BT", "/F1 10 Tf", "12 TL", "56 780 Td"]
+        for _ in range(lines_per_page):
+            words = " ".join(rng.choice(TITLE_WORDS) for _ in range(rng.randint(8, 14)))
+            commands.append(f"({_pdf_escape(words.capitalize())}.) Tj T*")
+        commands.append(f"(Page {page_number + 1}) Tj ET")
+        stream = "\n".join(commands).encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        page_ids.append(len(objects))
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids).encode("ascii")
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets: list[int] = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref_offset = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    output += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+    return bytes(output)
+
+
+def synthetic_book_text(pages: int = 1000, lines_per_page: int = 40, seed: int = 7, accented_share: float = 0.0) -> str:
+    """Page-extracted prose: wrapped lines, words hyphenated across lines and a JSTOR footer per page.
+
+    ``accented_share`` of the lines get a curly-quoted, accented word, so they are not pure ASCII.
+    """
+    rng = random.Random(seed)
+    page_texts: list[str] = []
+    for page_number in range(pages):
+        lines: list[str] = []
+        for line_number in range(lines_per_page):
+            words = " ".join(rng.choice(TITLE_WORDS) for _ in range(rng.randint(8, 14)))
+            if accented_share and rng.random() < accented_share:
+                words = f"{words} \u201cr\u00f4le\u201d"
+            if line_number % 7 == 6:
+                lines.append(f"{words}.")
+                lines.append("")
+            elif line_number % 5 == 4:
+                lines.append(f"{words} {rng.choice(TITLE_WORDS)[:3]}-")
+            else:
+                lines.append(words)
+        lines.append("This content downloaded from ")
+        lines.append(f"86.163.107.4 on Thu, 09 Apr 2026 13:55:{page_number % 60:02d} UTC")
+        lines.append("All use subject to https://about.jstor.org/terms")
+        page_texts.append("\n".join(lines))
+    return "\n\n".join(page_texts)
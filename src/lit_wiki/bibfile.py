@@ -0,0 +1,413 @@
+from __future__ import annotations
+
+import hashlib
+import re
+import string
+from dataclasses import dataclass, field
+from typing import Iterator, TextIO
+
+SPECIAL_ENTRY_TYPES = {"comment", "preamble", "string"}
+PERSON_FIELDS = {"author", "editor"}
+READ_BLOCK_SIZE = 64 * 1024
+MONTH_MACROS = {
+    "jan": "January",
+    "feb": "February",
+    "mar": "March",
+    "apr": "April",
+    "may": "May",
+    "jun": "June",
+    "jul": "July",
+    "aug": "August",
+    "sep": "September",
+    "oct": "October",
+    "nov": "November",
+    "dec": "December",
+}
+
+
+@dataclass
+class EntrySpan:
+    entry_type: str
+    citekey: str
+    start: int
+    end: int
+    digest: str
+
+    @property
+    def is_special(self) -> bool:
+        return self.entry_type in SPECIAL_ENTRY_TYPES
+
+
+ENTRY_START_RE = re.compile(rb"@\s*([A-Za-z][A-Za-z0-9_:-]*)\s*([{(])")
+BRACE_RE = re.compile(rb"[{}]")
+PAREN_BRACE_RE = re.compile(rb"[{}()]")
+
+
+def _entry_end(data: bytes, position: int, closer: bytes) -> int:
+    depth = 0
+    pattern = BRACE_RE if closer == b"}" else PAREN_BRACE_RE
+    for match in pattern.finditer(data, position):
+        token = match.group()
+        if token == b"{":
+            depth += 1
+        elif token == b"}":
+            if depth == 0 and closer == b"}":
+                return match.end()
+            depth -= 1
+        elif token == closer and depth == 0:
+            return match.end()
+    return len(data)
+
+
+def iter_entry_spans(data: bytes):
+    """Yield byte spans for each top-level ``@type{...}`` block in a .bib file."""
+    position = 0
+    while True:
+        match = ENTRY_START_RE.search(data, position)
+        if match is None:
+            return
+        start = match.start()
+        entry_type = match.group(1).decode("ascii").lower()
+        closer = b"}" if match.group(2) == b"{" else b")"
+        body_start = match.end()
+        end = body_start if entry_type == "comment" else _entry_end(data, body_start, closer)
+        citekey = ""
+        if entry_type not in SPECIAL_ENTRY_TYPES:
+            comma = data.find(b",", body_start, end)
+            key_end = comma if comma >= 0 else end - 1
+            citekey = data[body_start:key_end].decode("utf-8", "replace").strip()
+        yield EntrySpan(
+            entry_type=entry_type,
+            citekey=citekey,
+            start=start,
+            end=end,
+            digest=hashlib.sha256(data[start:end]).hexdigest(),
+        )
+        position = end
+
+
+def scan_entry_spans(data: bytes) -> list[EntrySpan]:
+    return list(iter_entry_spans(data))
+
+
+def macro_digest(spans: list[EntrySpan]) -> str:
+    digest = hashlib.sha256()
+    for span in spans:
+        if span.entry_type in {"string", "preamble"}:
+            digest.update(span.digest.encode("ascii"))
+    return digest.hexdigest()
+
+
+class BibtexSyntaxError(ValueError):
+    pass
+
+
+class DuplicateCitekeyError(BibtexSyntaxError):
+    def __init__(self, citekeys: list[str]) -> None:
+        self.citekeys = citekeys
+        shown = ", ".join(citekeys[:10])
+        more = f" and {len(citekeys) - 10} more" if len(citekeys) > 10 else ""
+        super().__init__(f"duplicate citekeys in bibliography: {shown}{more}")
+
+    def __reduce__(self):
+        return type(self), (self.citekeys,)
+
+
+class _NeedMoreInput(Exception):
+    pass
+
+
+@dataclass
+class BibtexRecord:
+    entry_type: str
+    citekey: str
+    fields: dict[str, str] = field(default_factory=dict)
+    persons: dict[str, list[str]] = field(default_factory=dict)
+
+
+NAME_CHARS = string.ascii_letters + "@!$&*+-./:;<>?[\\]^_`|~\x7f"
+NAME_PATTERN = rf"[{re.escape(NAME_CHARS)}][{re.escape(NAME_CHARS + string.digits)}]*"
+NAME_RE = re.compile(NAME_PATTERN)
+NUMBER_RE = re.compile(r"[0-9]+")
+KEY_BRACE_RE = re.compile(r"[^\s,}]+")
+KEY_PAREN_RE = re.compile(r"[^\s,]+")
+WHITESPACE_RE = re.compile(r"\s*")
+WHITESPACE_RUN_RE = re.compile(r"\s+")
+QUOTED_RE = re.compile(r'["{}]')
+TEXT_BRACE_RE = re.compile(r"[{}]")
+NAME_SPACE_RE = re.compile(r"(?:\\ |\s|(?<!\\)~)+")
+NAME_LIST_RE = re.compile(r" [Aa][Nn][Dd] ")
+NAME_PART_RE = re.compile(r",")
+
+
+def normalize_whitespace(value: str) -> str:
+    return WHITESPACE_RUN_RE.sub(" ", value.strip())
+
+
+class _CommandReader:
+    def __init__(self, text: str, position: int, eof: bool, macros: dict[str, str]) -> None:
+        self.text = text
+        self.position = position
+        self.eof = eof
+        self.macros = macros
+
+    def _end_of_input(self) -> None:
+        if not self.eof:
+            raise _NeedMoreInput
+        raise BibtexSyntaxError("premature end of file")
+
+    def _skip_whitespace(self) -> None:
+        if self.position < len(self.text) and not self.text[self.position].isspace():
+            return
+        self.position = WHITESPACE_RE.match(self.text, self.position).end()
+        if self.position == len(self.text):
+            self._end_of_input()
+
+    def optional(self, pattern: re.Pattern[str]) -> str | None:
+        self._skip_whitespace()
+        match = pattern.match(self.text, self.position)
+        if match is None:
+            return None
+        if match.end() == len(self.text):
+            self._end_of_input()
+        self.position = match.end()
+        return match.group()
+
+    def required(self, pattern: re.Pattern[str], description: str) -> str:
+        value = self.optional(pattern)
+        if value is None:
+            raise BibtexSyntaxError(f"expected {description} near {self.text[self.position:self.position + 40]!r}")
+        return value
+
+    def literal(self, char: str) -> bool:
+        self._skip_whitespace()
+        if self.text[self.position] != char:
+            return False
+        self.position += 1
+        return True
+
+    def expect(self, char: str) -> None:
+        if not self.literal(char):
+            raise BibtexSyntaxError(f"expected {char!r} near {self.text[self.position:self.position + 40]!r}")
+
+    def value(self) -> str:
+        parts = [self._value_part()]
+        while self.literal("#"):
+            parts.append(self._value_part())
+        return "".join(parts)
+
+    def _value_part(self) -> str:
+        self._skip_whitespace()
+        char = self.text[self.position]
+        if char == '"':
+            return self._delimited(QUOTED_RE, closing_quote=True)
+        if char == "{":
+            return self._delimited(TEXT_BRACE_RE, closing_quote=False)
+        number = self.optional(NUMBER_RE)
+        if number is not None:
+            return number
+        name = self.required(NAME_RE, "field value")
+        try:
+            return self.macros[name.lower()]
+        except KeyError:
+            raise BibtexSyntaxError(f"undefined string {name!r}") from None
+
+    def _delimited(self, pattern: re.Pattern[str], closing_quote: bool) -> str:
+        start = self.position + 1
+        depth = 0
+        for match in pattern.finditer(self.text, start):
+            token = match.group()
+            if token == "{":
+                depth += 1
+                continue
+            if depth > 0:
+                if token == "}":
+                    depth -= 1
+                continue
+            if token == "}" and closing_quote:
+                raise BibtexSyntaxError("unbalanced braces")
+            self.position = match.end()
+            return self.text[start:match.start()]
+        self._end_of_input()
+        return ""
+
+    def command(self) -> BibtexRecord | None:
+        entry_type = self.required(NAME_RE, "entry type")
+        if self.literal("{"):
+            closer = "}"
+        elif self.literal("("):
+            closer = ")"
+        else:
+            raise BibtexSyntaxError(f"expected '{{' or '(' after @{entry_type}")
+        kind = entry_type.lower()
+        if kind == "comment":
+            return None
+        if kind == "string":
+            name = self.required(NAME_RE, "a valid name")
+            self.expect("=")
+            self.macros[name.lower()] = self.value()
+            self.expect(closer)
+            return None
+        if kind == "preamble":
+            self.value()
+            self.expect(closer)
+            return None
+
+        citekey = self.required(KEY_PAREN_RE if closer == ")" else KEY_BRACE_RE, "entry key")
+        record = BibtexRecord(entry_type=kind, citekey=citekey)
+        seen: set[str] = set()
+        while True:
+            name = self.optional(NAME_RE)
+            if name is not None:
+                self.expect("=")
+                value = self.value()
+                field_name = name.lower()
+                if field_name in seen:
+                    raise BibtexSyntaxError(f"entry with key {citekey} has a duplicate {name} field")
+                seen.add(field_name)
+                value = normalize_whitespace(value)
+                if field_name in PERSON_FIELDS:
+                    record.persons[field_name] = split_tex_string(value, NAME_LIST_RE, filter_empty=False)
+                else:
+                    record.fields[field_name] = value
+            if not self.literal(","):
+                break
+        self.expect(closer)
+        return record
+
+
+def iter_bibtex_records(handle: TextIO, block_size: int = READ_BLOCK_SIZE) -> Iterator[BibtexRecord]:
+    """Parse BibTeX from ``handle`` block by block, following pybtex's strict semantics."""
+    macros = dict(MONTH_MACROS)
+    seen: set[str] = set()
+    text = ""
+    position = 0
+    eof = False
+    while True:
+        start = text.find("@", position)
+        if start >= 0:
+            reader = _CommandReader(text, start + 1, eof, macros)
+            try:
+                record = reader.command()
+            except _NeedMoreInput:
+                pass
+            else:
+                position = reader.position
+                if record is not None:
+                    citekey = record.citekey.lower()
+                    if citekey in seen:
+                        raise DuplicateCitekeyError([record.citekey])
+                    seen.add(citekey)
+                    yield record
+                continue
+        elif eof:
+            return
+        else:
+            start = len(text)
+        chunk = handle.read(block_size)
+        eof = not chunk
+        text = text[start:] + chunk
+        position = 0
+
+
+def _closing_brace(text: str, position: int) -> int:
+    depth = 1
+    end = None
+    for match in TEXT_BRACE_RE.finditer(text, position):
+        end = match.end()
+        depth += 1 if match.group() == "{" else -1
+        if depth == 0:
+            break
+    return len(text) if end is None else end
+
+
+def split_tex_string(
+    value: str,
+    separator: re.Pattern[str] = NAME_SPACE_RE,
+    filter_empty: bool = True,
+) -> list[str]:
+    result: list[str] = []
+    word: list[str] = []
+    position = 0
+    while True:
+        brace = value.find("{", position)
+        head = value[position:] if brace < 0 else value[position:brace]
+        if head:
+            pieces = separator.split(head)
+            for piece in pieces[:-1]:
+                result.append("".join(word) + piece)
+                word = []
+            word.append(pieces[-1])
+        if brace < 0:
+            break
+        position = _closing_brace(value, brace + 1)
+        word.append(value[brace:position])
+    if word:
+        result.append("".join(word))
+    result = [part.strip() for part in result]
+    if filter_empty:
+        result = [part for part in result if part]
+    return result
+
+
+def _special_char_islower(special_char: str) -> bool:
+    control_sequence = True
+    for char in special_char[1:]:
+        if control_sequence:
+            if not char.isalpha():
+                control_sequence = False
+        elif char.isalpha():
+            return char.islower()
+    return False
+
+
+def _is_von_name(word: str) -> bool:
+    if word[0].isupper():
+        return False
+    if word[0].islower():
+        return True
+    depth = 0
+    position = 0
+    while position < len(word):
+        char = word[position]
+        if char == "{":
+            if depth == 0 and word.startswith("\\", position + 1):
+                end = _closing_brace(word, position + 1)
+                inner = word[position + 1:end]
+                return _special_char_islower(inner[:-1] if inner.endswith("}") else inner)
+            depth += 1
+        elif char == "}":
+            depth = max(depth - 1, 0)
+        elif depth == 0 and char.isalpha():
+            return char.islower()
+        position += 1
+    return False
+
+
+def _split_von_last(parts: list[str]) -> tuple[list[str], list[str]]:
+    von_last = parts[:-1]
+    position = len(von_last)
+    while position > 0 and not _is_von_name(von_last[position - 1]):
+        position -= 1
+    return von_last[:position], von_last[position:] + parts[-1:]
+
+
+def split_person_name(name: str) -> tuple[list[str], list[str], list[str], list[str]]:
+    """Split a BibTeX name into ``(first and middle, von, last, jr)`` word lists."""
+    name = name.strip()
+    if not name:
+        return [], [], [], []
+    parts = split_tex_string(name, NAME_PART_RE, filter_empty=False)
+    if len(parts) > 3:
+        raise BibtexSyntaxError(f"too many commas in {name!r}")
+    if len(parts) == 1:
+        words = split_tex_string(name)
+        position = next((index for index, word in enumerate(words) if _is_von_name(word)), len(words))
+        first_middle, von_last = words[:position], words[position:]
+        if not von_last and first_middle:
+            von_last.append(first_middle.pop())
+        prelast, last = _split_von_last(von_last)
+        return first_middle, prelast, last, []
+    prelast, last = _split_von_last(split_tex_string(parts[0]))
+    lineage = split_tex_string(parts[1]) if len(parts) == 3 else []
+    return split_tex_string(parts[-1]), prelast, last, lineage
@@ -1,38 +1,222 @@
 from __future__ import annotations
 
+import hashlib
+import io
 import json
+import os
+import pickle
+import re
+import sqlite3
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from functools import lru_cache
 from pathlib import Path
+from typing import Iterator, TextIO
 
 from pybtex.database.input import bibtex
+from rapidfuzz import fuzz
 
-from .models import BibliographyEntry, PersonRecord
+from .bibfile import (
+    BibtexRecord,
+    BibtexSyntaxError,
+    DuplicateCitekeyError,
+    EntrySpan,
+    iter_bibtex_records,
+    macro_digest,
+    scan_entry_spans,
+    split_person_name,
+)
+from .models import BibliographyChanges, BibliographyEntry, BibliographyQuery, PersonRecord
 from .utils import dedupe_casefold, first_year, normalize_text
 
+SNAPSHOT_VERSION = 8
+SNAPSHOT_FILENAME = "bibliography_snapshot.pickle"
+TITLE_PROBE_WORDS = 6
+TITLE_PROBE_BUDGET = 4000
+TITLE_CANDIDATE_POOL = 24
+TITLE_PARTIAL_MIN_CHARS = 12
+TITLE_PARTIAL_WEIGHT = 0.9
+PERSON_CACHE_SIZE = 1 << 16
+PARALLEL_MIN_ENTRIES = 2000
+QUERY_FACETS = ("year", "entry_type", "journaltitle", "publisher", "keyword", "isbn")
+ISBN_SEPARATOR_RE = re.compile(r"[,;/]")
+ISBN_NOISE_RE = re.compile(r"[^0-9X]")
+SHARDS_PER_WORKER = 2
+
 
 def _person_record(person: "pybtex.database.Person") -> PersonRecord:
-    first = " ".join(person.first_names + person.middle_names).strip()
-    prelast = " ".join(person.prelast_names).strip()
-    last = " ".join(person.last_names).strip()
-    lineage = " ".join(person.lineage_names).strip()
+    return _person_from_parts(
+        person.first_names + person.middle_names,
+        person.prelast_names,
+        person.last_names,
+        person.lineage_names,
+    )
+
+
+def _person_from_parts(
+    first_middle: list[str],
+    prelast_names: list[str],
+    last_names: list[str],
+    lineage_names: list[str],
+) -> PersonRecord:
+    first = " ".join(first_middle).strip()
+    prelast = " ".join(prelast_names).strip()
+    last = " ".join(last_names).strip()
+    lineage = " ".join(lineage_names).strip()
     parts = [part for part in (first, prelast, last, lineage) if part]
     display_name = " ".join(parts).strip() or "Unknown Author"
     surname = last or display_name.split()[-1]
+    return _shared_person(display_name, surname)
+
+
+@lru_cache(maxsize=PERSON_CACHE_SIZE)
+def _shared_person(display_name: str, surname: str) -> PersonRecord:
     return PersonRecord(
-        display_name=display_name,
+        display_name=sys.intern(display_name),
         wiki_link=f"[[{display_name}]]",
-        surname=surname,
+        surname=sys.intern(surname),
     )
 
 
+def title_similarity(query_key: str, title_key: str) -> float:
+    if not query_key or not title_key:
+        return 0.0
+    score = fuzz.ratio(query_key, title_key)
+    if len(query_key) >= TITLE_PARTIAL_MIN_CHARS:
+        score = max(score, TITLE_PARTIAL_WEIGHT * fuzz.partial_ratio(query_key, title_key))
+    return score / 100
+
+
+def isbn_keys(value: str) -> list[str]:
+    keys = (ISBN_NOISE_RE.sub("", part.upper()) for part in ISBN_SEPARATOR_RE.split(value or ""))
+    return list(dict.fromkeys(key for key in keys if key))
+
+
+def _facet_keys(entry: BibliographyEntry) -> dict[str, list[str]]:
+    return {
+        "year": [entry.year] if entry.year else [],
+        "entry_type": [entry.entry_type.lower()] if entry.entry_type else [],
+        "journaltitle": [normalize_text(entry.journaltitle)] if entry.journaltitle else [],
+        "publisher": [normalize_text(entry.publisher)] if entry.publisher else [],
+        "keyword": list(dict.fromkeys(key for key in map(normalize_text, entry.keywords) if key)),
+        "isbn": isbn_keys(entry.isbn),
+    }
+
+
 class BibliographyIndex:
     def __init__(self, entries: dict[str, BibliographyEntry]) -> None:
         self.entries = entries
+        self.entry_digests: dict[str, str] = {}
+        self.positions: dict[str, int] = {}
+        self._next_position = 0
+        self.title_keys: dict[str, str] = {}
+        self.author_keys: dict[str, tuple[str, ...]] = {}
+        self.creator_keys: dict[str, tuple[str, ...]] = {}
+        self.lead_surname_keys: dict[str, str] = {}
+        self.doi_keys: dict[str, str] = {}
         self.title_index: dict[str, list[str]] = {}
         self.doi_index: dict[str, str] = {}
+        self.title_word_index: dict[str, list[str]] = {}
+        self.surname_index: dict[str, list[str]] = {}
+        self.coauthor_index: dict[str, dict[str, int]] = {}
+        self.facet_index: dict[str, dict[str, list[str]]] = {facet: {} for facet in QUERY_FACETS}
         for citekey, entry in entries.items():
-            self.title_index.setdefault(normalize_text(entry.title), []).append(citekey)
-            if entry.doi:
-                self.doi_index[normalize_text(entry.doi)] = citekey
+            self._index_entry(citekey, entry)
+
+    def _index_entry(self, citekey: str, entry: BibliographyEntry) -> None:
+        if citekey not in self.positions:
+            self.positions[citekey] = self._next_position
+            self._next_position += 1
+        title_key = normalize_text(entry.title)
+        self.title_keys[citekey] = title_key
+        self.title_index.setdefault(title_key, []).append(citekey)
+        for word in set(title_key.split()):
+            self.title_word_index.setdefault(word, []).append(citekey)
+        if entry.doi:
+            doi_key = normalize_text(entry.doi)
+            self.doi_keys[citekey] = doi_key
+            self.doi_index[doi_key] = citekey
+        surnames = tuple(dict.fromkeys(normalize_text(person.surname) for person in entry.authors))
+        people = entry.authors or entry.editors
+        self.author_keys[citekey] = surnames
+        self.creator_keys[citekey] = tuple(
+            dict.fromkeys(normalize_text(person.surname) for person in people if person.surname)
+        )
+        if people:
+            self.lead_surname_keys[citekey] = normalize_text(people[0].surname or people[0].display_name)
+        for facet, keys in _facet_keys(entry).items():
+            postings = self.facet_index[facet]
+            for key in keys:
+                postings.setdefault(key, []).append(citekey)
+        for surname in surnames:
+            self.surname_index.setdefault(surname, []).append(citekey)
+            coauthors = self.coauthor_index.setdefault(surname, {})
+            for other in surnames:
+                if other != surname:
+                    coauthors[other] = coauthors.get(other, 0) + 1
+
+    def _unindex_entry(self, citekey: str, entry: BibliographyEntry) -> None:
+        title_key = self.title_keys.pop(citekey, "")
+        citekeys = self.title_index.get(title_key, [])
+        if citekey in citekeys:
+            citekeys.remove(citekey)
+        if not citekeys:
+            self.title_index.pop(title_key, None)
+        for word in set(title_key.split()):
+            postings = self.title_word_index.get(word, [])
+            if citekey in postings:
+                postings.remove(citekey)
+            if not postings:
+                self.title_word_index.pop(word, None)
+        doi_key = self.doi_keys.pop(citekey, "")
+        if doi_key and self.doi_index.get(doi_key) == citekey:
+            del self.doi_index[doi_key]
+        surnames = self.author_keys.pop(citekey, ())
+        self.creator_keys.pop(citekey, None)
+        self.lead_surname_keys.pop(citekey, None)
+        for facet, keys in _facet_keys(entry).items():
+            for key in keys:
+                postings = self.facet_index[facet].get(key, [])
+                if citekey in postings:
+                    postings.remove(citekey)
+                if not postings:
+                    self.facet_index[facet].pop(key, None)
+        for surname in surnames:
+            postings = self.surname_index.get(surname, [])
+            if citekey in postings:
+                postings.remove(citekey)
+            if not postings:
+                self.surname_index.pop(surname, None)
+            coauthors = self.coauthor_index.get(surname, {})
+            for other in surnames:
+                if other == surname or other not in coauthors:
+                    continue
+                coauthors[other] -= 1
+                if coauthors[other] <= 0:
+                    del coauthors[other]
+            if not coauthors:
+                self.coauthor_index.pop(surname, None)
+
+    def upsert(self, entry: BibliographyEntry) -> None:
+        existing = self.entries.get(entry.citekey)
+        if existing is not None:
+            self._unindex_entry(entry.citekey, existing)
+        self.entries[entry.citekey] = entry
+        self._index_entry(entry.citekey, entry)
+
+    def remove(self, citekey: str) -> None:
+        existing = self.entries.pop(citekey, None)
+        if existing is not None:
+            self._unindex_entry(citekey, existing)
+        self.positions.pop(citekey, None)
+        self.entry_digests.pop(citekey, None)
+
+    def reorder(self, citekeys: list[str]) -> None:
+        self.entries = {citekey: self.entries[citekey] for citekey in citekeys if citekey in self.entries}
+        self.positions = {citekey: position for position, citekey in enumerate(self.entries)}
+        self._next_position = len(self.positions)
 
     def get(self, citekey: str) -> BibliographyEntry | None:
         return self.entries.get(citekey)
@@ -56,11 +240,7 @@ class BibliographyIndex:
 
         normalized_surnames = {normalize_text(name) for name in author_surnames if name}
         for candidate in candidates:
-            candidate_surnames = {
-                normalize_text(person.surname)
-                for person in (candidate.authors or candidate.editors)
-                if person.surname
-            }
+            candidate_surnames = self.creator_keys.get(candidate.citekey, ())
             if year and candidate.year and year != candidate.year:
                 continue
             if normalized_surnames and not normalized_surnames.issubset(candidate_surnames):
@@ -72,57 +252,479 @@ class BibliographyIndex:
                 return candidate
         return candidates[0]
 
+    def find_title_candidates(self, title: str, limit: int = 5) -> list[tuple[BibliographyEntry, float]]:
+        """Rank entries whose titles approximately match ``title``.
+
+        Candidates come from the rarest title words in the query, so a typo or a
+        truncated subtitle still reaches the right entry through its other words;
+        candidates are then scored by edit-distance similarity, with partial
+        matches (truncated titles) weighted slightly below full matches.
+        """
+        query_key = normalize_text(title)
+        postings = sorted(
+            (self.title_word_index[word] for word in set(query_key.split()) if word in self.title_word_index),
+            key=len,
+        )
+        hits: Counter[str] = Counter()
+        budget = 0
+        for position, citekeys in enumerate(postings[:TITLE_PROBE_WORDS]):
+            if position and budget + len(citekeys) > TITLE_PROBE_BUDGET:
+                break
+            hits.update(citekeys)
+            budget += len(citekeys)
+
+        scored: list[tuple[float, bool, int, str]] = []
+        for citekey, _count in hits.most_common(TITLE_CANDIDATE_POOL):
+            title_key = self.title_keys[citekey]
+            score = round(title_similarity(query_key, title_key), 4)
+            if score > 0:
+                scored.append((-score, not title_key.startswith(query_key), self.positions.get(citekey, 0), citekey))
+        scored.sort()
+        return [(self.entries[citekey], -score) for score, _prefix, _position, citekey in scored[:limit]]
+
+    def query(self, query: BibliographyQuery) -> list[BibliographyEntry]:
+        facets = self.facet_index
+        low = query.year_from if query.year_from is not None else 0
+        high = query.year_to if query.year_to is not None else 9999
+        filter_years = query.year_from is not None or query.year_to is not None
+
+        postings: list[list[str]] = []
+        if query.entry_types:
+            entry_types = {entry_type.lower() for entry_type in query.entry_types}
+            postings.append([citekey for entry_type in entry_types for citekey in facets["entry_type"].get(entry_type, [])])
+        postings.extend(facets["keyword"].get(normalize_text(keyword), []) for keyword in query.keywords)
+        if query.journaltitle:
+            postings.append(facets["journaltitle"].get(normalize_text(query.journaltitle), []))
+        if query.publisher:
+            postings.append(facets["publisher"].get(normalize_text(query.publisher), []))
+        if query.isbn:
+            postings.append([citekey for key in isbn_keys(query.isbn) for citekey in facets["isbn"].get(key, [])])
+
+        if postings:
+            postings.sort(key=len)
+            found = set(postings[0]).intersection(*postings[1:])
+            if filter_years:
+                found = {citekey for citekey in found if low <= int(self.entries[citekey].year or -1) <= high}
+        elif filter_years:
+            found = {citekey for year, citekeys in facets["year"].items() if low <= int(year) <= high for citekey in citekeys}
+        else:
+            found = set(self.entries)
+        ordered = sorted(found, key=self.positions.__getitem__)
+        if query.limit is not None:
+            ordered = ordered[: query.limit]
+        return [self.entries[citekey] for citekey in ordered]
+
+    def entries_by_surname(self, surname: str) -> list[BibliographyEntry]:
+        return [self.entries[citekey] for citekey in self.surname_index.get(normalize_text(surname), [])]
+
+    def coauthors(self, surname: str, limit: int = 10) -> list[tuple[str, int]]:
+        counts = self.coauthor_index.get(normalize_text(surname), {})
+        return sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:limit]
+
     def same_author_entries(self, citekey: str, limit: int = 5) -> list[BibliographyEntry]:
         source = self.get(citekey)
         if source is None:
             return []
-        target_surnames = {normalize_text(person.surname) for person in source.authors}
-        related: list[BibliographyEntry] = []
-        for candidate in self.entries.values():
-            if candidate.citekey == citekey:
-                continue
-            candidate_surnames = {normalize_text(person.surname) for person in candidate.authors}
-            if target_surnames and target_surnames & candidate_surnames:
-                related.append(candidate)
+        matches: set[str] = set()
+        for surname in self.author_keys.get(citekey, ()):
+            matches.update(self.surname_index.get(surname, []))
+        matches.discard(citekey)
+        ordered = sorted(matches, key=lambda key: self.positions.get(key, 0))
+        related = [self.entries[key] for key in ordered]
         related.sort(key=lambda entry: (entry.year, entry.title))
         return related[:limit]
 
 
-def parse_bibliography(path: Path) -> BibliographyIndex:
-    parser = bibtex.Parser()
-    database = parser.parse_file(str(path))
+def _make_entry(
+    citekey: str,
+    entry_type: str,
+    fields: dict[str, str],
+    authors: list[PersonRecord],
+    editors: list[PersonRecord],
+) -> BibliographyEntry:
+    raw_keywords = fields.get("keywords", "")
+    keywords = dedupe_casefold([part.strip() for part in raw_keywords.split(";") if part.strip()])
+    return BibliographyEntry(
+        citekey=citekey,
+        title=fields.get("title", citekey).replace("\n", " ").strip(),
+        entry_type=sys.intern(entry_type),
+        year=sys.intern(first_year(fields.get("date") or fields.get("year"))),
+        date=sys.intern(fields.get("date") or fields.get("year", "")),
+        abstract=fields.get("abstract", "").strip(),
+        keywords=[sys.intern(keyword) for keyword in keywords],
+        authors=authors,
+        editors=editors,
+        doi=fields.get("doi", ""),
+        isbn=fields.get("isbn", ""),
+        url=fields.get("url", ""),
+        publisher=sys.intern(fields.get("publisher", "")),
+        journaltitle=sys.intern(fields.get("journaltitle", "")),
+        institution=sys.intern(fields.get("institution", "")),
+    )
+
+
+def _bibliography_entries(database: "pybtex.database.BibliographyData") -> dict[str, BibliographyEntry]:
     entries: dict[str, BibliographyEntry] = {}
 
     for citekey, entry in database.entries.items():
-        fields = entry.fields
-        authors = [_person_record(person) for person in entry.persons.get("author", [])]
-        editors = [_person_record(person) for person in entry.persons.get("editor", [])]
-        raw_keywords = fields.get("keywords", "")
-        keywords = dedupe_casefold([part.strip() for part in raw_keywords.split(";") if part.strip()])
-        bib_entry = BibliographyEntry(
-            citekey=citekey,
-            title=fields.get("title", citekey).replace("\n", " ").strip(),
-            entry_type=entry.type,
-            year=first_year(fields.get("date") or fields.get("year")),
-            date=fields.get("date") or fields.get("year", ""),
-            abstract=fields.get("abstract", "").strip(),
-            keywords=keywords,
-            authors=authors,
-            editors=editors,
-            doi=fields.get("doi", ""),
-            isbn=fields.get("isbn", ""),
-            url=fields.get("url", ""),
-            publisher=fields.get("publisher", ""),
-            journaltitle=fields.get("journaltitle", ""),
-            institution=fields.get("institution", ""),
+        entries[citekey] = _make_entry(
+            citekey,
+            entry.type,
+            entry.fields,
+            [_person_record(person) for person in entry.persons.get("author", [])],
+            [_person_record(person) for person in entry.persons.get("editor", [])],
         )
-        entries[citekey] = bib_entry
 
-    return BibliographyIndex(entries)
+    return entries
+
+
+def _record_entry(record: BibtexRecord) -> BibliographyEntry:
+    return _make_entry(
+        record.citekey,
+        record.entry_type,
+        record.fields,
+        [_person_from_parts(*split_person_name(name)) for name in record.persons.get("author", [])],
+        [_person_from_parts(*split_person_name(name)) for name in record.persons.get("editor", [])],
+    )
+
+
+def iter_bibliography_entries(handle: TextIO) -> Iterator[BibliographyEntry]:
+    for record in iter_bibtex_records(handle):
+        yield _record_entry(record)
+
+
+def _read_entries(handle: TextIO) -> dict[str, BibliographyEntry]:
+    return {entry.citekey: entry for entry in iter_bibliography_entries(handle)}
+
+
+def _parse_bibliography_file(path: Path) -> BibliographyIndex:
+    try:
+        with path.open(encoding="utf-8-sig") as handle:
+            return BibliographyIndex(_read_entries(handle))
+    except DuplicateCitekeyError:
+        raise
+    except BibtexSyntaxError:
+        parser = bibtex.Parser()
+        return BibliographyIndex(_bibliography_entries(parser.parse_file(str(path))))
+
+
+def _parse_bibliography_text(text: str) -> dict[str, BibliographyEntry]:
+    try:
+        return _read_entries(io.StringIO(text))
+    except DuplicateCitekeyError:
+        raise
+    except BibtexSyntaxError:
+        parser = bibtex.Parser()
+        return _bibliography_entries(parser.parse_string(text))
+
+
+def _shard_chunks(data: bytes, spans: list[EntrySpan], shard_count: int) -> list[bytes]:
+    entry_spans = [span for span in spans if not span.is_special]
+    per_shard = max(1, -(-len(entry_spans) // shard_count))
+    boundaries = [entry_spans[position].start for position in range(per_shard, len(entry_spans), per_shard)]
+    chunks: list[bytes] = []
+    for start, end in zip([0] + boundaries, boundaries + [len(data)]):
+        macros = [data[span.start:span.end] for span in spans if span.entry_type == "string" and span.end <= start]
+        chunks.append(b"\n".join(macros + [data[start:end]]))
+    return chunks
+
+
+def _entry_row(entry: BibliographyEntry) -> tuple:
+    return (
+        entry.citekey,
+        entry.title,
+        entry.entry_type,
+        entry.year,
+        entry.date,
+        entry.abstract,
+        tuple(entry.keywords),
+        tuple((person.display_name, person.surname) for person in entry.authors),
+        tuple((person.display_name, person.surname) for person in entry.editors),
+        entry.doi,
+        entry.isbn,
+        entry.url,
+        entry.publisher,
+        entry.journaltitle,
+        entry.institution,
+    )
 
 
-def write_registry(index: BibliographyIndex, output_path: Path) -> None:
+def _entry_from_row(row: tuple) -> BibliographyEntry:
+    (
+        citekey,
+        title,
+        entry_type,
+        year,
+        date,
+        abstract,
+        keywords,
+        authors,
+        editors,
+        doi,
+        isbn,
+        url,
+        publisher,
+        journaltitle,
+        institution,
+    ) = row
+    return BibliographyEntry(
+        citekey=citekey,
+        title=title,
+        entry_type=sys.intern(entry_type),
+        year=sys.intern(year),
+        date=sys.intern(date),
+        abstract=abstract,
+        keywords=[sys.intern(keyword) for keyword in keywords],
+        authors=[_shared_person(display_name, surname) for display_name, surname in authors],
+        editors=[_shared_person(display_name, surname) for display_name, surname in editors],
+        doi=doi,
+        isbn=isbn,
+        url=url,
+        publisher=sys.intern(publisher),
+        journaltitle=sys.intern(journaltitle),
+        institution=sys.intern(institution),
+    )
+
+
+def _parse_shard(chunk: bytes) -> list[tuple] | None:
+    try:
+        return [_entry_row(entry) for entry in _parse_bibliography_text(chunk.decode("utf-8-sig")).values()]
+    except DuplicateCitekeyError:
+        raise
+    except Exception:
+        return None
+
+
+def _parse_entries_parallel(data: bytes, spans: list[EntrySpan], workers: int) -> dict[str, BibliographyEntry] | None:
+    chunks = _shard_chunks(data, spans, workers * SHARDS_PER_WORKER)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        shards = list(executor.map(_parse_shard, chunks))
+    if any(shard is None for shard in shards):
+        return None
+
+    entries: dict[str, BibliographyEntry] = {}
+    seen: set[str] = set()
+    duplicates: list[str] = []
+    for shard in shards:
+        for row in shard:
+            citekey = row[0]
+            folded = citekey.lower()
+            if folded in seen:
+                duplicates.append(citekey)
+                continue
+            seen.add(folded)
+            entries[citekey] = _entry_from_row(row)
+    if duplicates:
+        raise DuplicateCitekeyError(duplicates)
+    return entries
+
+
+def _parse_entries(data: bytes, spans: list[EntrySpan], workers: int = 1) -> dict[str, BibliographyEntry]:
+    entry_count = sum(1 for span in spans if not span.is_special)
+    if workers > 1 and entry_count >= PARALLEL_MIN_ENTRIES:
+        entries = _parse_entries_parallel(data, spans, workers)
+        if entries is not None:
+            return entries
+    return _parse_bibliography_text(data.decode("utf-8-sig"))
+
+
+def _entry_spans_by_citekey(spans: list[EntrySpan]) -> dict[str, EntrySpan] | None:
+    # Citekeys are compared case-insensitively, like a full or sharded parse does.
+    by_citekey: dict[str, EntrySpan] = {}
+    seen: set[str] = set()
+    duplicates: list[str] = []
+    for span in spans:
+        if span.is_special:
+            continue
+        if not span.citekey:
+            return None
+        folded = span.citekey.lower()
+        if folded in seen:
+            duplicates.append(span.citekey)
+            continue
+        seen.add(folded)
+        by_citekey[span.citekey] = span
+    if duplicates:
+        raise DuplicateCitekeyError(duplicates)
+    return by_citekey
+
+
+def _entry_digest(span: EntrySpan, macros: str) -> str:
+    # An entry's fields can expand @string macros, so the macros' digest is part of the entry's.
+    return hashlib.sha256(f"{macros}:{span.digest}".encode("ascii")).hexdigest()
+
+
+def _patch_index(index: BibliographyIndex, data: bytes, spans: list[EntrySpan], macros: str) -> BibliographyIndex | None:
+    current = _entry_spans_by_citekey(spans)
+    if current is None:
+        return None
+    previous = index.entry_digests
+    stale = [span for citekey, span in current.items() if previous.get(citekey) != _entry_digest(span, macros)]
+    removed = [citekey for citekey in previous if citekey not in current]
+
+    if stale:
+        macros = [data[span.start:span.end] for span in spans if span.entry_type == "string"]
+        chunks = macros + [data[span.start:span.end] for span in stale]
+        parsed = _parse_bibliography_text(b"\n\n".join(chunks).decode("utf-8-sig"))
+        if set(parsed) != {span.citekey for span in stale}:
+            return None
+        for entry in parsed.values():
+            index.upsert(entry)
+    for citekey in removed:
+        index.remove(citekey)
+    index.reorder(list(current))
+    index.entry_digests = {citekey: _entry_digest(span, macros) for citekey, span in current.items()}
+    return index
+
+
+def snapshot_path(cache_dir: Path) -> Path:
+    return cache_dir / SNAPSHOT_FILENAME
+
+
+def _load_snapshot(path: Path) -> dict | None:
+    if not path.exists():
+        return None
+    try:
+        with path.open("rb") as handle:
+            payload = pickle.load(handle)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, TypeError):
+        return None
+    if not isinstance(payload, dict) or payload.get("version") != SNAPSHOT_VERSION:
+        return None
+    return payload
+
+
+def _save_snapshot(path: Path, payload: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(path.name + ".tmp")
+    with temp_path.open("wb") as handle:
+        pickle.dump(payload, handle, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_path, path)
+
+
+def parse_bibliography(path: Path, cache_dir: Path | None = None, workers: int = 1) -> BibliographyIndex:
+    if cache_dir is None:
+        if workers > 1:
+            data = path.read_bytes()
+            return BibliographyIndex(_parse_entries(data, scan_entry_spans(data), workers))
+        return _parse_bibliography_file(path)
+
+    stat = path.stat()
+    source = str(path.resolve())
+    cache_path = snapshot_path(cache_dir)
+    snapshot = _load_snapshot(cache_path)
+    if snapshot is not None and snapshot.get("source") != source:
+        snapshot = None
+    if snapshot is not None and snapshot.get("size") == stat.st_size and snapshot.get("mtime_ns") == stat.st_mtime_ns:
+        return snapshot["index"]
+
+    data = path.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    if snapshot is not None and snapshot.get("sha256") == digest:
+        snapshot["size"] = stat.st_size
+        snapshot["mtime_ns"] = stat.st_mtime_ns
+        _save_snapshot(cache_path, snapshot)
+        return snapshot["index"]
+
+    spans = scan_entry_spans(data)
+    macros = macro_digest(spans)
+    index = None
+    if snapshot is not None and snapshot.get("macros") == macros:
+        index = _patch_index(snapshot["index"], data, spans, macros)
+    if index is None:
+        index = BibliographyIndex(_parse_entries(data, spans, workers))
+        current = _entry_spans_by_citekey(spans) or {}
+        index.entry_digests = {
+            citekey: _entry_digest(current[citekey], macros) for citekey in index.entries if citekey in current
+        }
+
+    _save_snapshot(
+        cache_path,
+        {
+            "version": SNAPSHOT_VERSION,
+            "source": source,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": digest,
+            "macros": macros,
+            "index": index,
+        },
+    )
+    return index
+
+
+REGISTRY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    citekey TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    digest TEXT NOT NULL,
+    payload TEXT NOT NULL
+)
+"""
+
+
+def _connect_registry(path: Path) -> sqlite3.Connection:
+    connection = sqlite3.connect(path)
+    connection.execute(REGISTRY_SCHEMA)
+    return connection
+
+
+def _entry_payload(entry: BibliographyEntry) -> str:
+    return json.dumps(entry.as_dict(), ensure_ascii=False)
+
+
+def write_registry(index: BibliographyIndex, output_path: Path) -> BibliographyChanges:
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    payload = {citekey: entry.as_dict() for citekey, entry in index.entries.items()}
-    with output_path.open("w", encoding="utf-8") as handle:
-        json.dump(payload, handle, indent=2, ensure_ascii=False)
+    with closing(_connect_registry(output_path)) as connection, connection:
+        stored = {
+            citekey: (position, digest)
+            for citekey, position, digest in connection.execute("SELECT citekey, position, digest FROM entries")
+        }
+        added = [citekey for citekey in index.entries if citekey not in stored]
+        removed = [citekey for citekey in stored if citekey not in index.entries]
+        if index.entry_digests and all(digest for _position, digest in stored.values()):
+            suspects = [
+                citekey
+                for citekey, digest in index.entry_digests.items()
+                if citekey in stored and stored[citekey][1] != digest
+            ]
+        else:
+            suspects = [citekey for citekey in index.entries if citekey in stored]
+        # A macro edit changes every entry's digest, so only a different payload counts as a change.
+        stored_payloads = dict(connection.execute("SELECT citekey, payload FROM entries")) if suspects else {}
+        changed = [citekey for citekey in suspects if stored_payloads[citekey] != _entry_payload(index.entries[citekey])]
+
+        connection.executemany(
+            "INSERT INTO entries (citekey, position, digest, payload) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(citekey) DO UPDATE SET position = excluded.position, "
+            "digest = excluded.digest, payload = excluded.payload",
+            (
+                (citekey, index.positions[citekey], index.entry_digests.get(citekey, ""), _entry_payload(index.entries[citekey]))
+                for citekey in added + changed
+            ),
+        )
+        connection.executemany("DELETE FROM entries WHERE citekey = ?", ((citekey,) for citekey in removed))
+        touched = set(added) | set(changed)
+        connection.executemany(
+            "UPDATE entries SET position = ?, digest = ? WHERE citekey = ?",
+            (
+                (index.positions[citekey], index.entry_digests.get(citekey, ""), citekey)
+                for citekey, (position, digest) in stored.items()
+                if citekey in index.entries
+                and citekey not in touched
+                and (position, digest) != (index.positions[citekey], index.entry_digests.get(citekey, ""))
+            ),
+        )
+    return BibliographyChanges(added=added, changed=changed, removed=removed)
+
+
+def read_registry_entry(registry_path: Path, citekey: str) -> dict | None:
+    if not registry_path.exists():
+        return None
+    uri = f"{registry_path.resolve().as_uri()}?mode=ro"
+    with closing(sqlite3.connect(uri, uri=True)) as connection:
+        try:
+            row = connection.execute("SELECT payload FROM entries WHERE citekey = ?", (citekey,)).fetchone()
+        except sqlite3.DatabaseError:
+            return None
+    return json.loads(row[0]) if row else None
@@ -73,10 +73,14 @@ def can_spend(ledger: dict, usage: ProviderUsage, budget: BudgetPolicyConfig) ->
     return True, ""
 
 
-def record_spend(path: Path, usage: ProviderUsage, citekey: str) -> dict:
-    ledger = load_budget_ledger(path)
+def add_spend(ledger: dict, usage: ProviderUsage, citekey: str) -> dict:
     ledger["entries"].append({"citekey": citekey, **asdict(usage)})
     ledger["total_tokens"] = ledger.get("total_tokens", 0) + usage.estimated_total_tokens
     ledger["total_cost"] = ledger.get("total_cost", 0.0) + usage.estimated_cost
+    return ledger
+
+
+def record_spend(path: Path, usage: ProviderUsage, citekey: str) -> dict:
+    ledger = add_spend(load_budget_ledger(path), usage, citekey)
     save_budget_ledger(path, ledger)
     return ledger
@@ -1,21 +1,50 @@
 from __future__ import annotations
 
 import argparse
+import json
+import signal
+import sys
+import threading
+import time
 from pathlib import Path
 
-from .config import load_config
+from .bibfile import DuplicateCitekeyError
+from .config import AppConfig, load_config
+from .models import BibliographyQuery, WatchSummary
 from .service import (
+    InvalidPendingApproval,
+    calibrate_pdf_extraction,
     extract_source,
     ingest_batch,
     ingest_source,
+    list_pending_approvals,
     process_watch_folder,
+    query_bibliography,
     register_source,
+    review_pending_approvals,
     run_graph_build,
     run_lint,
-    sync_bibliography,
+    serve_watch_folder,
+    show_bibliography_entry,
+    stage_stats,
+    sync_bibliography_changes,
 )
 
 
+def _year_range(value: str) -> tuple[int | None, int | None]:
+    start, separator, end = value.partition("..")
+    try:
+        low = int(start) if start.strip() else None
+        high = int(end) if end.strip() else None
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid year range: {value!r}") from None
+    if not separator:
+        high = low
+    if low is None and high is None:
+        raise argparse.ArgumentTypeError(f"invalid year range: {value!r}")
+    return low, high
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Bibliography-linked literature wiki engine")
     subparsers = parser.add_subparsers(dest="command", required=True)
@@ -23,6 +52,16 @@ def build_parser() -> argparse.ArgumentParser:
     bib_parser = subparsers.add_parser("bib", help="Bibliography operations")
     bib_subparsers = bib_parser.add_subparsers(dest="bib_command", required=True)
     bib_subparsers.add_parser("sync", help="Parse regex-tag.bib and refresh the local bibliography registry")
+    show_parser = bib_subparsers.add_parser("show", help="Print one entry from the bibliography registry")
+    show_parser.add_argument("--citekey", required=True)
+    query_parser = bib_subparsers.add_parser("query", help="List bibliography entries matching all given filters")
+    query_parser.add_argument("--year", type=_year_range, help="A year or an inclusive range such as 2015..2020, 2015.. or ..2020")
+    query_parser.add_argument("--type", dest="entry_types", action="append", default=[], help="Entry type; repeat to allow several")
+    query_parser.add_argument("--keyword", dest="keywords", action="append", default=[], help="Keyword; repeat to require several")
+    query_parser.add_argument("--journal", default="")
+    query_parser.add_argument("--publisher", default="")
+    query_parser.add_argument("--isbn", default="")
+    query_parser.add_argument("--limit", type=int)
 
     source_parser = subparsers.add_parser("source", help="Source registration operations")
     source_subparsers = source_parser.add_subparsers(dest="source_command", required=True)
@@ -36,6 +75,7 @@ def build_parser() -> argparse.ArgumentParser:
     ingest_parser = subparsers.add_parser("ingest", help="Generate wiki source notes")
     ingest_parser.add_argument("--citekey")
     ingest_parser.add_argument("--batch", action="store_true")
+    ingest_parser.add_argument("--force", action="store_true", help="With --batch, re-ingest sources whose inputs are unchanged")
 
     graph_parser = subparsers.add_parser("graph", help="Graph operations")
     graph_subparsers = graph_parser.add_subparsers(dest="graph_command", required=True)
@@ -44,19 +84,113 @@ def build_parser() -> argparse.ArgumentParser:
     watch_parser = subparsers.add_parser("watch", help="Process queued files from the watch folder")
     watch_subparsers = watch_parser.add_subparsers(dest="watch_command", required=True)
     watch_subparsers.add_parser("run", help="Process the current watch folder queue sequentially")
+    watch_subparsers.add_parser("serve", help="Keep running and process files as they arrive in the watch folder")
+
+    approvals_parser = subparsers.add_parser("approvals", help="Fallback approvals deferred by watch runs")
+    approvals_subparsers = approvals_parser.add_subparsers(dest="approvals_command", required=True)
+    approvals_subparsers.add_parser("list", help="List sources waiting for fallback approval")
+    review_parser = approvals_subparsers.add_parser("review", help="Approve or skip pending fallback approvals in one batch")
+    review_parser.add_argument("--approve", action="append", default=[], metavar="CITEKEY", help="Approve a citekey; repeat for several")
+    review_parser.add_argument("--skip", action="append", default=[], metavar="CITEKEY", help="Send a citekey to review; repeat for several")
+    review_parser.add_argument("--approve-all", action="store_true")
+    review_parser.add_argument("--skip-all", action="store_true")
+
+    stats_parser = subparsers.add_parser("stats", help="Summarise per-stage timings from cache/metrics.jsonl")
+    stats_parser.add_argument("--days", type=float, help="Only include spans from the last N days")
+    stats_parser.add_argument("--all-formats", action="store_true", help="Aggregate stages across source formats")
+
+    pdf_parser = subparsers.add_parser("pdf", help="PDF extraction backends")
+    pdf_subparsers = pdf_parser.add_subparsers(dest="pdf_command", required=True)
+    calibrate_parser = pdf_subparsers.add_parser(
+        "calibrate", help="Benchmark the installed PDF backends and record their throughput and quality"
+    )
+    calibrate_parser.add_argument("files", nargs="*", type=Path, help="Sample PDFs; defaults to a spread of PDFs from raw/ and processed/")
 
     subparsers.add_parser("lint", help="Generate a basic lint report for the wiki")
     return parser
 
 
+def _select_approvals(citekeys: list[str]) -> list[str]:
+    answer = input("Approve which? (all, none, or numbers such as 1,3): ").strip().lower()
+    if answer == "all":
+        return citekeys
+    selected: list[str] = []
+    for part in answer.replace(",", " ").split():
+        if part.isdigit() and 1 <= int(part) <= len(citekeys):
+            selected.append(citekeys[int(part) - 1])
+    return selected
+
+
+def _print_watch_summary(label: str, summary: WatchSummary) -> None:
+    print(
+        f"{label}: "
+        f"success={summary.success_count} "
+        f"issues={summary.issue_count} "
+        f"failed={summary.fail_count} "
+        f"pdf={summary.pdf_count} "
+        f"epub={summary.epub_count} "
+        f"markdown={summary.markdown_count} "
+        f"other={summary.other_count} "
+        f"awaiting_approval={summary.deferred_count} "
+        f"elapsed={summary.elapsed_seconds:.2f}s",
+        flush=True,
+    )
+
+
 def main() -> int:
     parser = build_parser()
     args = parser.parse_args()
     config = load_config()
+    try:
+        return _run(parser, args, config)
+    except DuplicateCitekeyError as error:
+        print(f"error: {config.bibliography_file}: {error}", file=sys.stderr)
+        return 1
+    except InvalidPendingApproval as error:
+        print(f"error: {config.registry_file}: {error}", file=sys.stderr)
+        return 1
 
+
+def _run(parser: argparse.ArgumentParser, args: argparse.Namespace, config: AppConfig) -> int:
     if args.command == "bib" and args.bib_command == "sync":
-        bibliography = sync_bibliography(config)
-        print(f"Synced {len(bibliography.entries)} bibliography entries to {config.bibliography_registry_file}")
+        bibliography, changes = sync_bibliography_changes(config)
+        print(
+            f"Synced {len(bibliography.entries)} bibliography entries to {config.bibliography_registry_file} "
+            f"(added={len(changes.added)} changed={len(changes.changed)} removed={len(changes.removed)})"
+        )
+        for marker, citekeys in (("+", changes.added), ("~", changes.changed), ("-", changes.removed)):
+            for citekey in citekeys[:20]:
+                print(f"  {marker} {citekey}")
+            if len(citekeys) > 20:
+                print(f"  {marker} ... and {len(citekeys) - 20} more")
+        return 0
+
+    if args.command == "bib" and args.bib_command == "show":
+        entry = show_bibliography_entry(config, args.citekey)
+        if entry is None:
+            print(f"{args.citekey} is not in {config.bibliography_registry_file}; run `bib sync` first if the entry is new")
+            return 1
+        print(json.dumps(entry, indent=2, ensure_ascii=False))
+        return 0
+
+    if args.command == "bib" and args.bib_command == "query":
+        year_from, year_to = args.year or (None, None)
+        entries = query_bibliography(
+            config,
+            BibliographyQuery(
+                year_from=year_from,
+                year_to=year_to,
+                entry_types=args.entry_types,
+                keywords=args.keywords,
+                journaltitle=args.journal,
+                publisher=args.publisher,
+                isbn=args.isbn,
+                limit=args.limit,
+            ),
+        )
+        for entry in entries:
+            print(f"{entry.citekey}\t{entry.year or '----'}\t{entry.entry_type}\t{entry.title}")
+        print(f"{len(entries)} matching entries")
         return 0
 
     if args.command == "source" and args.source_command == "register":
@@ -74,8 +208,10 @@ def main() -> int:
 
     if args.command == "ingest":
         if args.batch:
-            ingested = ingest_batch(config)
-            print(f"Ingested {len(ingested)} source notes")
+            batch = ingest_batch(config, force=args.force)
+            for citekey in batch.skipped:
+                print(f"Skipped {citekey} (up to date)")
+            print(f"Ingested {len(batch.ingested)} source notes, skipped {len(batch.skipped)} unchanged")
             return 0
         if not args.citekey:
             parser.error("ingest requires --citekey unless --batch is used")
@@ -89,20 +225,78 @@ def main() -> int:
         return 0
 
     if args.command == "watch" and args.watch_command == "run":
-        summary = process_watch_folder(config)
+        _print_watch_summary("Watch run complete", process_watch_folder(config))
+        return 0
+
+    if args.command == "watch" and args.watch_command == "serve":
+        stop = threading.Event()
+        signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+        try:
+            serve_watch_folder(
+                config,
+                stop,
+                on_batch=lambda summary: _print_watch_summary("Watch batch complete", summary),
+                report=print,
+            )
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    if args.command == "approvals":
+        pending = list_pending_approvals(config)
+        citekeys = [item.citekey for item in pending]
+        if args.approvals_command == "list" or not pending:
+            for number, item in enumerate(pending, start=1):
+                request = item.outcome.approval_request
+                print(
+                    f"{number}. {item.citekey}\t{request.fallback_provider}/{request.fallback_model}\t"
+                    f"~{request.usage.estimated_total_tokens} tokens\t{request.reason}"
+                )
+            print(f"{len(pending)} pending fallback approvals")
+            return 0
+        approve = citekeys if args.approve_all else args.approve
+        skip = citekeys if args.skip_all else args.skip
+        if not (approve or skip):
+            for number, item in enumerate(pending, start=1):
+                print(f"{number}. {item.citekey}\t~{item.outcome.approval_request.usage.estimated_total_tokens} tokens")
+            approve = _select_approvals(citekeys)
+        review = review_pending_approvals(config, approve=approve, skip=skip)
+        for citekey, reason in review.failed.items():
+            print(f"Failed {citekey}: {reason}")
+        for citekey, reason in review.held.items():
+            print(f"Held {citekey}: {reason}")
         print(
-            "Watch run complete: "
-            f"success={summary.success_count} "
-            f"issues={summary.issue_count} "
-            f"failed={summary.fail_count} "
-            f"pdf={summary.pdf_count} "
-            f"epub={summary.epub_count} "
-            f"markdown={summary.markdown_count} "
-            f"other={summary.other_count} "
-            f"elapsed={summary.elapsed_seconds:.2f}s"
+            f"Approved {len(review.ingested)} source notes, skipped {len(review.skipped)}, "
+            f"failed {len(review.failed)}, still pending {len(pending) - len(review.ingested) - len(review.skipped) - len(review.failed)}"
         )
         return 0
 
+    if args.command == "stats":
+        since = time.time() - args.days * 86400 if args.days else 0.0
+        stats = stage_stats(config, since=since, by_format=not args.all_formats)
+        if not stats:
+            print(f"No spans recorded in {config.metrics_file}")
+            return 0
+        width = max(len(item.stage) for item in stats)
+        print(f"{'stage':<{width}}  {'format':<12} {'count':>6} {'p50 ms':>10} {'p95 ms':>10} {'total s':>10}")
+        for item in stats:
+            print(
+                f"{item.stage:<{width}}  {item.source_format or '-':<12} {item.count:>6} "
+                f"{item.p50_seconds * 1000:>10.1f} {item.p95_seconds * 1000:>10.1f} {item.total_seconds:>10.2f}"
+            )
+        return 0
+
+    if args.command == "pdf" and args.pdf_command == "calibrate":
+        scores = calibrate_pdf_extraction(config, args.files)
+        print(f"{'backend':<10} {'pages/s':>9} {'MB/s':>8} {'quality':>8}")
+        for score in scores:
+            print(
+                f"{score.name:<10} {score.pages_per_second:>9.1f} "
+                f"{score.bytes_per_second / 2**20:>8.2f} {score.quality:>8.3f}"
+            )
+        print(f"Calibrated on {scores[0].samples if scores else 0} samples; saved to {config.pdf_calibration_file}")
+        return 0
+
     if args.command == "lint":
         report = run_lint(config)
         print(report.rstrip())
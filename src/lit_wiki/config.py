@@ -7,6 +7,9 @@ from typing import Any
 
 import yaml
 
+from .pdf_backends import PDF_BACKENDS
+from .scanner import validate_patterns
+
 
 @dataclass
 class ProviderSpec:
@@ -38,6 +41,7 @@ class RetryPolicyConfig:
 class ApprovalPolicyConfig:
     required: bool = True
     default_decision: str = "prompt"
+    defer_in_watch: bool = True
 
 
 @dataclass
@@ -63,6 +67,25 @@ class KeywordPolicyConfig:
     min_body_matches: int = 3
 
 
+@dataclass
+class ArtifactPatternsConfig:
+    boilerplate: list[str] = field(default_factory=list)
+    contamination: list[str] = field(default_factory=list)
+
+
+@dataclass
+class WatchPipelineConfig:
+    extract_workers: int = 1
+    provider_workers: int = 1
+    queue_size: int = 4
+
+
+@dataclass
+class WatchServeConfig:
+    settle_seconds: float = 2.0
+    poll_interval: float = 2.0
+
+
 @dataclass
 class AppConfig:
     repo_root: Path
@@ -77,9 +100,15 @@ class AppConfig:
     watch_dir: Path
     processed_dir: Path
     other_dir: Path
+    pending_dir: Path
     registry_file: Path
     bibliography_registry_file: Path
     budget_ledger_file: Path
+    extraction_cache_dir: Path
+    watch_journal_file: Path
+    wiki_batch_file: Path
+    metrics_file: Path
+    pdf_calibration_file: Path
     local_config_file: Path
     env_file: Path
     primary_provider: ProviderSpec
@@ -90,6 +119,14 @@ class AppConfig:
     budget_policy: BudgetPolicyConfig = field(default_factory=BudgetPolicyConfig)
     keyword_policy: KeywordPolicyConfig = field(default_factory=KeywordPolicyConfig)
     show_completion_dialog: bool = True
+    bibliography_parse_workers: int = 1
+    extraction_cache_max_bytes: int = 1024 * 2**20
+    pdf_extract_workers: int = 1
+    pdf_backend: str = "auto"
+    artifact_patterns: ArtifactPatternsConfig = field(default_factory=ArtifactPatternsConfig)
+    watch_pipeline: WatchPipelineConfig = field(default_factory=WatchPipelineConfig)
+    watch_serve: WatchServeConfig = field(default_factory=WatchServeConfig)
+    metrics_enabled: bool = True
 
 
 def _read_yaml_if_exists(path: Path) -> dict[str, Any]:
@@ -177,6 +214,13 @@ def _keyword_policy(root: Path, merged: dict[str, Any]) -> KeywordPolicyConfig:
     )
 
 
+def _pdf_backend(value: Any) -> str:
+    name = str(value or "auto").strip().lower()
+    if name != "auto" and name not in PDF_BACKENDS:
+        raise ValueError(f"Unknown pdf_backend {value!r}; expected auto or one of {', '.join(PDF_BACKENDS)}")
+    return name
+
+
 def load_config(repo_root: Path | None = None) -> AppConfig:
     root = repo_root or Path.cwd()
     config_path = root / "config.yaml"
@@ -205,10 +249,14 @@ def load_config(repo_root: Path | None = None) -> AppConfig:
     watch_dir = root / merged.get("watch_dir", "watch")
     processed_dir = watch_dir / merged.get("processed_subdir", "processed")
     other_dir = watch_dir / merged.get("other_subdir", "other")
+    pending_dir = watch_dir / merged.get("pending_subdir", "pending")
 
     retry_payload = provider.get("retry_policy") or {}
     approval_payload = provider.get("approval") or {}
     budget_payload = provider.get("budget") or {}
+    pipeline_payload = merged.get("watch_pipeline") or {}
+    serve_payload = merged.get("watch_serve") or {}
+    artifact_payload = merged.get("artifact_patterns") or {}
 
     return AppConfig(
         repo_root=root,
@@ -223,9 +271,15 @@ def load_config(repo_root: Path | None = None) -> AppConfig:
         watch_dir=watch_dir,
         processed_dir=processed_dir,
         other_dir=other_dir,
-        registry_file=cache_dir / "source_registry.json",
-        bibliography_registry_file=cache_dir / "bibliography_registry.json",
+        pending_dir=pending_dir,
+        registry_file=cache_dir / "source_registry.sqlite",
+        bibliography_registry_file=cache_dir / "bibliography_registry.sqlite",
         budget_ledger_file=cache_dir / "budget_ledger.json",
+        extraction_cache_dir=cache_dir / "extraction",
+        watch_journal_file=cache_dir / "watch_journal.jsonl",
+        wiki_batch_file=cache_dir / "wiki_batch.jsonl",
+        metrics_file=cache_dir / "metrics.jsonl",
+        pdf_calibration_file=cache_dir / "pdf_backends.json",
         local_config_file=local_config_path,
         env_file=root / ".env",
         primary_provider=_provider_spec_from_mapping("primary", primary_payload, families),
@@ -237,6 +291,7 @@ def load_config(repo_root: Path | None = None) -> AppConfig:
         approval_policy=ApprovalPolicyConfig(
             required=bool(approval_payload.get("required", True)),
             default_decision=str(approval_payload.get("default_decision", "prompt")),
+            defer_in_watch=bool(approval_payload.get("defer_in_watch", True)),
         ),
         budget_policy=BudgetPolicyConfig(
             max_input_chars_per_request=int(budget_payload.get("max_input_chars_per_request", 12000)),
@@ -249,6 +304,26 @@ def load_config(repo_root: Path | None = None) -> AppConfig:
         ),
         keyword_policy=_keyword_policy(root, merged),
         show_completion_dialog=bool(merged.get("show_completion_dialog", True)),
+        bibliography_parse_workers=max(1, int(merged.get("bibliography_parse_workers", 1))),
+        extraction_cache_max_bytes=max(0, int(merged.get("extraction_cache_max_mb", 1024))) * 2**20,
+        pdf_extract_workers=max(1, int(merged.get("pdf_extract_workers", 1))),
+        pdf_backend=_pdf_backend(merged.get("pdf_backend", "auto")),
+        artifact_patterns=ArtifactPatternsConfig(
+            boilerplate=validate_patterns(artifact_payload.get("boilerplate") or [], "artifact_patterns.boilerplate"),
+            contamination=validate_patterns(
+                artifact_payload.get("contamination") or [], "artifact_patterns.contamination"
+            ),
+        ),
+        watch_pipeline=WatchPipelineConfig(
+            extract_workers=max(1, int(pipeline_payload.get("extract_workers", 1))),
+            provider_workers=max(1, int(pipeline_payload.get("provider_workers", 1))),
+            queue_size=max(0, int(pipeline_payload.get("queue_size", 4))),
+        ),
+        metrics_enabled=bool(merged.get("metrics_enabled", True)),
+        watch_serve=WatchServeConfig(
+            settle_seconds=max(0.0, float(serve_payload.get("settle_seconds", 2.0))),
+            poll_interval=max(0.1, float(serve_payload.get("poll_interval", 2.0))),
+        ),
     )
 
 
@@ -263,5 +338,6 @@ def ensure_runtime_directories(config: AppConfig) -> None:
         config.watch_dir,
         config.processed_dir,
         config.other_dir,
+        config.pending_dir,
     ):
         path.mkdir(parents=True, exist_ok=True)
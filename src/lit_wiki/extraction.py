@@ -1,41 +1,43 @@
 from __future__ import annotations
 
+import os
 import re
-import subprocess
+import shutil
 import zipfile
+from itertools import chain
 from pathlib import Path
+from typing import Iterable, Iterator, Sequence
 
 from bs4 import BeautifulSoup
 from ebooklib import ITEM_DOCUMENT, epub
 from ftfy import fix_text
 
 from .matching import detect_source_format
+from .metrics import span
+from .pdf_backends import PDF_BACKENDS, load_pdf_calibration, pdf_calibration_digest, plan_pdf_backends
+from .scanner import PatternScanner, boilerplate_scanner, patterns_digest
 
-CONTROL_CHARS_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]")
-INLINE_NEWLINE_RE = re.compile(r"(?<!\n)\n(?!\n)")
+# Bump whenever extraction or cleaning output changes so cached text is not reused.
+EXTRACTOR_VERSION = "2"
+CLEAN_BLOCK_CHARS = 64 * 1024
+# Soft hyphens and C0 control characters other than tab, newline and ESC, deleted in one translate
+# pass before ftfy. ESC is left for ftfy, which drops whole terminal escape sequences and then ESC itself.
+DELETED_CHARS = dict.fromkeys([*range(0x00, 0x09), 0x0B, 0x0C, *range(0x0E, 0x1B), *range(0x1C, 0x20), 0x7F, 0xAD])
+LINE_SEPARATORS = {0x2028: "\n", 0x2029: "\n"}
 WHITESPACE_RE = re.compile(r"[ \t]+")
-BOILERPLATE_PATTERNS = [
-    re.compile(pattern, re.IGNORECASE)
-    for pattern in (
-        r"^jstor is a not-for-profit service",
-        r"^your use of the jstor archive indicates",
-        r"^for more information about jstor",
-        r"^all use subject to https?://about\.jstor\.org/terms",
-        r"^https?://about\.jstor\.org/terms$",
-        r"^this content downloaded from$",
-        r"^stable url:\s*https?://",
-        r"downloaded from .* utc",
-        r"collaborating with jstor to digitize, preserve and extend access",
-    )
-]
-
-
-def _html_to_text(text: str) -> str:
+WORD_CHAR_RE = re.compile(r"\w")
+
+
+def _html_to_text(text: str, boilerplate: PatternScanner | None = None) -> str:
+    return "".join(_iter_html_text(text, boilerplate))
+
+
+def _iter_html_text(text: str, boilerplate: PatternScanner | None = None) -> Iterator[str]:
     soup = BeautifulSoup(text, "html.parser")
     for tag in soup(["script", "style", "noscript"]):
         tag.decompose()
     rendered = soup.get_text("\n")
-    return _clean_extracted_text(rendered)
+    return iter_clean_text([rendered], boilerplate)
 
 
 def _strip_markdown_frontmatter(text: str) -> str:
@@ -47,100 +49,213 @@ def _strip_markdown_frontmatter(text: str) -> str:
     return parts[2].lstrip()
 
 
-def _clean_line(line: str) -> str:
-    cleaned = fix_text(line.replace("\u00ad", ""))
-    cleaned = CONTROL_CHARS_RE.sub("", cleaned)
-    cleaned = WHITESPACE_RE.sub(" ", cleaned).strip()
-    return cleaned
+def _iter_line_blocks(chunks: Iterable[str]) -> Iterator[str]:
+    # Re-cut arbitrary chunks into blocks of at least CLEAN_BLOCK_CHARS that end on a newline.
+    carry: list[str] = []
+    carried = 0
+    for chunk in chunks:
+        start = 0
+        while True:
+            end = chunk.find("\n", start + max(0, CLEAN_BLOCK_CHARS - carried - 1))
+            if end < 0:
+                break
+            carry.append(chunk[start:end + 1])
+            yield "".join(carry)
+            carry, carried, start = [], 0, end + 1
+        if start < len(chunk):
+            carry.append(chunk[start:])
+            carried += len(chunk) - start
+    if carry:
+        yield "".join(carry)
 
 
-def _looks_like_boilerplate(line: str) -> bool:
-    if not line:
-        return False
-    return any(pattern.search(line) for pattern in BOILERPLATE_PATTERNS)
+def _needs_ftfy(text: str) -> bool:
+    # Once DELETED_CHARS is gone, ftfy leaves ASCII text alone unless it has HTML entities or ESC.
+    return not text.isascii() or "&" in text or "\x1b" in text
 
 
-def _clean_extracted_text(text: str) -> str:
-    fixed = fix_text((text or "").replace("\r\n", "\n").replace("\r", "\n"))
-    fixed = fixed.replace("\u00ad", "")
-    fixed = CONTROL_CHARS_RE.sub("", fixed)
-    fixed = re.sub(r"(?<=\w)-\n(?=\w)", "", fixed)
+def _fix_text_lines(text: str) -> str:
+    # One fix_text call per line that can change, each line judging the HTML heuristic on its own.
+    if not _needs_ftfy(text):
+        return text
+    return "\n".join(fix_text(line) if _needs_ftfy(line) else line for line in text.split("\n"))
 
-    cleaned_lines: list[str] = []
-    for raw_line in fixed.split("\n"):
-        line = _clean_line(raw_line)
-        if _looks_like_boilerplate(line):
-            continue
-        if line.startswith("http://") or line.startswith("https://"):
+
+def _iter_fixed_lines(blocks: Iterable[str]) -> Iterator[str]:
+    tail = ""
+    for block in blocks:
+        # Unicode line separators become line breaks before ftfy so each line is fixed on its own.
+        block = block.replace("\r\n", "\n").replace("\r", "\n").translate(LINE_SEPARATORS).translate(DELETED_CHARS)
+        fixed = WHITESPACE_RE.sub(" ", _fix_text_lines(block))
+        lines = (tail + fixed).split("\n")
+        tail = lines.pop()
+        yield from lines
+    yield tail
+
+
+def _join_hyphenated(lines: Iterable[str]) -> Iterator[str]:
+    # Line-wise form of re.sub(r"(?<=\w)-\n(?=\w)", "", text): each break is judged on the original lines.
+    current: str | None = None
+    previous = ""
+    for line in lines:
+        if current is None:
+            current = line
+        elif (
+            len(previous) > 1
+            and previous[-1] == "-"
+            and WORD_CHAR_RE.match(previous[-2])
+            and WORD_CHAR_RE.match(line[:1])
+        ):
+            current = current[:-1] + line
+        else:
+            yield current
+            current = line
+        previous = line
+    if current is not None:
+        yield current
+
+
+def _iter_paragraph_text(lines: Iterable[str]) -> Iterator[str]:
+    # Non-empty lines of a paragraph are joined with a space, paragraphs with one blank line.
+    parts: list[str] = []
+    size = 0
+    separator = ""
+    for line in lines:
+        if not line:
+            if separator:
+                separator = "\n\n"
             continue
-        cleaned_lines.append(line)
+        parts.append(separator)
+        parts.append(line)
+        separator = " "
+        size += len(line) + 2
+        if size >= CLEAN_BLOCK_CHARS:
+            yield "".join(parts)
+            parts, size = [], 0
+    if parts:
+        yield "".join(parts)
+
+
+def _iter_kept_lines(lines: Iterable[str], boilerplate: PatternScanner) -> Iterator[str]:
+    # Lines are screened a block at a time so the scanner's prefilter runs once per block.
+    batch: list[str] = []
+    size = 0
+    for line in lines:
+        batch.append(line)
+        size += len(line) + 1
+        if size >= CLEAN_BLOCK_CHARS:
+            yield from boilerplate.drop_matching_lines(batch)
+            batch, size = [], 0
+    if batch:
+        yield from boilerplate.drop_matching_lines(batch)
+
 
-    collapsed = "\n".join(cleaned_lines)
-    collapsed = re.sub(r"\n{3,}", "\n\n", collapsed)
-    collapsed = INLINE_NEWLINE_RE.sub(" ", collapsed)
-    collapsed = re.sub(r"\n\s+\n", "\n\n", collapsed)
-    collapsed = WHITESPACE_RE.sub(" ", collapsed)
-    collapsed = re.sub(r"\n{3,}", "\n\n", collapsed)
-    return collapsed.strip()
+def iter_clean_text(chunks: Iterable[str], boilerplate: PatternScanner | None = None) -> Iterator[str]:
+    """Clean extracted text block by block; the joined output equals ``_clean_extracted_text`` of the joined input.
 
+    Lines matched by ``boilerplate`` (by default the built-in JSTOR and bare-URL rules) are dropped.
+    """
+    with span("extract.clean"):
+        lines = (line.strip() for line in _join_hyphenated(_iter_fixed_lines(_iter_line_blocks(chunks))))
+        yield from _iter_paragraph_text(_iter_kept_lines(lines, boilerplate or boilerplate_scanner()))
 
-def _extract_pdf_text(path: Path) -> str:
+
+def _clean_extracted_text(text: str, boilerplate: PatternScanner | None = None) -> str:
+    return "".join(iter_clean_text([text or ""], boilerplate))
+
+
+def _joined_pages(pages: Iterable[str]) -> Iterator[str]:
+    for number, text in enumerate(pages):
+        if number:
+            yield "\n\n"
+        yield text
+
+
+def _iter_backend_pages(name: str, path: Path, workers: int) -> Iterator[str]:
+    with span(f"extract.{name}"):
+        for text in PDF_BACKENDS[name].extract_pages(path, workers):
+            if text:
+                yield text
+
+
+def _pdf_pages(path: Path, workers: int = 1, backends: Sequence[str] | None = None) -> tuple[str, Iterator[str]]:
+    # The first backend that yields a page with text wins; its name is returned with its pages,
+    # which are pulled lazily. A backend that fails or finds nothing before then hands over to the
+    # next one; a failure after its first page propagates, since that text is already on its way out.
     resolved = path.expanduser().resolve()
     if not resolved.exists():
         raise RuntimeError(f"PDF source not found: {resolved}")
-    try:
-        from pypdf import PdfReader
+    backends = plan_pdf_backends(resolved) if backends is None else backends
+    if not backends:
+        raise RuntimeError("No PDF extraction backend is available.")
+    errors: list[str] = []
+    for name in backends:
+        pages = _iter_backend_pages(name, resolved, workers)
+        try:
+            first = next(pages, None)
+        except Exception as exc:
+            errors.append(f"{name}: {exc}")
+            continue
+        if first is not None:
+            return name, chain([first], pages)
+    details = f" ({'; '.join(errors)})" if errors else ""
+    raise RuntimeError(f"Unable to extract text from PDF via {' or '.join(backends)}.{details}")
 
-        reader = PdfReader(str(resolved))
-        pages: list[str] = []
-        for page in reader.pages:
-            text = (page.extract_text() or "").strip()
-            if text:
-                pages.append(text)
-        content = "\n\n".join(pages).strip()
-        if content:
-            return _clean_extracted_text(content)
-    except ImportError:
-        pass
-
-    command = ["mdls", "-raw", "-name", "kMDItemTextContent", str(resolved)]
-    try:
-        result = subprocess.run(command, capture_output=True, text=True, check=False)
-    except FileNotFoundError as exc:
-        raise RuntimeError("No PDF extraction backend is available.") from exc
 
-    content = (result.stdout or "").strip()
-    if not content or content == "(null)":
-        raise RuntimeError("Unable to extract text from PDF via pypdf or mdls.")
-    return _clean_extracted_text(content)
+def _iter_pdf_text(
+    path: Path,
+    workers: int = 1,
+    boilerplate: PatternScanner | None = None,
+    backends: Sequence[str] | None = None,
+) -> Iterator[str]:
+    _backend, pages = _pdf_pages(path, workers, backends)
+    return iter_clean_text(_joined_pages(pages), boilerplate)
+
 
+def _extract_pdf_text(
+    path: Path,
+    workers: int = 1,
+    boilerplate: PatternScanner | None = None,
+    backends: Sequence[str] | None = None,
+) -> str:
+    return "".join(_iter_pdf_text(path, workers, boilerplate, backends))
 
-def _extract_epub_archive(path: Path) -> str:
+
+def _iter_epub_archive(path: Path, boilerplate: PatternScanner | None = None) -> Iterator[str]:
     book = epub.read_epub(str(path))
-    chunks: list[str] = []
+    written = 0
     seen_ids: set[str] = set()
     for item_id, _linear in book.spine:
         item = book.get_item_with_id(item_id)
         if item is None or item.get_type() != ITEM_DOCUMENT:
             continue
         seen_ids.add(item.get_id())
-        text = _html_to_text(item.get_content().decode("utf-8", errors="ignore"))
+        text = _html_to_text(item.get_content().decode("utf-8", errors="ignore"), boilerplate)
         if text:
-            chunks.append(f"# {Path(item.file_name or item.get_name()).name}\n\n{text}")
-    if not chunks:
+            if written:
+                yield "\n\n"
+            yield f"# {Path(item.file_name or item.get_name()).name}\n\n{text}"
+            written += 1
+    if not written:
         for item in book.get_items():
             if item.get_type() != ITEM_DOCUMENT or item.get_id() in seen_ids:
                 continue
-            text = _html_to_text(item.get_content().decode("utf-8", errors="ignore"))
+            text = _html_to_text(item.get_content().decode("utf-8", errors="ignore"), boilerplate)
             if text:
-                chunks.append(f"# {Path(item.file_name or item.get_name()).name}\n\n{text}")
-    if not chunks:
+                if written:
+                    yield "\n\n"
+                yield f"# {Path(item.file_name or item.get_name()).name}\n\n{text}"
+                written += 1
+    if not written:
         raise RuntimeError("No XHTML/HTML files found in EPUB archive.")
-    return "\n\n".join(chunks)
 
 
-def _extract_epub_directory(path: Path) -> str:
-    chunks: list[str] = []
+def _extract_epub_archive(path: Path, boilerplate: PatternScanner | None = None) -> str:
+    return "".join(_iter_epub_archive(path, boilerplate))
+
+
+def _iter_epub_directory(path: Path, boilerplate: PatternScanner | None = None) -> Iterator[str]:
+    written = 0
     for file_path in sorted(path.rglob("*")):
         if not file_path.is_file():
             continue
@@ -148,24 +263,173 @@ def _extract_epub_directory(path: Path) -> str:
         if suffix not in {".xhtml", ".html", ".htm", ".md", ".markdown"}:
             continue
         raw = file_path.read_text(encoding="utf-8", errors="ignore")
-        text = _clean_extracted_text(_strip_markdown_frontmatter(raw)) if suffix in {".md", ".markdown"} else _html_to_text(raw)
+        if suffix in {".md", ".markdown"}:
+            text = _clean_extracted_text(_strip_markdown_frontmatter(raw), boilerplate)
+        else:
+            text = _html_to_text(raw, boilerplate)
         if text:
-            chunks.append(f"# {file_path.name}\n\n{text}")
-    if not chunks:
+            if written:
+                yield "\n\n"
+            yield f"# {file_path.name}\n\n{text}"
+            written += 1
+    if not written:
         raise RuntimeError("No extractable markdown or XHTML files found in EPUB package directory.")
-    return "\n\n".join(chunks)
 
 
-def extract_to_markdown(source_path: Path) -> str:
+def _extract_epub_directory(path: Path, boilerplate: PatternScanner | None = None) -> str:
+    return "".join(_iter_epub_directory(path, boilerplate))
+
+
+def iter_extracted_text(
+    source_path: Path,
+    pdf_workers: int = 1,
+    boilerplate: PatternScanner | None = None,
+    pdf_backends: Sequence[str] | None = None,
+) -> tuple[Iterator[str], str]:
+    """The cleaned markdown of ``source_path`` in blocks, and the PDF backend that produced it ("" otherwise)."""
     source_format = detect_source_format(source_path)
     if source_format == "markdown":
-        return _clean_extracted_text(_strip_markdown_frontmatter(source_path.read_text(encoding="utf-8")))
+        return iter_clean_text([_strip_markdown_frontmatter(source_path.read_text(encoding="utf-8"))], boilerplate), ""
     if source_format == "xhtml":
-        return _html_to_text(source_path.read_text(encoding="utf-8", errors="ignore"))
+        return _iter_html_text(source_path.read_text(encoding="utf-8", errors="ignore"), boilerplate), ""
     if source_format == "epub":
-        return _extract_epub_archive(source_path)
+        return _iter_epub_archive(source_path, boilerplate), ""
     if source_format == "epub_package":
-        return _extract_epub_directory(source_path)
+        return _iter_epub_directory(source_path, boilerplate), ""
     if source_format == "pdf":
-        return _extract_pdf_text(source_path)
+        backend, pages = _pdf_pages(source_path, pdf_workers, pdf_backends)
+        return iter_clean_text(_joined_pages(pages), boilerplate), backend
     raise RuntimeError(f"Unsupported extraction format: {source_format}")
+
+
+def extract_to_markdown(
+    source_path: Path,
+    pdf_workers: int = 1,
+    boilerplate: PatternScanner | None = None,
+    pdf_backends: Sequence[str] | None = None,
+) -> str:
+    blocks, _backend = iter_extracted_text(source_path, pdf_workers, boilerplate, pdf_backends)
+    return "".join(blocks)
+
+
+def extraction_cache_path(
+    cache_dir: Path, raw_hash: str, boilerplate_patterns: Sequence[str] = (), pdf_backend: str = ""
+) -> Path:
+    # Extra boilerplate patterns and PDF backends other than pypdf change the text, so they get
+    # their own cache entries.
+    variant = f"-{patterns_digest(boilerplate_patterns)}" if boilerplate_patterns else ""
+    if pdf_backend and pdf_backend != "pypdf":
+        variant += f"-{pdf_backend}"
+    return cache_dir / f"{raw_hash}-{EXTRACTOR_VERSION}{variant}.md"
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    temporary.write_text(text, encoding="utf-8")
+    os.replace(temporary, path)
+
+
+def _write_blocks_atomic(path: Path, blocks: Iterable[str]) -> None:
+    # Each block goes to disk as soon as it is cleaned and is not kept; callers read the file back.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with temporary.open("w", encoding="utf-8") as handle:
+            for block in blocks:
+                handle.write(block)
+        os.replace(temporary, path)
+    except BaseException:
+        temporary.unlink(missing_ok=True)
+        raise
+
+
+def _link_or_copy(source: Path, target: Path) -> None:
+    # Always replace the target so a later write to it can never truncate the shared cache inode.
+    target.parent.mkdir(parents=True, exist_ok=True)
+    temporary = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    temporary.unlink(missing_ok=True)
+    try:
+        os.link(source, temporary)
+    except OSError:
+        shutil.copyfile(source, temporary)
+    os.replace(temporary, target)
+
+
+def evict_extraction_cache(cache_dir: Path, max_bytes: int) -> list[Path]:
+    if not cache_dir.exists():
+        return []
+    entries = []
+    for item in os.scandir(cache_dir):
+        if item.is_file() and item.name.endswith(".md") and not item.name.startswith("."):
+            stat = item.stat()
+            entries.append((stat.st_mtime_ns, stat.st_size, Path(item.path)))
+    total = sum(size for _mtime, size, _path in entries)
+    evicted: list[Path] = []
+    for _mtime, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+        evicted.append(path)
+    return evicted
+
+
+def _plan_pdf_backends(source_path: Path, calibration_file: Path | None, pdf_backend: str) -> list[str]:
+    return plan_pdf_backends(source_path, load_pdf_calibration(calibration_file), pdf_backend)
+
+
+def extract_to_file(
+    source_path: Path,
+    output_path: Path,
+    raw_hash: str = "",
+    cache_dir: Path | None = None,
+    cache_max_bytes: int = 0,
+    pdf_workers: int = 1,
+    boilerplate_patterns: Sequence[str] = (),
+    pdf_calibration_file: Path | None = None,
+    pdf_backend: str = "auto",
+) -> str:
+    """Write the cleaned text of ``source_path`` to ``output_path`` and return it.
+
+    Text is cleaned and written block by block as it is extracted, then read back from disk, so the
+    raw, intermediate and cleaned copies are never held together. pypdf hands over one page at a
+    time; pdfminer, pdftotext and mdls produce their whole output before cleaning starts.
+    """
+    boilerplate = boilerplate_scanner(tuple(boilerplate_patterns))
+    is_pdf = detect_source_format(source_path) == "pdf"
+    if not raw_hash or cache_dir is None or cache_max_bytes <= 0:
+        with span("extract.parse"):
+            pdf_backends = _plan_pdf_backends(source_path, pdf_calibration_file, pdf_backend) if is_pdf else None
+            blocks, _backend = iter_extracted_text(source_path, pdf_workers, boilerplate, pdf_backends)
+            _write_blocks_atomic(output_path, blocks)
+        return output_path.read_text(encoding="utf-8")
+
+    # Looked up under the requested backend, so a hit needs neither the calibration nor a look
+    # inside the PDF. A miss stores the text under the backend that actually produced it and
+    # links the requested name to that entry.
+    requested_backend = pdf_backend if is_pdf else ""
+    if requested_backend == "auto":
+        # "auto" follows the calibration, so recalibrating has to move it to a new entry.
+        requested_backend = f"auto-{pdf_calibration_digest(pdf_calibration_file)}"
+    requested = extraction_cache_path(cache_dir, raw_hash, boilerplate_patterns, requested_backend)
+    cached = requested
+    try:
+        text = requested.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        with span("extract.parse"):
+            pdf_backends = _plan_pdf_backends(source_path, pdf_calibration_file, pdf_backend) if is_pdf else None
+            blocks, produced_by = iter_extracted_text(source_path, pdf_workers, boilerplate, pdf_backends)
+            cached = extraction_cache_path(cache_dir, raw_hash, boilerplate_patterns, produced_by)
+            _write_blocks_atomic(cached, blocks)
+        text = cached.read_text(encoding="utf-8")
+        if cached != requested:
+            _link_or_copy(cached, requested)
+        evict_extraction_cache(cache_dir, cache_max_bytes)
+    else:
+        os.utime(requested)
+    if cached.exists():
+        _link_or_copy(cached, output_path)
+    else:
+        _write_atomic(output_path, text)
+    return text
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class PollingWatcher:
+    """Wakes up every ``interval`` seconds; callers rescan the directories themselves."""
+
+    def __init__(self, directories: list[Path], interval: float = 2.0) -> None:
+        self.directories = directories
+        self.interval = interval
+        self._stop = threading.Event()
+
+    def wait(self, timeout: float | None = None) -> set[Path]:
+        self._stop.wait(self.interval if timeout is None else min(timeout, self.interval))
+        return set()
+
+    def close(self) -> None:
+        self._stop.set()
+
+
+class InotifyWatcher:
+    """Blocks until an entry in one of ``directories`` changes, using inotify through ctypes."""
+
+    def __init__(self, directories: list[Path]) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._directories: dict[int, Path] = {}
+        try:
+            for directory in dict.fromkeys(directories):
+                descriptor = libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+                if descriptor < 0:
+                    raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+                self._directories[descriptor] = directory
+        except OSError:
+            os.close(self._fd)
+            raise
+
+    def wait(self, timeout: float | None = None) -> set[Path]:
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return set()
+        changed: set[Path] = set()
+        while True:
+            try:
+                buffer = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset + EVENT_HEADER.size <= len(buffer):
+                descriptor, _, _, length = EVENT_HEADER.unpack_from(buffer, offset)
+                raw_name = buffer[offset + EVENT_HEADER.size:offset + EVENT_HEADER.size + length].rstrip(b"\0")
+                offset += EVENT_HEADER.size + length
+                directory = self._directories.get(descriptor)
+                if directory is not None and raw_name:
+                    changed.add(directory / os.fsdecode(raw_name))
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def open_watcher(directories: list[Path], poll_interval: float = 2.0) -> InotifyWatcher | PollingWatcher:
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(directories)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(directories, poll_interval)
+
+
+def path_signature(path: Path) -> tuple[int, int] | None:
+    # Size and newest mtime; a directory (EPUB package) sums over every file inside it.
+    try:
+        if not path.is_dir():
+            stat = path.stat()
+            return stat.st_size, stat.st_mtime_ns
+        size = newest = 0
+        for child in path.rglob("*"):
+            if child.is_file():
+                stat = child.stat()
+                size += stat.st_size
+                newest = max(newest, stat.st_mtime_ns)
+        return size, newest
+    except OSError:
+        return None
+
+
+class SettleTracker:
+    """Reports a path once its size and mtime have stayed unchanged for ``settle_seconds``."""
+
+    def __init__(self, settle_seconds: float = 2.0, clock=time.monotonic) -> None:
+        self.settle_seconds = settle_seconds
+        self._clock = clock
+        self._seen: dict[Path, tuple[tuple[int, int] | None, float]] = {}
+
+    def ready(self, paths: list[Path]) -> list[Path]:
+        now = self._clock()
+        current = set(paths)
+        for path in list(self._seen):
+            if path not in current:
+                del self._seen[path]
+        settled: list[Path] = []
+        for path in paths:
+            signature = path_signature(path)
+            previous = self._seen.get(path)
+            if signature is None:
+                self._seen.pop(path, None)
+            elif previous is None or previous[0] != signature:
+                self._seen[path] = (signature, now)
+            elif now - previous[1] >= self.settle_seconds:
+                settled.append(path)
+        return settled
+
+    def next_deadline(self) -> float | None:
+        # Seconds until the earliest tracked path could settle, or None when nothing is pending.
+        if not self._seen:
+            return None
+        now = self._clock()
+        return max(0.0, min(since + self.settle_seconds - now for _, since in self._seen.values()))
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+from .models import GenerationOutcome
+from .registry import utc_now_iso
+
+JOURNAL_STAGES = ("prepared", "generated", "done")
+
+
+class WatchJournal:
+    """Append-only JSONL log of watch-item stage transitions and provider chunk summaries.
+
+    Each line is fsynced before the stage it records is treated as complete, so a run that
+    dies can resume every unfinished item from its last journalled stage.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.items: dict[str, dict[str, Any]] = {}
+        self.chunk_summaries: dict[str, list[str]] = {}
+        self.chunk_citekeys: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: Path) -> "WatchJournal":
+        journal = cls(path)
+        if not path.exists():
+            return journal
+        with path.open("r", encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash can leave a torn final line; everything before it is intact.
+                    continue
+                journal._apply(event)
+        return journal
+
+    def _apply(self, event: dict[str, Any]) -> None:
+        if event.get("stage") == "chunk":
+            self.chunk_summaries[event["key"]] = event["bullets"]
+            self.chunk_citekeys[event["key"]] = event.get("citekey", "")
+            return
+        item = event["item"]
+        if event.get("stage") == "prepared":
+            self.items[item] = event
+        else:
+            self.items[item] = {**self.items.get(item, {}), **event}
+
+    def _append(self, event: dict[str, Any]) -> None:
+        with self._lock:
+            self._apply(event)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as handle:
+                handle.write(json.dumps(event, ensure_ascii=False) + "\n")
+                handle.flush()
+                os.fsync(handle.fileno())
+
+    def record(self, item: Path | str, stage: str, **data: Any) -> None:
+        if stage not in JOURNAL_STAGES:
+            raise ValueError(f"Unknown journal stage: {stage}")
+        self._append({"item": str(item), "stage": stage, "at": utc_now_iso(), **data})
+
+    def stage(self, item: Path | str) -> str:
+        return str(self.items.get(str(item), {}).get("stage", ""))
+
+    def prepared(self, item: Path | str, raw_hash: str) -> dict[str, Any] | None:
+        event = self.items.get(str(item))
+        if event is None or event.get("stage") == "done" or not raw_hash or event.get("raw_hash") != raw_hash:
+            return None
+        return event
+
+    def generated_outcome(self, item: Path | str, fingerprint: str) -> GenerationOutcome | None:
+        event = self.items.get(str(item))
+        if event is None or event.get("stage") != "generated" or event.get("fingerprint") != fingerprint:
+            return None
+        return GenerationOutcome.from_dict(event["outcome"])
+
+    def chunk_summary(self, key: str) -> list[str] | None:
+        return self.chunk_summaries.get(key)
+
+    def record_chunk_summary(self, key: str, bullets: list[str], citekey: str = "") -> None:
+        # The citekey ties the summary to its item, so compaction can drop it once the item is done.
+        self._append({"stage": "chunk", "key": key, "citekey": citekey, "bullets": bullets})
+
+    def unfinished(self) -> dict[str, dict[str, Any]]:
+        return {item: event for item, event in self.items.items() if event.get("stage") != "done"}
+
+    def compact(self) -> None:
+        # Keep only what a later run can still resume; an empty journal is removed.
+        with self._lock:
+            unfinished = {item: event for item, event in self.unfinished().items() if Path(item).exists()}
+            if not unfinished:
+                self.items.clear()
+                self.chunk_summaries.clear()
+                self.chunk_citekeys.clear()
+                self.path.unlink(missing_ok=True)
+                return
+            self.items = unfinished
+            citekeys = {event.get("citekey") for event in unfinished.values()} - {None, ""}
+            self.chunk_citekeys = {key: citekey for key, citekey in self.chunk_citekeys.items() if citekey in citekeys}
+            self.chunk_summaries = {key: self.chunk_summaries[key] for key in self.chunk_citekeys}
+            temporary = self.path.with_name(f".{self.path.name}.tmp")
+            with temporary.open("w", encoding="utf-8") as handle:
+                for event in unfinished.values():
+                    handle.write(json.dumps(event, ensure_ascii=False) + "\n")
+                for key, bullets in self.chunk_summaries.items():
+                    event = {"stage": "chunk", "key": key, "citekey": self.chunk_citekeys[key], "bullets": bullets}
+                    handle.write(json.dumps(event, ensure_ascii=False) + "\n")
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(temporary, self.path)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import csv
+import hashlib
 import json
 import re
 from collections import Counter
@@ -97,6 +98,16 @@ def load_keyword_catalogue(config: AppConfig) -> KeywordCatalogue | None:
     return KeywordCatalogue(unambiguous=unambiguous, ambiguous=ambiguous)
 
 
+def keyword_catalogue_version(config: AppConfig) -> str:
+    policy = config.keyword_policy
+    digest = hashlib.sha256(repr(sorted(vars(policy).items())).encode("utf-8"))
+    if policy.enabled:
+        for path in (policy.unambiguous_csv, policy.ambiguous_json):
+            if path is not None and path.exists():
+                digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
 def _count_alias_matches(text: str, alias: str) -> int:
     pattern = rf"(?<!\w){re.escape(alias)}(?!\w)"
     return len(re.findall(pattern, text, flags=re.IGNORECASE))
@@ -8,11 +8,14 @@ from pathlib import Path
 import yaml
 
 from .bibliography import BibliographyIndex
-from .models import MatchResult
+from .models import BibliographyEntry, MatchResult
 from .utils import normalize_text
 
 
 PDF_PATTERN = re.compile(r"^(?P<title>.+)_(?P<authors>.+)_(?P<year>(19|20)\d{2})$")
+FUZZY_TITLE_MIN_SIMILARITY = 0.6
+FUZZY_TITLE_AMBIGUITY_MARGIN = 0.05
+FUZZY_CONFIDENCE_CAP = 0.95
 
 
 def detect_source_format(path: Path) -> str:
@@ -100,6 +103,29 @@ def parse_pdf_filename(path: Path) -> tuple[str, list[str], str] | None:
     return match.group("title"), authors, match.group("year")
 
 
+def _fuzzy_title_confidence(
+    similarity: float,
+    candidate: BibliographyEntry,
+    candidate_surnames: tuple[str, ...],
+    author_surnames: list[str],
+    year: str,
+    runner_up: float,
+) -> float:
+    filename_surnames = {normalize_text(name) for name in author_surnames if name}
+    if filename_surnames:
+        author_score = len(filename_surnames.intersection(candidate_surnames)) / len(filename_surnames)
+    else:
+        author_score = 0.5
+    if year and candidate.year:
+        year_score = 1.0 if year == candidate.year else 0.0
+    else:
+        year_score = 0.5
+    confidence = 0.6 * similarity + 0.25 * author_score + 0.15 * year_score
+    if similarity - runner_up < FUZZY_TITLE_AMBIGUITY_MARGIN:
+        confidence = min(confidence, 0.85)
+    return round(min(confidence, FUZZY_CONFIDENCE_CAP), 2)
+
+
 def match_pdf_source(path: Path, bibliography: BibliographyIndex) -> MatchResult:
     parsed = parse_pdf_filename(path)
     if not parsed:
@@ -108,13 +134,32 @@ def match_pdf_source(path: Path, bibliography: BibliographyIndex) -> MatchResult
     title, author_surnames, year = parsed
     match = bibliography.find_by_title_authors_year(title, author_surnames, year)
     if match:
-        confidence = 0.98 if normalize_text(match.title) == normalize_text(title) else 0.75
+        confidence = 0.98 if bibliography.title_keys.get(match.citekey) == normalize_text(title) else 0.75
         return MatchResult(
             citekey=match.citekey,
             confidence=confidence,
             reason="pdf filename title/authors/year",
             needs_review=confidence < 0.9,
         )
+
+    candidates = bibliography.find_title_candidates(title, limit=2)
+    if candidates and candidates[0][1] >= FUZZY_TITLE_MIN_SIMILARITY:
+        candidate, similarity = candidates[0]
+        runner_up = candidates[1][1] if len(candidates) > 1 else 0.0
+        confidence = _fuzzy_title_confidence(
+            similarity,
+            candidate,
+            bibliography.creator_keys.get(candidate.citekey, ()),
+            author_surnames,
+            year,
+            runner_up,
+        )
+        return MatchResult(
+            citekey=candidate.citekey,
+            confidence=confidence,
+            reason=f"pdf filename fuzzy title (similarity {similarity:.2f})",
+            needs_review=confidence < 0.9,
+        )
     return MatchResult(reason="no bibliography match for pdf filename", needs_review=True)
 
 
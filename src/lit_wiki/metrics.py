@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+import time
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from .models import StageStats
+
+METRICS_ROTATE_BYTES = 64 * 2**20
+
+_labels: ContextVar[dict[str, str]] = ContextVar("lit_wiki_metric_labels", default={})
+
+
+class MetricsRecorder:
+    """Appends one JSON line per finished span to a metrics file shared by every process of a run."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._fd: int | None = None
+
+    def write(self, payload: dict) -> None:
+        line = (json.dumps(payload, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._lock:
+            if self._fd is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            os.write(self._fd, line)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fd is not None:
+                os.close(self._fd)
+            self._fd = None
+
+    def _after_fork(self) -> None:
+        # The parent's lock may have been held by another thread at fork time.
+        self._lock = threading.Lock()
+        self._fd = None
+
+
+_recorder: MetricsRecorder | None = None
+
+
+def _reset_after_fork() -> None:
+    if _recorder is not None:
+        _recorder._after_fork()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def enable_metrics(path: Path | None) -> None:
+    global _recorder
+    if _recorder is not None and _recorder.path == path:
+        return
+    if _recorder is not None:
+        _recorder.close()
+    _recorder = None
+    if path is None:
+        return
+    try:
+        if path.stat().st_size > METRICS_ROTATE_BYTES:
+            os.replace(path, path.with_name(path.name + ".1"))
+    except OSError:
+        pass
+    _recorder = MetricsRecorder(path)
+
+
+@contextmanager
+def span(stage: str, **labels: str) -> Iterator[None]:
+    """Time the block as ``stage``; labels also apply to spans opened inside it.
+
+    Threads only see the labels when their work is submitted with ``submit_with_context``.
+    """
+    recorder = _recorder
+    if recorder is None:
+        yield
+        return
+    inherited = _labels.get()
+    merged = {**inherited, **{key: value for key, value in labels.items() if value}}
+    token = _labels.set(merged)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        _labels.reset(token)
+        recorder.write({"stage": stage, "seconds": round(elapsed, 6), "at": round(time.time(), 3), **merged})
+
+
+def submit_with_context(pool: Executor, function: Callable[..., Any], *args: Any) -> Future:
+    # Thread pools do not inherit context variables, so spans in the worker would lose the caller's labels.
+    return pool.submit(copy_context().run, function, *args)
+
+
+def read_metrics(path: Path, since: float = 0.0) -> list[dict]:
+    events: list[dict] = []
+    if not path.exists():
+        return events
+    with path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if event.get("at", 0.0) >= since:
+                events.append(event)
+    return events
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    # Nearest-rank percentile of an already sorted, non-empty list.
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def summarize_metrics(events: list[dict], by_format: bool = True) -> list[StageStats]:
+    groups: dict[tuple[str, str], list[float]] = {}
+    for event in events:
+        key = (event.get("stage", ""), event.get("format", "") if by_format else "")
+        groups.setdefault(key, []).append(float(event.get("seconds", 0.0)))
+    stats: list[StageStats] = []
+    for (stage, source_format), durations in sorted(groups.items()):
+        durations.sort()
+        stats.append(
+            StageStats(
+                stage=stage,
+                source_format=source_format,
+                count=len(durations),
+                total_seconds=sum(durations),
+                p50_seconds=_percentile(durations, 0.50),
+                p95_seconds=_percentile(durations, 0.95),
+            )
+        )
+    return stats
@@ -1,16 +1,38 @@
 from __future__ import annotations
 
-from dataclasses import asdict, dataclass, field
+from dataclasses import asdict, dataclass, field, fields
+from pathlib import Path
 from typing import Any
 
 
-@dataclass
+def _slotted(cls: type) -> type:
+    # Same rebuild dataclass(slots=True) does, which would need Python 3.10.
+    names = tuple(item.name for item in fields(cls))
+    namespace = {key: value for key, value in cls.__dict__.items() if key not in names + ("__dict__", "__weakref__")}
+    namespace["__slots__"] = names
+    if cls.__dataclass_params__.frozen:
+        # Unpickling assigns through __setattr__, which frozen dataclasses forbid.
+        def __getstate__(self: Any) -> list[Any]:
+            return [getattr(self, name) for name in names]
+
+        def __setstate__(self: Any, state: list[Any]) -> None:
+            for name, value in zip(names, state):
+                object.__setattr__(self, name, value)
+
+        namespace["__getstate__"] = __getstate__
+        namespace["__setstate__"] = __setstate__
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+
+@_slotted
+@dataclass(frozen=True)
 class PersonRecord:
     display_name: str
     wiki_link: str
     surname: str
 
 
+@_slotted
 @dataclass
 class BibliographyEntry:
     citekey: str
@@ -49,6 +71,29 @@ class BibliographyEntry:
         }
 
 
+@dataclass
+class BibliographyQuery:
+    year_from: int | None = None
+    year_to: int | None = None
+    entry_types: list[str] = field(default_factory=list)
+    keywords: list[str] = field(default_factory=list)
+    journaltitle: str = ""
+    publisher: str = ""
+    isbn: str = ""
+    limit: int | None = None
+
+
+@dataclass
+class BibliographyChanges:
+    added: list[str] = field(default_factory=list)
+    changed: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.added or self.changed or self.removed)
+
+
 @dataclass
 class MatchResult:
     citekey: str = ""
@@ -78,6 +123,7 @@ class SourceRecord:
     approval_requested_at: str = ""
     approval_decision: str = ""
     usage_summary: dict[str, Any] = field(default_factory=dict)
+    ingest_fingerprint: str = ""
     registered_at: str = ""
     updated_at: str = ""
 
@@ -100,6 +146,7 @@ class WatchSummary:
     other_count: int = 0
     elapsed_seconds: float = 0.0
     cancelled: bool = False
+    deferred_count: int = 0
 
     def count_format(self, source_format: str) -> None:
         if source_format == "pdf":
@@ -153,3 +200,91 @@ class GenerationOutcome:
     keyword_links: list[str] = field(default_factory=list)
     keyword_tags: list[str] = field(default_factory=list)
     local_attempts: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, payload: dict[str, Any]) -> "GenerationOutcome":
+        values = dict(payload)
+        if values.get("usage") is not None:
+            values["usage"] = ProviderUsage(**values["usage"])
+        if values.get("approval_request") is not None:
+            request = dict(values["approval_request"])
+            request["usage"] = ProviderUsage(**request["usage"])
+            values["approval_request"] = ApprovalRequest(**request)
+        return cls(**values)
+
+
+@dataclass
+class PendingApproval:
+    citekey: str
+    outcome: GenerationOutcome
+    fingerprint: str = ""
+    requested_at: str = ""
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "citekey": self.citekey,
+            "outcome": self.outcome.as_dict(),
+            "fingerprint": self.fingerprint,
+            "requested_at": self.requested_at,
+        }
+
+    @classmethod
+    def from_dict(cls, payload: dict[str, Any]) -> "PendingApproval":
+        return cls(
+            citekey=payload["citekey"],
+            outcome=GenerationOutcome.from_dict(payload["outcome"]),
+            fingerprint=payload.get("fingerprint", ""),
+            requested_at=payload.get("requested_at", ""),
+        )
+
+
+@dataclass
+class ApprovalReviewSummary:
+    ingested: list[Path] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+    failed: dict[str, str] = field(default_factory=dict)
+    held: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class PreparedSource:
+    record: SourceRecord
+    match: MatchResult
+    extracted_text: str | None = None
+
+
+@dataclass
+class IngestJob:
+    entry: BibliographyEntry
+    record: SourceRecord
+    extracted_text: str
+    fingerprint: str = ""
+
+
+@dataclass
+class IngestBatchSummary:
+    ingested: list[Path] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+
+
+@dataclass
+class StageStats:
+    stage: str
+    source_format: str
+    count: int
+    total_seconds: float
+    p50_seconds: float
+    p95_seconds: float
+
+
+@dataclass
+class PdfBackendScore:
+    name: str
+    samples: int
+    seconds: float
+    bytes_per_second: int
+    pages_per_second: float
+    quality: float
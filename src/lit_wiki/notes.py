@@ -6,6 +6,9 @@ from pathlib import Path
 from .models import BibliographyEntry, SourceRecord
 from .utils import dedupe_casefold
 
+# Bump whenever render_note output changes so unchanged sources are re-rendered by `ingest --batch`.
+NOTE_TEMPLATE_VERSION = "1"
+
 
 def source_note_path(base_dir: Path, citekey: str) -> Path:
     return base_dir / f"{citekey}_wiki.md"
@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import json
+import re
+import shutil
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Sequence
+
+from .models import PdfBackendScore
+
+PDF_MIN_PAGES_PER_TASK = 16
+# Fallback order when no calibration is recorded; pypdf first keeps the historical output.
+DEFAULT_PDF_BACKENDS = ("pypdf", "pdftotext", "pdfminer", "mdls")
+# Files at least this large use the fastest backend whose calibrated quality is within
+# PDF_QUALITY_TOLERANCE of the best; smaller files use the best-quality backend.
+PDF_LARGE_FILE_BYTES = 8 * 2**20
+PDF_QUALITY_TOLERANCE = 0.05
+TEXT_LAYER_SAMPLE_PAGES = 8
+# A token counts as a word when it is letters, optionally hyphenated, with light punctuation around it.
+WORD_TOKEN_RE = re.compile(r"[(\[\"'‘“]?[^\W\d_]{1,24}(?:[-'’][^\W\d_]{1,24})*[)\]\"'’”.,;:!?]*")
+
+
+@dataclass(frozen=True)
+class PdfBackend:
+    name: str
+    # Pages in order; a generator lets long documents flow through cleaning one page at a time.
+    extract_pages: Callable[[Path, int], Iterable[str]]
+    is_available: Callable[[], bool]
+
+
+PDF_BACKENDS: dict[str, PdfBackend] = {}
+
+
+def register_pdf_backend(backend: PdfBackend) -> PdfBackend:
+    PDF_BACKENDS[backend.name] = backend
+    return backend
+
+
+def available_pdf_backends() -> list[str]:
+    ordered = [name for name in DEFAULT_PDF_BACKENDS if name in PDF_BACKENDS]
+    ordered += [name for name in PDF_BACKENDS if name not in DEFAULT_PDF_BACKENDS]
+    return [name for name in ordered if PDF_BACKENDS[name].is_available()]
+
+
+def _module_available(name: str) -> Callable[[], bool]:
+    return lambda: importlib.util.find_spec(name) is not None
+
+
+def _command_available(name: str) -> Callable[[], bool]:
+    return lambda: shutil.which(name) is not None
+
+
+def _extract_pdf_page_range(path: str, start: int, stop: int) -> list[str]:
+    # Runs in pool workers, so each call opens its own reader.
+    from pypdf import PdfReader
+
+    reader = PdfReader(path)
+    return [(reader.pages[number].extract_text() or "").strip() for number in range(start, stop)]
+
+
+def _pdf_page_ranges(page_count: int, workers: int) -> list[tuple[int, int]]:
+    # About four ranges per worker so one slow range does not leave the other workers idle.
+    size = max(PDF_MIN_PAGES_PER_TASK, -(-page_count // (workers * 4)))
+    return [(start, min(start + size, page_count)) for start in range(0, page_count, size)]
+
+
+def _pypdf_pages(path: Path, workers: int = 1) -> Iterator[str]:
+    from pypdf import PdfReader
+
+    reader = PdfReader(str(path))
+    page_count = len(reader.pages)
+    ranges = _pdf_page_ranges(page_count, workers)
+    if workers <= 1 or len(ranges) < 2:
+        for page in reader.pages:
+            yield (page.extract_text() or "").strip()
+        return
+    with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as pool:
+        futures = [pool.submit(_extract_pdf_page_range, str(path), start, stop) for start, stop in ranges]
+        for future in futures:
+            yield from future.result()
+
+
+def _pdfminer_pages(path: Path, workers: int = 1) -> list[str]:
+    from pdfminer.high_level import extract_text
+
+    # pdfminer ends every page with a form feed.
+    return [page.strip() for page in extract_text(str(path)).split("\f")]
+
+
+def _pdftotext_pages(path: Path, workers: int = 1) -> list[str]:
+    result = subprocess.run(["pdftotext", "-enc", "UTF-8", str(path), "-"], capture_output=True, check=False)
+    if result.returncode != 0:
+        raise RuntimeError(f"pdftotext failed on {path}: {result.stderr.decode('utf-8', errors='replace').strip()}")
+    return [page.strip() for page in result.stdout.decode("utf-8", errors="replace").split("\f")]
+
+
+def _mdls_pages(path: Path, workers: int = 1) -> list[str]:
+    # macOS Spotlight's text for the whole file, as one page.
+    command = ["mdls", "-raw", "-name", "kMDItemTextContent", str(path)]
+    content = (subprocess.run(command, capture_output=True, text=True, check=False).stdout or "").strip()
+    return [] if content == "(null)" else [content]
+
+
+register_pdf_backend(PdfBackend("pypdf", _pypdf_pages, _module_available("pypdf")))
+register_pdf_backend(PdfBackend("pdftotext", _pdftotext_pages, _command_available("pdftotext")))
+register_pdf_backend(PdfBackend("pdfminer", _pdfminer_pages, _module_available("pdfminer")))
+register_pdf_backend(PdfBackend("mdls", _mdls_pages, _command_available("mdls")))
+
+
+def _has_fonts(resources, depth: int = 0) -> bool:
+    resources = resources.get_object() if resources is not None else None
+    if not resources:
+        return False
+    if resources.get("/Font"):
+        return True
+    xobjects = resources.get("/XObject")
+    xobjects = xobjects.get_object() if xobjects is not None else None
+    if not xobjects or depth >= 2:
+        return False
+    for reference in xobjects.values():
+        xobject = reference.get_object()
+        if xobject.get("/Subtype") == "/Form" and _has_fonts(xobject.get("/Resources"), depth + 1):
+            return True
+    return False
+
+
+def _page_resources(node, index: int):
+    # Walks the page tree by /Count instead of flattening it, which costs a full pass on long books.
+    resources = None
+    while True:
+        node = node.get_object()
+        resources = node.get("/Resources", resources)
+        if node.get("/Type") != "/Pages":
+            return resources
+        for kid in node.get("/Kids", []):
+            kid = kid.get_object()
+            count = int(kid.get("/Count", 1)) if kid.get("/Type") == "/Pages" else 1
+            if index < count:
+                node = kid
+                break
+            index -= count
+        else:
+            return resources
+
+
+def has_text_layer(path: Path) -> bool:
+    # Scanned PDFs have no fonts on their pages. When in doubt the file is treated as text.
+    try:
+        from pypdf import PdfReader
+
+        pages = PdfReader(str(path)).trailer["/Root"].get_object()["/Pages"]
+        page_count = int(pages.get_object().get("/Count", 0))
+        step = max(1, page_count // TEXT_LAYER_SAMPLE_PAGES)
+        numbers = range(0, page_count, step)[:TEXT_LAYER_SAMPLE_PAGES]
+        return not numbers or any(_has_fonts(_page_resources(pages, number)) for number in numbers)
+    except Exception:
+        return True
+
+
+def _fastest(names: list[str], scores: dict[str, PdfBackendScore]) -> str:
+    return max(names, key=lambda name: scores[name].bytes_per_second)
+
+
+def plan_pdf_backends(
+    path: Path, calibration: dict[str, PdfBackendScore] | None = None, preferred: str = "auto"
+) -> list[str]:
+    """Backends to try on ``path``, best first; later entries only run when earlier ones find no text."""
+    available = available_pdf_backends()
+    if preferred != "auto":
+        if preferred not in available:
+            raise RuntimeError(f"PDF backend {preferred!r} is not installed.")
+        return [preferred] + [name for name in available if name != preferred]
+    scored = [name for name in available if calibration and name in calibration and calibration[name].quality > 0]
+    if not scored:
+        return available
+    scores = {name: calibration[name] for name in scored}
+    if len(scored) == 1:
+        primary = scored[0]
+    elif path.exists() and path.stat().st_size >= PDF_LARGE_FILE_BYTES:
+        best = max(score.quality for score in scores.values())
+        primary = _fastest([name for name in scored if scores[name].quality >= best - PDF_QUALITY_TOLERANCE], scores)
+    elif not has_text_layer(path):
+        # Without a text layer there is nothing to get right, so only speed matters.
+        primary = _fastest(scored, scores)
+    else:
+        primary = max(scored, key=lambda name: (scores[name].quality, scores[name].bytes_per_second))
+    return [primary] + [name for name in available if name != primary]
+
+
+def text_quality(text: str) -> tuple[float, int]:
+    # Share of non-space characters in word-like tokens, and the number of such tokens. Glued words,
+    # (cid:NN) placeholders and replacement characters all lower the share.
+    tokens = text.split()
+    words = [token for token in tokens if WORD_TOKEN_RE.fullmatch(token)]
+    total = sum(len(token) for token in tokens)
+    return (sum(len(word) for word in words) / total if total else 0.0), len(words)
+
+
+def calibrate_pdf_backends(samples: Sequence[Path], backends: Sequence[str] | None = None) -> list[PdfBackendScore]:
+    """Time every backend on every sample and score its text against the other backends' output.
+
+    A backend's quality on a sample is its word-like share times the words it found relative to the
+    backend that found the most, so dropping pages or text blocks costs as much as garbling them.
+    """
+    names = list(backends or available_pdf_backends())
+    seconds = dict.fromkeys(names, 0.0)
+    pages = dict.fromkeys(names, 0)
+    quality = dict.fromkeys(names, 0.0)
+    total_bytes = sum(sample.stat().st_size for sample in samples)
+    for sample in samples:
+        measured: dict[str, tuple[float, int]] = {}
+        for name in names:
+            started = time.perf_counter()
+            try:
+                extracted = list(PDF_BACKENDS[name].extract_pages(sample, 1))
+            except Exception:
+                extracted = []
+            seconds[name] += time.perf_counter() - started
+            pages[name] += len(extracted)
+            measured[name] = text_quality("\n\n".join(extracted))
+        most_words = max((words for _share, words in measured.values()), default=0)
+        for name, (share, words) in measured.items():
+            quality[name] += share * words / most_words if most_words else 0.0
+    return [
+        PdfBackendScore(
+            name=name,
+            samples=len(samples),
+            seconds=round(seconds[name], 4),
+            bytes_per_second=round(total_bytes / seconds[name]) if seconds[name] else 0,
+            pages_per_second=round(pages[name] / seconds[name], 1) if seconds[name] else 0.0,
+            quality=round(quality[name] / len(samples), 4) if samples else 0.0,
+        )
+        for name in names
+    ]
+
+
+def load_pdf_calibration(path: Path | None) -> dict[str, PdfBackendScore]:
+    if path is None or not path.exists():
+        return {}
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        return {item["name"]: PdfBackendScore(**item) for item in payload.get("backends", [])}
+    except (OSError, ValueError, TypeError, KeyError):
+        return {}
+
+
+def pdf_calibration_digest(path: Path | None) -> str:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()[:12] if path is not None else "none"
+    except OSError:
+        return "none"
+
+
+def save_pdf_calibration(path: Path, scores: Sequence[PdfBackendScore], calibrated_at: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"calibrated_at": calibrated_at, "backends": [asdict(score) for score in scores]}
+    path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
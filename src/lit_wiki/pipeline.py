@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Any, Callable, TypeVar
+
+from .metrics import submit_with_context
+
+Item = TypeVar("Item")
+
+
+def run_staged_pipeline(
+    items: list[Item],
+    prepare: Callable[[Item], Any],
+    admit: Callable[[Item, Any], Any | None],
+    generate: Callable[[Any], Any],
+    publish: Callable[[Item, Any, Any], None],
+    on_error: Callable[[Item, Exception], bool],
+    prepare_workers: int = 1,
+    provider_workers: int = 1,
+    queue_size: int = 4,
+) -> None:
+    """Run items through prepare -> admit -> generate -> publish.
+
+    ``prepare`` runs in a process pool and ``generate`` in a thread pool. ``admit``,
+    ``publish`` and ``on_error`` always run on the calling thread, in item order.
+    ``admit`` returns the job for ``generate``, or None when the item is already
+    finished. ``on_error`` is called from inside the exception handler and returns
+    False to stop the run. Each stage holds at most its worker count plus
+    ``queue_size`` items, so a slow stage applies backpressure to the stages before it.
+    """
+    if prepare_workers <= 1 and provider_workers <= 1:
+        for item in items:
+            try:
+                job = admit(item, prepare(item))
+                if job is not None:
+                    publish(item, job, generate(job))
+            except Exception as exc:
+                if not on_error(item, exc):
+                    return
+        return
+
+    prepare_pool = ProcessPoolExecutor(max_workers=max(1, prepare_workers))
+    provider_pool = ThreadPoolExecutor(max_workers=max(1, provider_workers), thread_name_prefix="lit-wiki-provider")
+    prepare_limit = max(1, prepare_workers) + max(0, queue_size)
+    provider_limit = max(1, provider_workers) + max(0, queue_size)
+    pending = deque(items)
+    preparing: deque[tuple[Item, Future]] = deque()
+    generating: deque[tuple[Item, Any, Future]] = deque()
+    try:
+        while pending or preparing or generating:
+            while pending and len(preparing) < prepare_limit:
+                item = pending.popleft()
+                preparing.append((item, prepare_pool.submit(prepare, item)))
+
+            if generating and generating[0][2].done():
+                item, job, future = generating.popleft()
+                try:
+                    publish(item, job, future.result())
+                except Exception as exc:
+                    if not on_error(item, exc):
+                        return
+                continue
+
+            if preparing and preparing[0][1].done() and len(generating) < provider_limit:
+                item, future = preparing.popleft()
+                try:
+                    job = admit(item, future.result())
+                    if job is not None:
+                        generating.append((item, job, submit_with_context(provider_pool, generate, job)))
+                except Exception as exc:
+                    if not on_error(item, exc):
+                        return
+                continue
+
+            blockers = [generating[0][2]] if generating else []
+            if preparing and len(generating) < provider_limit:
+                blockers.append(preparing[0][1])
+            wait(blockers, return_when=FIRST_COMPLETED)
+    finally:
+        prepare_pool.shutdown(wait=True, cancel_futures=True)
+        provider_pool.shutdown(wait=True, cancel_futures=True)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import os
 import re
@@ -9,8 +10,11 @@ import urllib.request
 from .bibliography import BibliographyIndex
 from .budget import can_spend, estimate_usage, load_budget_ledger, record_spend
 from .config import AppConfig, ProviderSpec
+from .journal import WatchJournal
 from .keywords import enrich_keywords, load_keyword_catalogue
+from .metrics import span
 from .models import ApprovalRequest, BibliographyEntry, GenerationOutcome
+from .session import PipelineSession
 from .utils import bullet_list, ensure_suffix_link, normalize_text, year_as_int
 
 REQUIRED_SECTION_KEYS = {
@@ -50,13 +54,6 @@ def _reference_section(text: str) -> str:
     return (text[match.end():] or "").strip()
 
 
-def _lead_surname(entry: BibliographyEntry) -> str:
-    people = entry.authors or entry.editors
-    if not people:
-        return ""
-    return normalize_text(people[0].surname or people[0].display_name)
-
-
 def _is_future_reference(source_entry: BibliographyEntry, candidate: BibliographyEntry) -> bool:
     source_year = year_as_int(source_entry.year)
     candidate_year = year_as_int(candidate.year)
@@ -85,13 +82,13 @@ def _extract_references(extracted_text: str, bibliography: BibliographyIndex, so
             continue
         if _is_future_reference(source_entry, candidate):
             continue
-        title_key = normalize_text(candidate.title)
+        title_key = bibliography.title_keys.get(candidate.citekey, "")
         if title_key in GENERIC_REFERENCE_TITLES:
             continue
         if title_key and title_key in normalized_section:
             references.append(candidate.citekey)
             continue
-        lead_surname = _lead_surname(candidate)
+        lead_surname = bibliography.lead_surname_keys.get(candidate.citekey, "")
         if lead_surname and candidate.year and lead_surname in normalized_section and candidate.year in reference_section and title_key in normalized_section:
             references.append(candidate.citekey)
     return sorted(dict.fromkeys(references))
@@ -189,12 +186,18 @@ def _openai_compatible_request(provider: ProviderSpec, api_key: str, payload: di
     raise json.JSONDecodeError("Unable to parse JSON from provider response.", content, 0)
 
 
+def _chunk_summary_key(provider: ProviderSpec, payload: dict[str, object]) -> str:
+    identity = [provider.name, provider.backend, provider.api_base, payload]
+    return hashlib.sha256(json.dumps(identity, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
 def _run_openai_compatible(
     provider: ProviderSpec,
     config: AppConfig,
     entry: BibliographyEntry,
     extracted_text: str,
     keyword_targets: list[str],
+    journal: WatchJournal | None = None,
 ) -> dict[str, object]:
     api_key = os.getenv(provider.api_key_env, "")
     if not provider.api_base:
@@ -231,11 +234,19 @@ def _run_openai_compatible(
                 },
             ],
         }
+        chunk_key = _chunk_summary_key(provider, payload)
+        cached = journal.chunk_summary(chunk_key) if journal is not None else None
+        if cached is not None:
+            chunk_summaries.extend(cached)
+            continue
         result = _openai_compatible_request(provider, api_key, payload)
         bullets = result.get("bullet_points") or []
         if not isinstance(bullets, list) or not bullets:
             raise RuntimeError(f"Provider '{provider.name}' returned no bullet_points.")
-        chunk_summaries.extend(str(item).strip() for item in bullets if str(item).strip())
+        summary = [str(item).strip() for item in bullets if str(item).strip()]
+        if journal is not None:
+            journal.record_chunk_summary(chunk_key, summary, entry.citekey)
+        chunk_summaries.extend(summary)
 
     combined = "\n".join(chunk_summaries[:12])
     final_payload = {
@@ -274,12 +285,14 @@ def _run_provider(
     extracted_text: str,
     bibliography: BibliographyIndex,
     keyword_targets: list[str],
+    journal: WatchJournal | None = None,
 ) -> dict[str, object]:
     backend = provider.backend.lower()
-    if backend == "heuristic":
-        return heuristic_sections(entry, extracted_text, bibliography, keyword_targets)
-    if backend in {"lm_studio", "openai_compatible", "openai", "gemini"}:
-        return _run_openai_compatible(provider, config, entry, extracted_text, keyword_targets)
+    with span("generate.llm", provider=provider.name):
+        if backend == "heuristic":
+            return heuristic_sections(entry, extracted_text, bibliography, keyword_targets)
+        if backend in {"lm_studio", "openai_compatible", "openai", "gemini"}:
+            return _run_openai_compatible(provider, config, entry, extracted_text, keyword_targets, journal)
     raise RuntimeError(f"Unsupported provider backend: {provider.backend}")
 
 
@@ -340,15 +353,17 @@ def generate_sections(
     extracted_text: str,
     bibliography: BibliographyIndex,
     current_daily_tokens: int = 0,
+    session: PipelineSession | None = None,
 ) -> GenerationOutcome:
-    catalogue = load_keyword_catalogue(config)
-    keyword_enrichment = enrich_keywords(
-        extracted_text,
-        catalogue,
-        config.keyword_policy,
-        title=entry.title,
-        abstract=entry.abstract,
-    )
+    catalogue = session.keyword_catalogue if session is not None else load_keyword_catalogue(config)
+    with span("generate.keywords"):
+        keyword_enrichment = enrich_keywords(
+            extracted_text,
+            catalogue,
+            config.keyword_policy,
+            title=entry.title,
+            abstract=entry.abstract,
+        )
     keyword_targets = keyword_enrichment.guidance_targets
     keyword_links = keyword_enrichment.metadata_links
     keyword_tags = keyword_enrichment.metadata_tags
@@ -364,6 +379,7 @@ def generate_sections(
                 extracted_text,
                 bibliography,
                 keyword_targets,
+                session.journal if session is not None else None,
             )
             sections = _normalize_sections(sections, entry, bibliography, extracted_text)
             valid, reason = _validate_sections(sections)
@@ -424,7 +440,7 @@ def generate_sections(
             local_attempts=max(1, config.retry_policy.local_max_attempts),
         )
 
-    ledger = load_budget_ledger(config.budget_ledger_file)
+    ledger = session.ledger if session is not None else load_budget_ledger(config.budget_ledger_file)
     for fallback in config.fallback_providers:
         usage = estimate_usage(fallback.name, fallback.model, extracted_text, config.budget_policy)
         allowed, denial_reason = can_spend(ledger, usage, config.budget_policy)
@@ -489,6 +505,7 @@ def run_approved_fallback(
     keyword_targets: list[str],
     keyword_links: list[str],
     keyword_tags: list[str],
+    session: PipelineSession | None = None,
 ) -> GenerationOutcome:
     fallback = next((item for item in config.fallback_providers if item.name == approval_request.fallback_provider), None)
     if fallback is None:
@@ -504,7 +521,8 @@ def run_approved_fallback(
         )
 
     try:
-        sections = _run_provider(fallback, config, entry, extracted_text, bibliography, keyword_targets)
+        journal = session.journal if session is not None else None
+        sections = _run_provider(fallback, config, entry, extracted_text, bibliography, keyword_targets, journal)
         sections = _normalize_sections(sections, entry, bibliography, extracted_text)
         valid, reason = _validate_sections(sections)
         if not valid:
@@ -521,7 +539,10 @@ def run_approved_fallback(
                 local_attempts=0,
             )
         sections = _apply_keyword_enrichment(sections, keyword_links, keyword_tags)
-        record_spend(config.budget_ledger_file, approval_request.usage, entry.citekey)
+        if session is not None:
+            session.record_spend(approval_request.usage, entry.citekey)
+        else:
+            record_spend(config.budget_ledger_file, approval_request.usage, entry.citekey)
         return GenerationOutcome(
             status="success",
             sections=sections,
@@ -1,49 +1,149 @@
 from __future__ import annotations
 
 import json
+import sqlite3
+from contextlib import closing
 from datetime import datetime, timezone
 from pathlib import Path
+from types import MappingProxyType
+from typing import Mapping
 
-from .models import SourceRecord
+from .models import PendingApproval, SourceRecord
+
+SOURCE_REGISTRY_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS sources (
+        citekey TEXT PRIMARY KEY,
+        processing_state TEXT NOT NULL,
+        registered_at TEXT NOT NULL,
+        payload TEXT NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS sources_processing_state ON sources (processing_state)",
+    """
+    CREATE TABLE IF NOT EXISTS pending_approvals (
+        citekey TEXT PRIMARY KEY,
+        requested_at TEXT NOT NULL,
+        payload TEXT NOT NULL
+    )
+    """,
+)
+
+_INITIALIZED: set[Path] = set()
 
 
 def utc_now_iso() -> str:
     return datetime.now(timezone.utc).replace(microsecond=0).isoformat()
 
 
+def legacy_registry_path(path: Path) -> Path:
+    return path.with_suffix(".json")
+
+
+def _connect(path: Path) -> sqlite3.Connection:
+    connection = sqlite3.connect(path, timeout=30.0)
+    connection.execute("PRAGMA synchronous = NORMAL")
+    return connection
+
+
+def _record_row(record: SourceRecord) -> tuple[str, str, str, str]:
+    return (
+        record.citekey,
+        record.processing_state,
+        record.registered_at,
+        json.dumps(record.as_dict(), ensure_ascii=False),
+    )
+
+
+def _initialize(path: Path) -> None:
+    # The schema is applied once per process so tables added later reach existing databases.
+    if path in _INITIALIZED and path.exists():
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    legacy_path = legacy_registry_path(path)
+    migrate = not path.exists() and legacy_path.exists()
+    with closing(_connect(path)) as connection:
+        connection.execute("PRAGMA journal_mode = WAL")
+        with connection:
+            for statement in SOURCE_REGISTRY_SCHEMA:
+                connection.execute(statement)
+            if migrate:
+                with legacy_path.open("r", encoding="utf-8") as handle:
+                    raw = json.load(handle)
+                records = [SourceRecord.from_dict(data) for data in raw.get("sources", {}).values()]
+                connection.executemany(
+                    "INSERT OR REPLACE INTO sources (citekey, processing_state, registered_at, payload) VALUES (?, ?, ?, ?)",
+                    (_record_row(record) for record in records),
+                )
+    _INITIALIZED.add(path)
+
+
 class SourceRegistry:
-    def __init__(self, path: Path, records: dict[str, SourceRecord]) -> None:
+    """One row per citekey in a WAL-mode SQLite database; ``upsert`` writes a single row.
+
+    A legacy ``source_registry.json`` next to the database is imported when the database is created.
+    """
+
+    def __init__(self, path: Path) -> None:
         self.path = path
-        self.records = records
 
     @classmethod
     def load(cls, path: Path) -> "SourceRegistry":
-        if not path.exists():
-            return cls(path, {})
-        with path.open("r", encoding="utf-8") as handle:
-            raw = json.load(handle)
-        records = {citekey: SourceRecord.from_dict(data) for citekey, data in raw.get("sources", {}).items()}
-        return cls(path, records)
-
-    def save(self) -> None:
-        self.path.parent.mkdir(parents=True, exist_ok=True)
-        payload = {
-            "sources": {citekey: record.as_dict() for citekey, record in sorted(self.records.items())},
-        }
-        with self.path.open("w", encoding="utf-8") as handle:
-            json.dump(payload, handle, indent=2, ensure_ascii=False)
+        _initialize(path)
+        return cls(path)
+
+    @property
+    def records(self) -> Mapping[str, SourceRecord]:
+        # A read-only snapshot, so code written against the JSON registry's mutable dict fails loudly.
+        with closing(_connect(self.path)) as connection:
+            rows = connection.execute("SELECT payload FROM sources ORDER BY citekey").fetchall()
+        records = [SourceRecord.from_dict(json.loads(payload)) for (payload,) in rows]
+        return MappingProxyType({record.citekey: record for record in records})
 
     def upsert(self, record: SourceRecord) -> SourceRecord:
-        now = utc_now_iso()
-        existing = self.records.get(record.citekey)
-        if existing:
-            record.registered_at = existing.registered_at or now
-        else:
-            record.registered_at = now
-        record.updated_at = now
-        self.records[record.citekey] = record
+        self.upsert_many([record])
         return record
 
+    def upsert_many(self, records: list[SourceRecord]) -> None:
+        now = utc_now_iso()
+        with closing(_connect(self.path)) as connection, connection:
+            for record in records:
+                row = connection.execute("SELECT registered_at FROM sources WHERE citekey = ?", (record.citekey,)).fetchone()
+                record.registered_at = (row[0] if row else "") or now
+                record.updated_at = now
+                connection.execute(
+                    "INSERT INTO sources (citekey, processing_state, registered_at, payload) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(citekey) DO UPDATE SET processing_state = excluded.processing_state, "
+                    "registered_at = excluded.registered_at, payload = excluded.payload",
+                    _record_row(record),
+                )
+
     def get(self, citekey: str) -> SourceRecord | None:
-        return self.records.get(citekey)
+        with closing(_connect(self.path)) as connection:
+            row = connection.execute("SELECT payload FROM sources WHERE citekey = ?", (citekey,)).fetchone()
+        return SourceRecord.from_dict(json.loads(row[0])) if row else None
+
+    def by_state(self, processing_state: str) -> list[SourceRecord]:
+        with closing(_connect(self.path)) as connection:
+            rows = connection.execute(
+                "SELECT payload FROM sources WHERE processing_state = ? ORDER BY citekey",
+                (processing_state,),
+            ).fetchall()
+        return [SourceRecord.from_dict(json.loads(payload)) for (payload,) in rows]
+
+    def add_pending_approval(self, pending: PendingApproval) -> None:
+        pending.requested_at = pending.requested_at or utc_now_iso()
+        with closing(_connect(self.path)) as connection, connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO pending_approvals (citekey, requested_at, payload) VALUES (?, ?, ?)",
+                (pending.citekey, pending.requested_at, json.dumps(pending.as_dict(), ensure_ascii=False)),
+            )
+
+    def pending_approvals(self) -> list[PendingApproval]:
+        with closing(_connect(self.path)) as connection:
+            rows = connection.execute("SELECT payload FROM pending_approvals ORDER BY requested_at, citekey").fetchall()
+        return [PendingApproval.from_dict(json.loads(payload)) for (payload,) in rows]
 
+    def remove_pending_approval(self, citekey: str) -> None:
+        with closing(_connect(self.path)) as connection, connection:
+            connection.execute("DELETE FROM pending_approvals WHERE citekey = ?", (citekey,))
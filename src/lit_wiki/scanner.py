@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import hashlib
+import re
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import accumulate
+from typing import Sequence
+
+# The regex parser is private; without it every pattern simply runs unfiltered.
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    try:
+        import sre_parse  # type: ignore[no-redef]
+    except ImportError:
+        sre_parse = None
+
+# Lines matching one of these are dropped from extracted text. The scoped rule keeps the
+# bare-URL check case-sensitive, like the startswith() test it replaces.
+DEFAULT_BOILERPLATE_PATTERNS = (
+    r"^jstor is a not-for-profit service",
+    r"^your use of the jstor archive indicates",
+    r"^for more information about jstor",
+    r"^all use subject to https?://about\.jstor\.org/terms",
+    r"^https?://about\.jstor\.org/terms$",
+    r"^this content downloaded from$",
+    r"^stable url:\s*https?://",
+    r"downloaded from .* utc",
+    r"collaborating with jstor to digitize, preserve and extend access",
+    r"(?-i:^https?://)",
+)
+# A note is not published while its extracted text still contains one of these.
+DEFAULT_CONTAMINATION_PATTERNS = (
+    r"this content downloaded from",
+    r"all use subject to https?://about\.jstor\.org/terms",
+    r"your use of the jstor archive indicates",
+    r"jstor is a not-for-profit service",
+)
+CONTROL_CHARS_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+PATTERN_FLAGS = re.IGNORECASE | re.MULTILINE
+MIN_LITERAL_LENGTH = 3
+
+
+def _is_plain_char(code: int) -> bool:
+    # ASCII characters whose only case-insensitive partner is their ASCII upper or lower case,
+    # so "x in text.lower()" holds exactly when an IGNORECASE regex could match them.
+    return code < 128 and chr(code).lower() not in "iks"
+
+
+def _literal_runs(items, runs: list[str], current: list[str]) -> list[str]:
+    for op, value in items:
+        if op is sre_parse.LITERAL and _is_plain_char(value):
+            current.append(chr(value).lower())
+        elif op is sre_parse.SUBPATTERN:
+            _literal_runs(value[-1], runs, current)
+        else:
+            runs.append("".join(current))
+            current.clear()
+    return runs
+
+
+def required_literal(pattern: str) -> str:
+    """Longest lower-case run of plain characters that every match of ``pattern`` contains, or ""."""
+    if sre_parse is None:
+        return ""
+    try:
+        parsed = sre_parse.parse(pattern, PATTERN_FLAGS)
+        current: list[str] = []
+        runs = _literal_runs(parsed, [], current)
+        runs.append("".join(current))
+    except Exception:
+        return ""
+    longest = max(runs, key=len)
+    return longest if len(longest) >= MIN_LITERAL_LENGTH else ""
+
+
+class PatternScanner:
+    """Precompiled patterns behind a literal prefilter.
+
+    Patterns are case-insensitive, with ``^`` and ``$`` anchored at line breaks. A pattern only
+    runs when its required literal occurs in the lower-cased text. One regex over all the
+    literals finds them in a single pass, so clean text costs one ``lower()`` and one scan.
+    """
+
+    def __init__(self, patterns: Sequence[str]) -> None:
+        self.patterns = tuple(patterns)
+        self._compiled = [(re.compile(pattern, PATTERN_FLAGS), required_literal(pattern)) for pattern in self.patterns]
+        # Longest first, so a literal that starts where a longer one does is covered by ``_implied``.
+        literals = sorted({literal for _, literal in self._compiled if literal}, key=len, reverse=True)
+        self._literal_scan = re.compile("|".join(map(re.escape, literals))) if literals else None
+        self._implied = {literal: {other for other in literals if other in literal} for literal in literals}
+
+    def _scan(self, folded: str, stop_when_all_found: bool = False) -> tuple[set[str], list[tuple[int, int]]]:
+        # Returns the literals found and where. Each search resumes one character after the last
+        # hit rather than after its end, so overlapping occurrences are found too.
+        found: set[str] = set()
+        spans: list[tuple[int, int]] = []
+        if self._literal_scan is None:
+            return found, spans
+        match = self._literal_scan.search(folded)
+        while match is not None:
+            found |= self._implied[match.group()]
+            spans.append(match.span())
+            if stop_when_all_found and len(found) == len(self._implied):
+                break
+            match = self._literal_scan.search(folded, match.start() + 1)
+        return found, spans
+
+    def _candidates(self, found: set[str]) -> list[tuple[re.Pattern, str]]:
+        return [(compiled, literal) for compiled, literal in self._compiled if not literal or literal in found]
+
+    def search(self, text: str) -> bool:
+        found, _spans = self._scan(text.lower(), stop_when_all_found=True)
+        return any(compiled.search(text) for compiled, _ in self._candidates(found))
+
+    def drop_matching_lines(self, lines: list[str]) -> list[str]:
+        # Empty lines are paragraph breaks and are always kept.
+        folded = "\n".join(lines).lower()
+        found, spans = self._scan(folded)
+        candidates = self._candidates(found)
+        if not candidates:
+            return lines
+        patterns = [compiled for compiled, _ in candidates]
+        suspects = None if any(not literal for _, literal in candidates) else _lines_with_literals(lines, folded, spans)
+        return [
+            line
+            for index, line in enumerate(lines)
+            if not line
+            or (suspects is not None and index not in suspects)
+            or not any(pattern.search(line) for pattern in patterns)
+        ]
+
+
+def _lines_with_literals(lines: list[str], folded: str, spans: list[tuple[int, int]]) -> set[int] | None:
+    # Indices of the lines the literal occurrences fall on, or None when every line has to be checked.
+    starts = list(accumulate((len(line) + 1 for line in lines), initial=0))
+    if len(folded) != starts[-1] - 1:
+        return None
+    suspects: set[int] = set()
+    for start, end in spans:
+        suspects.update(range(bisect_right(starts, start) - 1, bisect_right(starts, end - 1)))
+    return suspects
+
+
+def validate_patterns(patterns: Sequence[str], setting: str) -> list[str]:
+    checked: list[str] = []
+    for pattern in patterns:
+        try:
+            re.compile(str(pattern), PATTERN_FLAGS)
+        except re.error as exc:
+            raise ValueError(f"Invalid regular expression in {setting}: {pattern!r} ({exc})") from exc
+        checked.append(str(pattern))
+    return checked
+
+
+@lru_cache(maxsize=8)
+def boilerplate_scanner(extra_patterns: tuple[str, ...] = ()) -> PatternScanner:
+    return PatternScanner(DEFAULT_BOILERPLATE_PATTERNS + extra_patterns)
+
+
+@lru_cache(maxsize=8)
+def contamination_scanner(extra_patterns: tuple[str, ...] = ()) -> PatternScanner:
+    return PatternScanner(DEFAULT_CONTAMINATION_PATTERNS + extra_patterns)
+
+
+def patterns_digest(patterns: Sequence[str]) -> str:
+    return hashlib.sha256("\n".join(patterns).encode("utf-8")).hexdigest()[:12]
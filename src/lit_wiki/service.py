@@ -1,22 +1,50 @@
 from __future__ import annotations
 
-import re
+import hashlib
+import json
+import threading
 import traceback
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
+from typing import Callable
 
-from .bibliography import BibliographyIndex, parse_bibliography, write_registry
-from .budget import load_budget_ledger
+from .bibliography import BibliographyIndex, parse_bibliography, read_registry_entry
+from .budget import can_spend
 from .config import AppConfig, ensure_runtime_directories
-from .extraction import extract_to_markdown
+from .extraction import extract_to_file
+from .fsevents import SettleTracker, open_watcher, path_signature
 from .matching import detect_source_format, match_source
-from .models import MatchResult, SourceRecord, WatchSummary
-from .notes import render_note, source_note_path
+from .metrics import enable_metrics, read_metrics, span, submit_with_context, summarize_metrics
+from .models import (
+    ApprovalReviewSummary,
+    BibliographyChanges,
+    BibliographyEntry,
+    BibliographyQuery,
+    GenerationOutcome,
+    IngestBatchSummary,
+    IngestJob,
+    MatchResult,
+    PdfBackendScore,
+    PendingApproval,
+    PreparedSource,
+    SourceRecord,
+    StageStats,
+    WatchSummary,
+)
+from .journal import WatchJournal
+from .notes import NOTE_TEMPLATE_VERSION, render_note, source_note_path
+from .pdf_backends import calibrate_pdf_backends, save_pdf_calibration
+from .pipeline import run_staged_pipeline
 from .providers import generate_sections, run_approved_fallback
-from .registry import SourceRegistry, utc_now_iso
+from .registry import utc_now_iso
+from .scanner import CONTROL_CHARS_RE, contamination_scanner
+from .session import PipelineSession, session_scope
 from .utils import file_sha256
 from .watch import (
     archive_watch_item,
     iter_watch_items,
+    resolve_batch_approval,
     resolve_fallback_approval,
     show_fallback_complete_dialog,
     show_final_dialog,
@@ -34,93 +62,135 @@ from .wiki import (
 )
 
 RAW_SOURCE_FORMATS = {"pdf", "epub", "epub_package", "markdown", "xhtml", "html", "htm"}
-EXTRACTION_ARTIFACT_PATTERNS = [
-    re.compile(pattern, re.IGNORECASE)
-    for pattern in (
-        r"this content downloaded from",
-        r"all use subject to https?://about\.jstor\.org/terms",
-        r"your use of the jstor archive indicates",
-        r"jstor is a not-for-profit service",
-    )
-]
+PDF_CALIBRATION_SAMPLES = 6
+
+
+class FallbackApprovalDeferred(Exception):
+    """Raised when a fallback approval is stored for batch review instead of prompting."""
+
+
+class InvalidPendingApproval(Exception):
+    """Raised when a stored pending approval has no approval request to review."""
 
 
 def load_bibliography(config: AppConfig) -> BibliographyIndex:
-    return parse_bibliography(config.bibliography_file)
+    return parse_bibliography(config.bibliography_file, config.cache_dir, config.bibliography_parse_workers)
 
 
-def sync_bibliography(config: AppConfig) -> BibliographyIndex:
+def sync_bibliography_changes(
+    config: AppConfig,
+    session: PipelineSession | None = None,
+) -> tuple[BibliographyIndex, BibliographyChanges]:
     ensure_runtime_directories(config)
-    bibliography = load_bibliography(config)
-    write_registry(bibliography, config.bibliography_registry_file)
+    with session_scope(config, session) as active:
+        return active.sync_bibliography()
+
+
+def sync_bibliography(config: AppConfig, session: PipelineSession | None = None) -> BibliographyIndex:
+    bibliography, _changes = sync_bibliography_changes(config, session)
     return bibliography
 
 
+def query_bibliography(config: AppConfig, query: BibliographyQuery) -> list[BibliographyEntry]:
+    return load_bibliography(config).query(query)
+
+
+def show_bibliography_entry(config: AppConfig, citekey: str) -> dict | None:
+    return read_registry_entry(config.bibliography_registry_file, citekey)
+
+
 def register_source(
     config: AppConfig,
     source_path: Path,
     citekey: str | None = None,
+    session: PipelineSession | None = None,
 ) -> tuple[SourceRecord, MatchResult]:
     ensure_runtime_directories(config)
-    bibliography = load_bibliography(config)
-    registry = SourceRegistry.load(config.registry_file)
+    with session_scope(config, session) as active:
+        return _register_source(config, source_path, citekey, active)
+
+
+def _register_source(
+    config: AppConfig,
+    source_path: Path,
+    citekey: str | None,
+    session: PipelineSession,
+) -> tuple[SourceRecord, MatchResult]:
+    record, match = _match_source_record(config, source_path, citekey, session.bibliography)
+    session.save_record(record)
+    return record, match
+
+
+def _match_source_record(
+    config: AppConfig,
+    source_path: Path,
+    citekey: str | None,
+    bibliography: BibliographyIndex,
+) -> tuple[SourceRecord, MatchResult]:
     resolved_source = source_path.expanduser().resolve()
     if _is_raw_source_under_wiki(config, resolved_source):
         raise ValueError("Raw source files must be placed in the watch folder, not under wiki/.")
 
+    source_format = detect_source_format(source_path)
     match = MatchResult(citekey=citekey or "", confidence=1.0 if citekey else 0.0, reason="manual citekey", needs_review=False)
     if citekey:
         if bibliography.get(citekey) is None:
             raise ValueError(f"Unknown citekey: {citekey}")
     else:
-        match = match_source(source_path, bibliography)
+        with span("register.match", format=source_format):
+            match = match_source(source_path, bibliography)
         if not match.citekey:
             raise ValueError(f"Unable to determine citekey for '{source_path}' ({match.reason})")
 
+    with span("register.hash", citekey=match.citekey, format=source_format):
+        raw_hash = file_sha256(source_path) if source_path.is_file() else ""
     record = SourceRecord(
         citekey=match.citekey,
         source_path=str(source_path),
-        source_format=detect_source_format(source_path),
-        raw_hash=file_sha256(source_path) if source_path.is_file() else "",
+        source_format=source_format,
+        raw_hash=raw_hash,
         match_reason=match.reason,
         confidence=match.confidence,
         needs_review=match.needs_review,
         processing_state="registered",
     )
-    registry.upsert(record)
-    registry.save()
     return record, match
 
 
-def extract_source(config: AppConfig, citekey: str) -> SourceRecord:
+def extract_source(config: AppConfig, citekey: str, session: PipelineSession | None = None) -> SourceRecord:
     ensure_runtime_directories(config)
-    registry = SourceRegistry.load(config.registry_file)
-    record = registry.get(citekey)
-    if record is None:
-        raise ValueError(f"No registered source for citekey '{citekey}'")
-
-    extracted_text = extract_to_markdown(Path(record.source_path))
-    output_path = config.extracted_dir / f"{citekey}.md"
-    output_path.write_text(extracted_text, encoding="utf-8")
+    with session_scope(config, session) as active:
+        record = _load_record(active, citekey)
+        source_path = Path(record.source_path)
+        # The source may have been replaced since registration; the cache key must match its current bytes.
+        record.raw_hash = file_sha256(source_path) if source_path.is_file() else ""
+        _extract_record(config, record)
+        return active.save_record(record)
+
+
+def _extract_record(config: AppConfig, record: SourceRecord) -> str:
+    output_path = config.extracted_dir / f"{record.citekey}.md"
+    with span("extract", citekey=record.citekey, format=record.source_format):
+        extracted_text = extract_to_file(
+            Path(record.source_path),
+            output_path,
+            record.raw_hash,
+            config.extraction_cache_dir,
+            config.extraction_cache_max_bytes,
+            config.pdf_extract_workers,
+            config.artifact_patterns.boilerplate,
+            config.pdf_calibration_file,
+            config.pdf_backend,
+        )
     record.extracted_path = str(output_path)
     record.extraction_status = "extracted"
     record.ingest_status = "registered"
     record.processing_state = "extracted"
-    registry.upsert(record)
-    registry.save()
-    return record
+    return extracted_text
 
 
-def _save_record(config: AppConfig, record: SourceRecord) -> SourceRecord:
-    registry = SourceRegistry.load(config.registry_file)
-    registry.upsert(record)
-    registry.save()
-    return record
-
-
-def _load_record(config: AppConfig, citekey: str) -> SourceRecord:
-    registry = SourceRegistry.load(config.registry_file)
-    record = registry.get(citekey)
+def _load_record(session: PipelineSession, citekey: str) -> SourceRecord:
+    record = session.get_record(citekey)
     if record is None:
         raise ValueError(f"No registered source for citekey '{citekey}'")
     return record
@@ -151,10 +221,9 @@ def _validate_publishable_note(
             return [value] if value.strip() else []
         return [str(item) for item in value if str(item).strip()]
 
-    for pattern in EXTRACTION_ARTIFACT_PATTERNS:
-        if pattern.search(extracted_text):
-            return "extraction contamination detected"
-    if any(ord(char) < 32 and char not in "\n\t\r" for char in extracted_text):
+    if contamination_scanner(tuple(config.artifact_patterns.contamination)).search(extracted_text):
+        return "extraction contamination detected"
+    if CONTROL_CHARS_RE.search(extracted_text):
         return "extraction contains control characters"
 
     related_refs = [
@@ -176,31 +245,92 @@ def _validate_publishable_note(
     return ""
 
 
-def ingest_source(config: AppConfig, citekey: str, approval_resolver=None) -> Path:
+def ingest_source(
+    config: AppConfig,
+    citekey: str,
+    approval_resolver=None,
+    session: PipelineSession | None = None,
+) -> Path:
     ensure_runtime_directories(config)
-    bibliography = load_bibliography(config)
-    entry = bibliography.get(citekey)
+    with session_scope(config, session) as active:
+        return _ingest_source(config, citekey, approval_resolver, active)
+
+
+def _ingest_source(config: AppConfig, citekey: str, approval_resolver, session: PipelineSession) -> Path:
+    job = _start_ingest(config, citekey, session)
+    return _publish_ingest(config, job, _generate_ingest(config, job, session), approval_resolver, session)
+
+
+def _ingest_job(config: AppConfig, citekey: str, session: PipelineSession, extracted_text: str | None = None) -> IngestJob:
+    entry = session.bibliography.get(citekey)
     if entry is None:
         raise ValueError(f"Unknown citekey: {citekey}")
 
-    record = _load_record(config, citekey)
-
-    extracted_text = ""
-    if record.extracted_path:
-        extracted_file = Path(record.extracted_path)
-        if extracted_file.exists():
-            extracted_text = extracted_file.read_text(encoding="utf-8")
-    ledger = load_budget_ledger(config.budget_ledger_file)
-    record.processing_state = "local_processing"
-    _save_record(config, record)
-
-    outcome = generate_sections(
-        config,
-        entry,
-        extracted_text,
-        bibliography,
-        current_daily_tokens=ledger.get("total_tokens", 0),
+    record = _load_record(session, citekey)
+    if extracted_text is None:
+        extracted_text = ""
+        if record.extracted_path:
+            extracted_file = Path(record.extracted_path)
+            if extracted_file.exists():
+                extracted_text = extracted_file.read_text(encoding="utf-8")
+    fingerprint = _ingest_fingerprint(config, session, entry, extracted_text)
+    return IngestJob(entry=entry, record=record, extracted_text=extracted_text, fingerprint=fingerprint)
+
+
+def _ingest_fingerprint(config: AppConfig, session: PipelineSession, entry: BibliographyEntry, extracted_text: str) -> str:
+    provider = config.primary_provider
+    parts = (
+        hashlib.sha256(extracted_text.encode("utf-8")).hexdigest(),
+        hashlib.sha256(json.dumps(entry.as_dict(), sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest(),
+        provider.name,
+        provider.backend,
+        provider.model,
+        session.keyword_catalogue_version,
+        NOTE_TEMPLATE_VERSION,
+    )
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+def _is_up_to_date(config: AppConfig, job: IngestJob) -> bool:
+    return (
+        job.record.processing_state == "ingested"
+        and job.record.ingest_fingerprint == job.fingerprint
+        and source_note_path(config.wiki_sources_dir, job.record.citekey).exists()
     )
+
+
+def _start_ingest(config: AppConfig, citekey: str, session: PipelineSession, extracted_text: str | None = None) -> IngestJob:
+    return _begin_ingest(_ingest_job(config, citekey, session, extracted_text), session)
+
+
+def _begin_ingest(job: IngestJob, session: PipelineSession) -> IngestJob:
+    job.record.processing_state = "local_processing"
+    session.save_record(job.record)
+    return job
+
+
+def _generate_ingest(config: AppConfig, job: IngestJob, session: PipelineSession) -> GenerationOutcome:
+    with span("generate", citekey=job.record.citekey, format=job.record.source_format):
+        return generate_sections(
+            config,
+            job.entry,
+            job.extracted_text,
+            session.bibliography,
+            current_daily_tokens=session.ledger.get("total_tokens", 0),
+            session=session,
+        )
+
+
+def _publish_ingest(
+    config: AppConfig,
+    job: IngestJob,
+    outcome: GenerationOutcome,
+    approval_resolver,
+    session: PipelineSession,
+) -> Path:
+    entry, record, extracted_text = job.entry, job.record, job.extracted_text
+    citekey = entry.citekey
+    bibliography = session.bibliography
     if outcome.status == "needs_approval":
         record.processing_state = "awaiting_fallback_approval"
         record.escalation_reason = outcome.escalation_reason
@@ -208,40 +338,44 @@ def ingest_source(config: AppConfig, citekey: str, approval_resolver=None) -> Pa
         record.fallback_model = outcome.approval_request.fallback_model if outcome.approval_request else ""
         record.approval_requested_at = utc_now_iso()
         record.local_attempts = outcome.local_attempts
-        _save_record(config, record)
+        session.save_record(record)
+        session.flush()
         resolver = approval_resolver or (lambda request: resolve_fallback_approval(config, request))
         decision = resolver(outcome.approval_request)
         record.approval_decision = decision
+        if decision == "defer":
+            session.save_record(record)
+            session.registry.add_pending_approval(
+                PendingApproval(citekey, outcome, job.fingerprint, record.approval_requested_at)
+            )
+            raise FallbackApprovalDeferred(f"Fallback approval for {citekey} deferred to batch review.")
         if decision == "cancel":
             record.processing_state = "awaiting_fallback_approval"
-            _save_record(config, record)
+            session.save_record(record)
             raise RuntimeError("Queue cancelled during fallback approval.")
         if decision != "approve":
             record.processing_state = "needs_review"
             record.ingest_status = "needs_review"
-            _save_record(config, record)
+            session.save_record(record)
             raise ValueError("Fallback approval denied; source sent to review.")
 
-        record.processing_state = "fallback_processing"
-        _save_record(config, record)
-        outcome = run_approved_fallback(
-            config,
-            entry,
-            extracted_text,
-            bibliography,
-            outcome.approval_request,
-            outcome.keyword_targets,
-            outcome.keyword_links,
-            outcome.keyword_tags,
-        )
-        if outcome.status != "success":
+        # With parallel workers, sources published since this one's generation may have used up the budget.
+        with session._ledger_lock:
+            allowed, denial_reason = can_spend(session.ledger, outcome.approval_request.usage, config.budget_policy)
+        if not allowed:
             record.processing_state = "needs_review"
             record.ingest_status = "needs_review"
-            record.escalation_reason = outcome.escalation_reason
-            record.provider = outcome.provider_name
-            record.usage_summary = outcome.usage.as_dict() if outcome.usage else {}
-            _save_record(config, record)
-            raise ValueError(f"Fallback processing failed: {outcome.escalation_reason}")
+            record.escalation_reason = denial_reason
+            session.save_record(record)
+            raise ValueError(denial_reason)
+
+        record.processing_state = "fallback_processing"
+        session.save_record(record)
+        outcome = _run_fallback(config, job, outcome, session)
+        if session.journal is not None:
+            # Persist the spend first so a resumed run that reuses this outcome is already accounted for.
+            session.flush()
+            session.journal.record(record.source_path, "generated", fingerprint=job.fingerprint, outcome=outcome.as_dict())
         if config.show_completion_dialog and outcome.usage is not None:
             show_fallback_complete_dialog(citekey, entry.title, outcome.usage)
     elif outcome.status == "needs_review":
@@ -249,7 +383,7 @@ def ingest_source(config: AppConfig, citekey: str, approval_resolver=None) -> Pa
         record.ingest_status = "needs_review"
         record.escalation_reason = outcome.escalation_reason
         record.local_attempts = outcome.local_attempts
-        _save_record(config, record)
+        session.save_record(record)
         show_info_dialog(f"Fallback blocked for {entry.title} [@{citekey}]\\n\\nReason: {outcome.escalation_reason}")
         raise ValueError(outcome.escalation_reason)
 
@@ -262,36 +396,185 @@ def ingest_source(config: AppConfig, citekey: str, approval_resolver=None) -> Pa
         record.provider = outcome.provider_name
         record.local_attempts = max(record.local_attempts, outcome.local_attempts)
         record.usage_summary = outcome.usage.as_dict() if outcome.usage else {}
-        _save_record(config, record)
+        session.save_record(record)
         raise ValueError(publish_error)
 
+    labels = {"citekey": citekey, "format": record.source_format}
     note_path = source_note_path(config.wiki_sources_dir, citekey)
-    existing = note_path.read_text(encoding="utf-8") if note_path.exists() else None
-    note_path.write_text(render_note(entry, record, outcome.sections, existing_note=existing), encoding="utf-8")
+    with span("publish.render_note", **labels):
+        existing = note_path.read_text(encoding="utf-8") if note_path.exists() else None
+        note_path.write_text(render_note(entry, record, outcome.sections, existing_note=existing), encoding="utf-8")
 
     record.provider = outcome.provider_name
     record.local_attempts = max(record.local_attempts, outcome.local_attempts)
     record.processing_state = "ingested"
     record.ingest_status = "ingested"
     record.usage_summary = outcome.usage.as_dict() if outcome.usage else {}
-    _save_record(config, record)
-
-    ensure_person_pages(config, entry)
-    ensure_concept_pages(config, entry, outcome.sections)
-    update_index(config, entry)
-    update_log(config, entry)
-    update_overview(config, bibliography)
+    record.ingest_fingerprint = job.fingerprint
+    session.save_record(record)
+
+    if session.wiki_batch is not None:
+        with span("wiki.pages", **labels):
+            session.wiki_batch.add_source(entry, outcome.sections)
+        return note_path
+    with span("wiki.pages", **labels):
+        ensure_person_pages(config, entry)
+        ensure_concept_pages(config, entry, outcome.sections)
+    with span("wiki.update_index", **labels):
+        update_index(config, entry)
+    with span("wiki.update_log", **labels):
+        update_log(config, entry)
+    with span("wiki.update_overview", **labels):
+        update_overview(config, bibliography)
     return note_path
 
 
-def ingest_batch(config: AppConfig) -> list[Path]:
-    registry = SourceRegistry.load(config.registry_file)
-    ingested: list[Path] = []
-    for citekey, record in sorted(registry.records.items()):
-        if record.extraction_status != "extracted":
+def _run_fallback(config: AppConfig, job: IngestJob, approved: GenerationOutcome, session: PipelineSession) -> GenerationOutcome:
+    # Touches only this job's record, so batch reviews call it from provider threads.
+    record = job.record
+    with span("generate.fallback", citekey=record.citekey, format=record.source_format):
+        outcome = run_approved_fallback(
+            config,
+            job.entry,
+            job.extracted_text,
+            session.bibliography,
+            approved.approval_request,
+            approved.keyword_targets,
+            approved.keyword_links,
+            approved.keyword_tags,
+            session=session,
+        )
+    if outcome.status != "success":
+        record.processing_state = "needs_review"
+        record.ingest_status = "needs_review"
+        record.escalation_reason = outcome.escalation_reason
+        record.provider = outcome.provider_name
+        record.usage_summary = outcome.usage.as_dict() if outcome.usage else {}
+        session.save_record(record)
+        raise ValueError(f"Fallback processing failed: {outcome.escalation_reason}")
+    return outcome
+
+
+def list_pending_approvals(config: AppConfig) -> list[PendingApproval]:
+    ensure_runtime_directories(config)
+    with session_scope(config) as session:
+        pending = session.registry.pending_approvals()
+    broken = [item.citekey for item in pending if item.outcome.approval_request is None]
+    if broken:
+        raise InvalidPendingApproval(f"pending approvals without an approval request: {', '.join(broken)}")
+    return pending
+
+
+def review_pending_approvals(
+    config: AppConfig,
+    approve: list[str] | tuple[str, ...] = (),
+    skip: list[str] | tuple[str, ...] = (),
+    session: PipelineSession | None = None,
+) -> ApprovalReviewSummary:
+    ensure_runtime_directories(config)
+    with session_scope(config, session) as active, active.deferred_bookkeeping():
+        return _review_pending_approvals(config, approve, skip, active)
+
+
+def _review_pending_approvals(
+    config: AppConfig,
+    approve: list[str] | tuple[str, ...],
+    skip: list[str] | tuple[str, ...],
+    session: PipelineSession,
+) -> ApprovalReviewSummary:
+    summary = ApprovalReviewSummary()
+    pending = {item.citekey: item for item in session.registry.pending_approvals()}
+    for citekey in dict.fromkeys(skip):
+        if citekey not in pending:
             continue
-        ingested.append(ingest_source(config, citekey))
-    return ingested
+        record = _load_record(session, citekey)
+        record.approval_decision = "skip"
+        record.processing_state = "needs_review"
+        record.ingest_status = "needs_review"
+        _settle_pending_source(config, session, record, config.other_dir)
+        session.registry.remove_pending_approval(citekey)
+        summary.skipped.append(citekey)
+        del pending[citekey]
+
+    # Admit approvals in order while their combined estimate fits today's budget; the rest stay pending.
+    planned = {"total_tokens": session.ledger.get("total_tokens", 0), "total_cost": session.ledger.get("total_cost", 0.0)}
+    jobs: list[tuple[PendingApproval, IngestJob]] = []
+    for citekey in dict.fromkeys(approve):
+        item = pending.get(citekey)
+        if item is None or item.outcome.approval_request is None:
+            continue
+        usage = item.outcome.approval_request.usage
+        allowed, reason = can_spend(planned, usage, config.budget_policy)
+        if not allowed:
+            summary.held[citekey] = reason
+            continue
+        planned["total_tokens"] += usage.estimated_total_tokens
+        planned["total_cost"] += usage.estimated_cost
+        job = _ingest_job(config, citekey, session)
+        job.record.approval_decision = "approve"
+        job.record.processing_state = "fallback_processing"
+        session.save_record(job.record)
+        jobs.append((item, job))
+    session.flush()
+    if not jobs:
+        return summary
+
+    workers = min(len(jobs), max(1, config.watch_pipeline.provider_workers))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="lit-wiki-fallback") as pool:
+        futures = [
+            submit_with_context(pool, _run_fallback, config, job, item.outcome, session) for item, job in jobs
+        ]
+        for (item, job), future in zip(jobs, futures):
+            try:
+                note_path = _publish_ingest(config, job, future.result(), None, session)
+            except ValueError as exc:
+                summary.failed[item.citekey] = str(exc)
+                _settle_pending_source(config, session, job.record, config.other_dir)
+                session.registry.remove_pending_approval(item.citekey)
+            except Exception as exc:
+                # Provider errors such as timeouts do not stop the rest of the batch.
+                summary.failed[item.citekey] = f"{type(exc).__name__}: {exc}"
+                job.record.processing_state = "needs_review"
+                job.record.ingest_status = "needs_review"
+                job.record.escalation_reason = summary.failed[item.citekey]
+                _settle_pending_source(config, session, job.record, config.other_dir)
+                session.registry.remove_pending_approval(item.citekey)
+                with (config.cache_dir / "watch_failures.log").open("a", encoding="utf-8") as handle:
+                    handle.write(f"{job.record.source_path}\n{traceback.format_exc()}\n")
+            else:
+                summary.ingested.append(note_path)
+                _settle_pending_source(config, session, job.record, config.processed_dir)
+                session.registry.remove_pending_approval(item.citekey)
+            finally:
+                session.flush()
+    return summary
+
+
+def _settle_pending_source(config: AppConfig, session: PipelineSession, record: SourceRecord, destination: Path) -> None:
+    source = Path(record.source_path)
+    if source.parent == config.pending_dir and source.exists():
+        record.source_path = str(archive_watch_item(source, destination))
+    session.save_record(record)
+
+
+def ingest_batch(config: AppConfig, force: bool = False) -> IngestBatchSummary:
+    ensure_runtime_directories(config)
+    summary = IngestBatchSummary()
+    with session_scope(config) as session, session.deferred_bookkeeping():
+        for citekey, record in sorted(session.registry.records.items()):
+            if record.extraction_status != "extracted":
+                continue
+            job = _ingest_job(config, citekey, session)
+            if not force and _is_up_to_date(config, job):
+                summary.skipped.append(citekey)
+                continue
+            try:
+                _begin_ingest(job, session)
+                outcome = _generate_ingest(config, job, session)
+                summary.ingested.append(_publish_ingest(config, job, outcome, None, session))
+            finally:
+                session.flush()
+    return summary
 
 
 def run_graph_build(config: AppConfig) -> tuple[int, int]:
@@ -307,69 +590,297 @@ def run_lint(config: AppConfig) -> str:
     return report
 
 
-def _persist_source_path(config: AppConfig, citekey: str, new_path: Path) -> None:
-    registry = SourceRegistry.load(config.registry_file)
-    record = registry.get(citekey)
+def stage_stats(config: AppConfig, since: float = 0.0, by_format: bool = True) -> list[StageStats]:
+    return summarize_metrics(read_metrics(config.metrics_file, since), by_format)
+
+
+def _calibration_samples(config: AppConfig) -> list[Path]:
+    # Spread the default samples across file sizes, since backend speed and quality vary with both.
+    found = {path.resolve() for folder in (config.raw_dir, config.processed_dir) for path in folder.rglob("*.pdf")}
+    by_size = sorted(found, key=lambda path: path.stat().st_size)
+    if len(by_size) <= PDF_CALIBRATION_SAMPLES:
+        return by_size
+    step = (len(by_size) - 1) / (PDF_CALIBRATION_SAMPLES - 1)
+    return [by_size[round(index * step)] for index in range(PDF_CALIBRATION_SAMPLES)]
+
+
+def calibrate_pdf_extraction(config: AppConfig, samples: list[Path] | None = None) -> list[PdfBackendScore]:
+    paths = samples or _calibration_samples(config)
+    if not paths:
+        raise RuntimeError(f"No PDFs found under {config.raw_dir} or {config.processed_dir}; pass sample files.")
+    missing = [str(path) for path in paths if not path.is_file()]
+    if missing:
+        raise RuntimeError(f"Sample PDF not found: {', '.join(missing)}")
+    scores = calibrate_pdf_backends(paths)
+    save_pdf_calibration(config.pdf_calibration_file, scores, utc_now_iso())
+    return scores
+
+
+def _persist_source_path(session: PipelineSession, citekey: str, new_path: Path) -> None:
+    record = session.get_record(citekey)
     if record is None:
         return
     record.source_path = str(new_path)
-    registry.upsert(record)
-    registry.save()
+    session.save_record(record)
+
+
+_WORKER_BIBLIOGRAPHIES: dict[Path, BibliographyIndex] = {}
+
+
+def _worker_bibliography(config: AppConfig) -> BibliographyIndex:
+    bibliography = _WORKER_BIBLIOGRAPHIES.get(config.bibliography_file)
+    if bibliography is None:
+        bibliography = _WORKER_BIBLIOGRAPHIES[config.bibliography_file] = load_bibliography(config)
+    return bibliography
+
+
+def _prepare_watch_item(
+    config: AppConfig,
+    item: Path,
+    bibliography: BibliographyIndex | None = None,
+    journalled: dict[str, dict] | None = None,
+) -> PreparedSource:
+    # Pool workers started with "spawn" do not inherit the parent's metrics recorder.
+    enable_metrics(config.metrics_file if config.metrics_enabled else None)
+    record, match = _match_source_record(config, item, None, bibliography or _worker_bibliography(config))
+    if record.needs_review:
+        return PreparedSource(record=record, match=match)
+    extracted_text = _resume_extraction(record, (journalled or {}).get(str(item)))
+    if extracted_text is None:
+        extracted_text = _extract_record(config, record)
+    return PreparedSource(record=record, match=match, extracted_text=extracted_text)
+
+
+def _resume_extraction(record: SourceRecord, event: dict | None) -> str | None:
+    if not event or not record.raw_hash or event.get("raw_hash") != record.raw_hash or event.get("citekey") != record.citekey:
+        return None
+    extracted_file = Path(event.get("extracted_path", ""))
+    try:
+        extracted_text = extracted_file.read_text(encoding="utf-8")
+    except OSError:
+        return None
+    if hashlib.sha256(extracted_text.encode("utf-8")).hexdigest() != event.get("text_sha256"):
+        return None
+    record.extracted_path = str(extracted_file)
+    record.extraction_status = "extracted"
+    record.ingest_status = "registered"
+    record.processing_state = "extracted"
+    return extracted_text
+
+
+def _record_watch_failure(config: AppConfig, item: Path, exc: Exception, summary: WatchSummary) -> bool:
+    if isinstance(exc, RuntimeError) and "Queue cancelled" in str(exc):
+        summary.cancelled = True
+        return False
+    archive_watch_item(item, config.other_dir)
+    message = str(exc).lower()
+    if isinstance(exc, RuntimeError):
+        summary.fail_count += 1
+    elif isinstance(exc, ValueError) and not ("approval denied" in message or "needs_review" in message or "cap" in message):
+        summary.fail_count += 1
+    else:
+        summary.issue_count += 1
+    failure_log = config.cache_dir / "watch_failures.log"
+    with failure_log.open("a", encoding="utf-8") as handle:
+        handle.write(f"{item}\n{traceback.format_exc()}\n")
+    return True
+
+
+def _watch_approval_resolver(config: AppConfig):
+    policy = config.approval_policy
+    if policy.defer_in_watch and policy.default_decision.lower() == "prompt":
+        return lambda request: "defer"
+    return None
+
+
+def _review_deferred_approvals(config: AppConfig, citekeys: list[str], summary: WatchSummary, session: PipelineSession) -> None:
+    requests = [
+        item.outcome.approval_request
+        for item in session.registry.pending_approvals()
+        if item.citekey in citekeys and item.outcome.approval_request is not None
+    ]
+    decision = resolve_batch_approval(config, requests)
+    if decision not in {"approve", "skip"}:
+        return
+    if decision == "approve":
+        review = _review_pending_approvals(config, citekeys, (), session)
+    else:
+        review = _review_pending_approvals(config, (), citekeys, session)
+    summary.success_count += len(review.ingested)
+    summary.issue_count += len(review.skipped) + len(review.failed)
+    summary.deferred_count = len(review.held)
 
 
 def process_watch_folder(config: AppConfig) -> WatchSummary:
     ensure_runtime_directories(config)
 
     def _run() -> WatchSummary:
-        summary = WatchSummary()
-        sync_bibliography(config)
-        items = iter_watch_items(config)
+        session = PipelineSession(config)
+        sync_bibliography(config, session)
+        session.preload()
+        with span("watch.run"), session.deferred_bookkeeping():
+            return _process_watch_items(config, session, iter_watch_items(config))
+
+    summary = timed_watch_run(_run)
+    if config.show_completion_dialog:
+        show_final_dialog(summary)
+    return summary
 
-        for item in items:
-            source_format = detect_source_format(item)
-            summary.count_format(source_format)
+
+def _process_watch_items(config: AppConfig, session: PipelineSession, items: list[Path]) -> WatchSummary:
+    summary = WatchSummary()
+    journal = session.journal = WatchJournal.load(config.watch_journal_file)
+    counted: set[Path] = set()
+    deferred: list[str] = []
+    approval_resolver = _watch_approval_resolver(config)
+
+    def count(item: Path) -> None:
+        if item not in counted:
+            counted.add(item)
+            summary.count_format(detect_source_format(item))
+
+    def admit(item: Path, prepared: PreparedSource) -> IngestJob | None:
+        count(item)
+        record = prepared.record
+        if record.needs_review:
+            record.processing_state = "needs_review"
+            session.save_record(record)
+            archive_watch_item(item, config.other_dir)
+            summary.issue_count += 1
+            session.flush()
+            journal.record(item, "done")
+            return None
+        session.save_record(record)
+        extracted_text = prepared.extracted_text or ""
+        resumed = journal.prepared(item, record.raw_hash)
+        if resumed is None or resumed.get("stage") != "generated":
+            journal.record(
+                item,
+                "prepared",
+                citekey=record.citekey,
+                raw_hash=record.raw_hash,
+                extracted_path=record.extracted_path,
+                text_sha256=hashlib.sha256(extracted_text.encode("utf-8")).hexdigest(),
+            )
+        return _start_ingest(config, record.citekey, session, extracted_text)
+
+    def generate(job: IngestJob) -> GenerationOutcome:
+        item = job.record.source_path
+        resumed = journal.generated_outcome(item, job.fingerprint)
+        if resumed is not None:
+            return resumed
+        outcome = _generate_ingest(config, job, session)
+        if outcome.status in {"success", "needs_approval"}:
+            journal.record(item, "generated", fingerprint=job.fingerprint, outcome=outcome.as_dict())
+        return outcome
+
+    def publish(item: Path, job: IngestJob, outcome: GenerationOutcome) -> None:
+        try:
             try:
-                record, _match = register_source(config, item)
-                if record.needs_review:
-                    record.processing_state = "needs_review"
-                    _save_record(config, record)
-                    archive_watch_item(item, config.other_dir)
-                    summary.issue_count += 1
-                    continue
-
-                record = extract_source(config, record.citekey)
-                ingest_source(config, record.citekey)
+                _publish_ingest(config, job, outcome, approval_resolver, session)
+            except FallbackApprovalDeferred:
+                pending_path = archive_watch_item(item, config.pending_dir)
+                _persist_source_path(session, job.record.citekey, pending_path)
+                deferred.append(job.record.citekey)
+                summary.deferred_count += 1
+            else:
                 archived_path = archive_watch_item(item, config.processed_dir)
-                _persist_source_path(config, record.citekey, archived_path)
+                _persist_source_path(session, job.record.citekey, archived_path)
                 summary.success_count += 1
-            except RuntimeError as exc:
-                if "Queue cancelled" in str(exc):
-                    summary.cancelled = True
-                    break
-                archive_watch_item(item, config.other_dir)
-                summary.fail_count += 1
-                failure_log = config.cache_dir / "watch_failures.log"
-                with failure_log.open("a", encoding="utf-8") as handle:
-                    handle.write(f"{item}\n{traceback.format_exc()}\n")
-            except ValueError as exc:
-                archive_watch_item(item, config.other_dir)
-                if "approval denied" in str(exc).lower() or "needs_review" in str(exc).lower() or "cap" in str(exc).lower():
-                    summary.issue_count += 1
-                else:
-                    summary.fail_count += 1
-                failure_log = config.cache_dir / "watch_failures.log"
-                with failure_log.open("a", encoding="utf-8") as handle:
-                    handle.write(f"{item}\n{traceback.format_exc()}\n")
-            except Exception:
-                archive_watch_item(item, config.other_dir)
-                summary.issue_count += 1
-                failure_log = config.cache_dir / "watch_failures.log"
-                with failure_log.open("a", encoding="utf-8") as handle:
-                    handle.write(f"{item}\n{traceback.format_exc()}\n")
+        finally:
+            session.flush()
+        journal.record(item, "done")
+
+    def on_error(item: Path, exc: Exception) -> bool:
+        count(item)
+        try:
+            archived = _record_watch_failure(config, item, exc, summary)
+        finally:
+            session.flush()
+        if archived:
+            journal.record(item, "done")
+        return archived
+
+    stages = config.watch_pipeline
+    run_staged_pipeline(
+        items,
+        prepare=partial(
+            _prepare_watch_item,
+            config,
+            bibliography=session.bibliography if stages.extract_workers <= 1 and stages.provider_workers <= 1 else None,
+            journalled=journal.unfinished(),
+        ),
+        admit=admit,
+        generate=generate,
+        publish=publish,
+        on_error=on_error,
+        prepare_workers=stages.extract_workers,
+        provider_workers=stages.provider_workers,
+        queue_size=stages.queue_size,
+    )
+    if deferred and not summary.cancelled:
+        _review_deferred_approvals(config, deferred, summary, session)
+    journal.compact()
+    return summary
 
-        return summary
 
-    summary = timed_watch_run(_run)
-    if config.show_completion_dialog:
-        show_final_dialog(summary)
-    return summary
+def serve_watch_folder(
+    config: AppConfig,
+    stop: threading.Event | None = None,
+    on_batch: Callable[[WatchSummary], None] | None = None,
+    report: Callable[[str], None] | None = None,
+) -> None:
+    """Process watch-folder arrivals as they settle until ``stop`` is set or the queue is cancelled."""
+    ensure_runtime_directories(config)
+    stop = stop or threading.Event()
+    report = report or (lambda message: None)
+    serve = config.watch_serve
+    session = PipelineSession(config)
+    sync_bibliography(config, session)
+    session.preload()
+    watcher = open_watcher([config.watch_dir, config.bibliography_file.parent], serve.poll_interval)
+    arrivals = SettleTracker(serve.settle_seconds)
+    bibliography_edits = SettleTracker(serve.settle_seconds)
+    bibliography_signature = path_signature(config.bibliography_file)
+    # Items still in the queue after a batch (e.g. a cancelled approval) wait until their bytes change.
+    attempted: dict[Path, tuple[int, int] | None] = {}
+    report(f"Watching {config.watch_dir} ({type(watcher).__name__})")
+    try:
+        while not stop.is_set():
+            signature = path_signature(config.bibliography_file)
+            if signature == bibliography_signature:
+                bibliography_edits.ready([])
+            elif bibliography_edits.ready([config.bibliography_file]):
+                bibliography_signature = signature
+                try:
+                    bibliography, changes = session.sync_bibliography()
+                except Exception as exc:
+                    report(f"Bibliography sync failed, keeping the previous index: {exc}")
+                else:
+                    report(
+                        f"Re-synced {len(bibliography.entries)} bibliography entries "
+                        f"(added={len(changes.added)} changed={len(changes.changed)} removed={len(changes.removed)})"
+                    )
+
+            for item in list(attempted):
+                if attempted[item] != path_signature(item):
+                    del attempted[item]
+            ready = arrivals.ready([item for item in iter_watch_items(config) if item not in attempted])
+            if ready:
+                session.refresh_ledger()
+                with session.deferred_bookkeeping():
+                    summary = timed_watch_run(lambda: _process_watch_items(config, session, ready))
+                for item in ready:
+                    if item.exists():
+                        attempted[item] = path_signature(item)
+                if on_batch is not None:
+                    on_batch(summary)
+                if summary.cancelled:
+                    return
+                continue
+
+            deadlines = [deadline for deadline in (arrivals.next_deadline(), bibliography_edits.next_deadline()) if deadline is not None]
+            watcher.wait(max(0.05, min(deadlines + [1.0])))
+    finally:
+        watcher.close()
+        session.flush()
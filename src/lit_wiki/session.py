@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from datetime import date
+from typing import Iterator
+
+from .bibliography import BibliographyIndex, parse_bibliography, write_registry
+from .budget import add_spend, load_budget_ledger, save_budget_ledger
+from .config import AppConfig
+from .journal import WatchJournal
+from .keywords import KeywordCatalogue, keyword_catalogue_version, load_keyword_catalogue
+from .metrics import enable_metrics, span
+from .models import BibliographyChanges, ProviderUsage, SourceRecord
+from .registry import SourceRegistry
+from .wiki import WikiBatch
+
+
+class PipelineSession:
+    """Bibliography, source registry, budget ledger and keyword catalogue loaded once per run.
+
+    Record and ledger changes are kept in memory until ``flush``.
+    """
+
+    def __init__(self, config: AppConfig) -> None:
+        self.config = config
+        enable_metrics(config.metrics_file if config.metrics_enabled else None)
+        self._bibliography: BibliographyIndex | None = None
+        self._registry: SourceRegistry | None = None
+        self._ledger: dict | None = None
+        self._ledger_dirty = False
+        self._ledger_lock = threading.Lock()
+        self._catalogue: KeywordCatalogue | None = None
+        self._catalogue_loaded = False
+        self._catalogue_version: str | None = None
+        self._pending: dict[str, SourceRecord] = {}
+        self.journal: WatchJournal | None = None
+        self.wiki_batch: WikiBatch | None = None
+
+    @property
+    def bibliography(self) -> BibliographyIndex:
+        if self._bibliography is None:
+            self._bibliography = self._parse_bibliography()
+        return self._bibliography
+
+    def _parse_bibliography(self) -> BibliographyIndex:
+        with span("bibliography.load"):
+            return parse_bibliography(
+                self.config.bibliography_file,
+                self.config.cache_dir,
+                self.config.bibliography_parse_workers,
+            )
+
+    @property
+    def registry(self) -> SourceRegistry:
+        if self._registry is None:
+            self._registry = SourceRegistry.load(self.config.registry_file)
+        return self._registry
+
+    @property
+    def ledger(self) -> dict:
+        if self._ledger is None:
+            self._ledger = load_budget_ledger(self.config.budget_ledger_file)
+        return self._ledger
+
+    @property
+    def keyword_catalogue(self) -> KeywordCatalogue | None:
+        if not self._catalogue_loaded:
+            self._catalogue = load_keyword_catalogue(self.config)
+            self._catalogue_loaded = True
+        return self._catalogue
+
+    @property
+    def keyword_catalogue_version(self) -> str:
+        if self._catalogue_version is None:
+            self._catalogue_version = keyword_catalogue_version(self.config)
+        return self._catalogue_version
+
+    def preload(self) -> None:
+        # Touch every lazily loaded resource, e.g. before worker threads start reading them.
+        self.bibliography
+        self.ledger
+        self.keyword_catalogue
+        self.keyword_catalogue_version
+
+    def sync_bibliography(self) -> tuple[BibliographyIndex, BibliographyChanges]:
+        # The loaded index is only replaced once the file has parsed, so a broken edit keeps it.
+        bibliography = self._bibliography = self._parse_bibliography()
+        with span("bibliography.registry"):
+            changes = write_registry(bibliography, self.config.bibliography_registry_file)
+        return bibliography, changes
+
+    def get_record(self, citekey: str) -> SourceRecord | None:
+        if citekey in self._pending:
+            return self._pending[citekey]
+        return self.registry.get(citekey)
+
+    def save_record(self, record: SourceRecord) -> SourceRecord:
+        self._pending[record.citekey] = record
+        return record
+
+    def record_spend(self, usage: ProviderUsage, citekey: str) -> dict:
+        with self._ledger_lock:
+            self._ledger_dirty = True
+            return add_spend(self.ledger, usage, citekey)
+
+    def refresh_ledger(self) -> None:
+        # A long-lived session starts the next day's ledger instead of carrying yesterday's totals.
+        if self._ledger is not None and self._ledger.get("date") != date.today().isoformat():
+            self.flush()
+            self._ledger = None
+
+    @contextmanager
+    def deferred_bookkeeping(self) -> Iterator[None]:
+        # Index, log and overview updates made inside the block, plus any a crashed batch left
+        # behind, are written once on the way out.
+        if self.wiki_batch is not None:
+            yield
+            return
+        self.wiki_batch = WikiBatch(self.config)
+        try:
+            yield
+        finally:
+            batch, self.wiki_batch = self.wiki_batch, None
+            if len(batch):
+                with span("wiki.apply_batch", sources=str(len(batch))):
+                    batch.apply(self.bibliography)
+
+    def flush(self) -> None:
+        pending, self._pending = self._pending, {}
+        if pending:
+            self.registry.upsert_many(list(pending.values()))
+        with self._ledger_lock:
+            if self._ledger_dirty and self._ledger is not None:
+                save_budget_ledger(self.config.budget_ledger_file, self._ledger)
+                self._ledger_dirty = False
+
+
+@contextmanager
+def session_scope(config: AppConfig, session: PipelineSession | None = None) -> Iterator[PipelineSession]:
+    # A caller-provided session is flushed by its owner; a private one is flushed on the way out.
+    if session is not None:
+        yield session
+        return
+    session = PipelineSession(config)
+    try:
+        yield session
+    finally:
+        session.flush()
@@ -3,15 +3,32 @@ from __future__ import annotations
 import hashlib
 import re
 import unicodedata
+from functools import lru_cache
 from pathlib import Path
 
 
+NORMALIZE_CACHE_SIZE = 1 << 16
+NORMALIZE_CACHE_MAX_CHARS = 64
+NORMALIZE_TABLE = str.maketrans(
+    {chr(code): chr(code).lower() if chr(code).isalnum() else " " for code in range(128)}
+)
+
+
+def _normalize_uncached(value: str) -> str:
+    if not value.isascii():
+        value = unicodedata.normalize("NFKD", value).encode("ascii", "ignore").decode("ascii")
+    return " ".join(value.translate(NORMALIZE_TABLE).split())
+
+
+_normalize_cached = lru_cache(maxsize=NORMALIZE_CACHE_SIZE)(_normalize_uncached)
+
+
 def normalize_text(value: str) -> str:
-    normalized = unicodedata.normalize("NFKD", value or "")
-    ascii_value = normalized.encode("ascii", "ignore").decode("ascii")
-    ascii_value = ascii_value.lower()
-    ascii_value = re.sub(r"[^a-z0-9]+", " ", ascii_value)
-    return re.sub(r"\s+", " ", ascii_value).strip()
+    if not value:
+        return ""
+    if len(value) > NORMALIZE_CACHE_MAX_CHARS:
+        return _normalize_uncached(value)
+    return _normalize_cached(value)
 
 
 def first_year(value: str | None) -> str:
@@ -17,7 +17,7 @@ def iter_watch_items(config: AppConfig) -> list[Path]:
     for path in sorted(config.watch_dir.iterdir()):
         if path.name.startswith("."):
             continue
-        if path == config.processed_dir or path == config.other_dir:
+        if path in {config.processed_dir, config.other_dir, config.pending_dir}:
             continue
         if path.is_dir():
             if (path / "iTunesMetadata.plist").exists():
@@ -107,6 +107,39 @@ def resolve_fallback_approval(config: AppConfig, request: ApprovalRequest) -> st
     return mapping.get(result, "skip")
 
 
+def resolve_batch_approval(config: AppConfig, requests: list[ApprovalRequest]) -> str:
+    default_decision = config.approval_policy.default_decision.lower()
+    if default_decision in {"approve", "skip"}:
+        return default_decision
+    if not requests or shutil.which("osascript") is None:
+        return "later"
+
+    lines = "\n".join(
+        f"{request.citekey}: {request.fallback_provider} / {request.fallback_model}, "
+        f"~{request.usage.estimated_total_tokens} tokens"
+        for request in requests[:15]
+    )
+    if len(requests) > 15:
+        lines += f"\n... and {len(requests) - 15} more"
+    total_tokens = sum(request.usage.estimated_total_tokens for request in requests)
+    applescript = f"""
+    set theButton to button returned of (display dialog "Fallback approval required for {len(requests)} sources
+
+    {lines}
+
+    Estimated total tokens: {total_tokens}
+    Daily tokens: {requests[-1].current_daily_tokens} / {requests[-1].max_daily_tokens}
+    " buttons {{"Review Later", "Skip All", "Approve All"}} default button "Approve All" with title "Literature Wiki")
+    return theButton
+    """
+    result = _show_dialog(applescript)
+    mapping = {
+        "Approve All": "approve",
+        "Skip All": "skip",
+    }
+    return mapping.get(result, "later")
+
+
 def show_fallback_complete_dialog(citekey: str, title: str, usage: ProviderUsage) -> None:
     if shutil.which("osascript") is None:
         return
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+import os
 import re
 from datetime import date
 from pathlib import Path
@@ -27,57 +28,100 @@ def _ensure_index(path: Path) -> str:
     )
 
 
-def update_index(config: AppConfig, entry: BibliographyEntry) -> None:
-    index_path = config.wiki_dir / "index.md"
-    content = _ensure_index(index_path)
-    new_line = f"- [{entry.title}](sources/{entry.citekey}_wiki.md) — [@{entry.citekey}]"
+def _source_index_line(entry: BibliographyEntry) -> tuple[str, str, re.Pattern[str]]:
+    line = f"- [{entry.title}](sources/{entry.citekey}_wiki.md) — [@{entry.citekey}]"
     pattern = re.compile(rf"^- \[{re.escape(entry.title)}\]\(sources/{re.escape(entry.citekey)}_wiki\.md\).*$", re.MULTILINE)
-    if pattern.search(content):
-        content = pattern.sub(new_line, content)
-    elif "## Sources\n" in content:
-        content = content.replace("## Sources\n", f"## Sources\n{new_line}\n")
-    else:
-        content += f"\n## Sources\n{new_line}\n"
-    index_path.write_text(content, encoding="utf-8")
+    return "## Sources", line, pattern
 
 
-def update_entity_index(config: AppConfig, person: PersonRecord) -> None:
-    index_path = config.wiki_dir / "index.md"
-    content = _ensure_index(index_path)
+def _entity_index_line(person: PersonRecord) -> tuple[str, str, re.Pattern[str]]:
     line = f"- [{person.display_name}](entities/{person.display_name}.md) — person"
     pattern = re.compile(
         rf"^- \[{re.escape(person.display_name)}\]\(entities/{re.escape(person.display_name)}\.md\).*$",
         re.MULTILINE,
     )
-    if pattern.search(content):
-        content = pattern.sub(line, content)
-    elif "## Entities\n" in content:
-        content = content.replace("## Entities\n", f"## Entities\n{line}\n")
-    else:
-        content += f"\n## Entities\n{line}\n"
-    index_path.write_text(content, encoding="utf-8")
+    return "## Entities", line, pattern
 
 
-def update_concept_index(config: AppConfig, concept_name: str) -> None:
-    index_path = config.wiki_dir / "index.md"
-    content = _ensure_index(index_path)
+def _concept_index_line(concept_name: str) -> tuple[str, str, re.Pattern[str]]:
     line = f"- [{concept_name}](concepts/{concept_name}.md) — concept"
     pattern = re.compile(
         rf"^- \[{re.escape(concept_name)}\]\(concepts/{re.escape(concept_name)}\.md\).*$",
         re.MULTILINE,
     )
+    return "## Concepts", line, pattern
+
+
+def _with_index_line(content: str, heading: str, line: str, pattern: re.Pattern[str]) -> str:
     if pattern.search(content):
-        content = pattern.sub(line, content)
-    elif "## Concepts\n" in content:
-        content = content.replace("## Concepts\n", f"## Concepts\n{line}\n")
-    else:
-        content += f"\n## Concepts\n{line}\n"
+        return pattern.sub(line, content)
+    if f"{heading}\n" in content:
+        return content.replace(f"{heading}\n", f"{heading}\n{line}\n")
+    return content + f"\n{heading}\n{line}\n"
+
+
+def _link_prefix(line: str) -> str:
+    # "- [Name](path)" as matched by the index patterns; the "— kind" suffix may differ.
+    return line[: line.index(")", line.index("](")) + 1]
+
+
+def _with_index_lines(content: str, updates: list[tuple[str, str, re.Pattern[str]]]) -> str:
+    """Equivalent to folding ``_with_index_line`` over ``updates`` without rescanning ``content`` per line."""
+    lines = content.split("\n")
+    existing: dict[str, list[int]] = {}
+    for number, current in enumerate(lines):
+        if current.startswith("- ["):
+            for position, character in enumerate(current):
+                if character == ")":
+                    existing.setdefault(current[: position + 1], []).append(number)
+
+    inserted: dict[str, list[str]] = {}
+    seen: set[str] = set()
+    for heading, line, _pattern in updates:
+        prefix = _link_prefix(line)
+        if prefix in existing:
+            for number in existing[prefix]:
+                lines[number] = line
+        elif prefix not in seen:
+            seen.add(prefix)
+            inserted.setdefault(heading, []).append(line)
+
+    content = "\n".join(lines)
+    for heading, new_lines in inserted.items():
+        marker = f"{heading}\n"
+        if marker not in content:
+            content += f"\n{marker}{new_lines[0]}\n"
+            new_lines = new_lines[1:]
+        if new_lines:
+            content = content.replace(marker, marker + "".join(line + "\n" for line in reversed(new_lines)))
+    return content
+
+
+def _update_index_file(config: AppConfig, heading: str, line: str, pattern: re.Pattern[str]) -> None:
+    index_path = config.wiki_dir / "index.md"
+    content = _with_index_line(_ensure_index(index_path), heading, line, pattern)
     index_path.write_text(content, encoding="utf-8")
 
 
+def update_index(config: AppConfig, entry: BibliographyEntry) -> None:
+    _update_index_file(config, *_source_index_line(entry))
+
+
+def update_entity_index(config: AppConfig, person: PersonRecord) -> None:
+    _update_index_file(config, *_entity_index_line(person))
+
+
+def update_concept_index(config: AppConfig, concept_name: str) -> None:
+    _update_index_file(config, *_concept_index_line(concept_name))
+
+
+def _log_line(entry: BibliographyEntry, action: str) -> str:
+    return f"## [{date.today().isoformat()}] {action} | {entry.title} [@{entry.citekey}]"
+
+
 def update_log(config: AppConfig, entry: BibliographyEntry, action: str = "ingest") -> None:
     log_path = config.wiki_dir / "log.md"
-    prefix = f"## [{date.today().isoformat()}] {action} | {entry.title} [@{entry.citekey}]"
+    prefix = _log_line(entry, action)
     previous = log_path.read_text(encoding="utf-8") if log_path.exists() else ""
     log_path.write_text(prefix + "\n\n" + previous, encoding="utf-8")
 
@@ -109,10 +153,11 @@ def update_overview(config: AppConfig, bibliography: BibliographyIndex) -> None:
     overview_path.write_text("\n".join(content) + "\n", encoding="utf-8")
 
 
-def ensure_person_pages(config: AppConfig, entry: BibliographyEntry) -> None:
+def _write_person_pages(config: AppConfig, entry: BibliographyEntry) -> list[PersonRecord]:
     entities_dir = config.wiki_dir / "entities"
     entities_dir.mkdir(parents=True, exist_ok=True)
-    for person in entry.authors + entry.editors:
+    persons = entry.authors + entry.editors
+    for person in persons:
         page_path = entities_dir / f"{person.display_name}.md"
         if not page_path.exists():
             page_path.write_text(
@@ -134,12 +179,18 @@ def ensure_person_pages(config: AppConfig, entry: BibliographyEntry) -> None:
                 ),
                 encoding="utf-8",
             )
+    return persons
+
+
+def ensure_person_pages(config: AppConfig, entry: BibliographyEntry) -> None:
+    for person in _write_person_pages(config, entry):
         update_entity_index(config, person)
 
 
-def ensure_concept_pages(config: AppConfig, entry: BibliographyEntry, sections: dict[str, object]) -> None:
+def _write_concept_pages(config: AppConfig, entry: BibliographyEntry, sections: dict[str, object]) -> list[str]:
     concepts_dir = config.wiki_dir / "concepts"
     concepts_dir.mkdir(parents=True, exist_ok=True)
+    concept_names: list[str] = []
     for raw_link in sections.get("see_also_links", []):
         concept_name = str(raw_link).strip().replace("[[", "").replace("]]", "")
         if not concept_name or concept_name.startswith("@") or concept_name.endswith("_wiki"):
@@ -165,9 +216,82 @@ def ensure_concept_pages(config: AppConfig, entry: BibliographyEntry, sections:
                 ),
                 encoding="utf-8",
             )
+        concept_names.append(concept_name)
+    return concept_names
+
+
+def ensure_concept_pages(config: AppConfig, entry: BibliographyEntry, sections: dict[str, object]) -> None:
+    for concept_name in _write_concept_pages(config, entry, sections):
         update_concept_index(config, concept_name)
 
 
+class WikiBatch:
+    """Collects the index, log and overview updates of many ingests and writes each file once.
+
+    Entity and concept pages are still created as sources are added; ``apply`` produces the
+    same ``index.md``, ``log.md`` and ``overview.md`` as updating them after every source.
+    Pending updates are also appended to ``config.wiki_batch_file`` so a batch cut short by a
+    crash is replayed by the next one instead of being lost.
+    """
+
+    def __init__(self, config: AppConfig) -> None:
+        self.config = config
+        self.path = config.wiki_batch_file
+        self._index_lines: list[tuple[str, str, re.Pattern[str]]] = []
+        self._log_lines: list[str] = []
+        self._overview_stale = False
+        self._replay()
+
+    def __len__(self) -> int:
+        return len(self._log_lines)
+
+    def _replay(self) -> None:
+        if not self.path.exists():
+            return
+        with self.path.open("r", encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash can leave a torn final line; everything before it is intact.
+                    continue
+                self._index_lines.extend(
+                    (heading, text, re.compile(pattern, re.MULTILINE)) for heading, text, pattern in event["index"]
+                )
+                self._log_lines.append(event["log"])
+                self._overview_stale = True
+
+    def add_source(self, entry: BibliographyEntry, sections: dict[str, object]) -> None:
+        index_lines = [_entity_index_line(person) for person in _write_person_pages(self.config, entry)]
+        index_lines.extend(_concept_index_line(name) for name in _write_concept_pages(self.config, entry, sections))
+        index_lines.append(_source_index_line(entry))
+        log_line = _log_line(entry, "ingest")
+        event = {"index": [[heading, line, pattern.pattern] for heading, line, pattern in index_lines], "log": log_line}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps(event, ensure_ascii=False) + "\n")
+            handle.flush()
+            os.fsync(handle.fileno())
+        self._index_lines.extend(index_lines)
+        self._log_lines.append(log_line)
+        self._overview_stale = True
+
+    def apply(self, bibliography: BibliographyIndex) -> None:
+        index_lines, self._index_lines = self._index_lines, []
+        log_lines, self._log_lines = self._log_lines, []
+        if index_lines:
+            index_path = self.config.wiki_dir / "index.md"
+            index_path.write_text(_with_index_lines(_ensure_index(index_path), index_lines), encoding="utf-8")
+        if log_lines:
+            log_path = self.config.wiki_dir / "log.md"
+            previous = log_path.read_text(encoding="utf-8") if log_path.exists() else ""
+            log_path.write_text("".join(line + "\n\n" for line in reversed(log_lines)) + previous, encoding="utf-8")
+        if self._overview_stale:
+            self._overview_stale = False
+            update_overview(self.config, bibliography)
+        self.path.unlink(missing_ok=True)
+
+
 def build_graph(config: AppConfig) -> tuple[int, int]:
     nodes: list[dict[str, str]] = []
     edges: list[dict[str, str]] = []
@@ -200,7 +324,9 @@ def lint_wiki(config: AppConfig) -> str:
     suspicious_metadata: list[str] = []
     extraction_artifacts: list[str] = []
     id_set = {path.stem for path in config.wiki_dir.rglob("*.md")}
-    bibliography = BibliographyIndex({}) if not config.bibliography_file.exists() else parse_bibliography(config.bibliography_file)
+    bibliography = BibliographyIndex({}) if not config.bibliography_file.exists() else parse_bibliography(
+        config.bibliography_file, config.cache_dir, config.bibliography_parse_workers
+    )
 
     for path in config.wiki_dir.rglob("*"):
         if not path.is_file():
@@ -1,9 +1,28 @@
+import io
+import json
+import os
+import sqlite3
 import tempfile
 import textwrap
 import unittest
+from contextlib import closing, redirect_stdout
 from pathlib import Path
+from unittest import mock
 
-from lit_wiki.bibliography import parse_bibliography
+from pybtex.database.input import bibtex
+
+from lit_wiki import bibliography as bibliography_module
+from lit_wiki.bibfile import DuplicateCitekeyError
+from lit_wiki.bibliography import (
+    BibliographyIndex,
+    parse_bibliography,
+    read_registry_entry,
+    snapshot_path,
+    write_registry,
+)
+from lit_wiki.cli import _run, build_parser
+from lit_wiki.config import load_config
+from lit_wiki.models import BibliographyEntry, BibliographyQuery, PersonRecord
 
 
 class TestBibliographyParsing(unittest.TestCase):
@@ -41,3 +60,342 @@ class TestBibliographyParsing(unittest.TestCase):
             "Chris Curator",
         ])
 
+    def test_streaming_reader_matches_pybtex(self):
+        bib_text = textwrap.dedent(
+            r"""
+            % free text before the first entry
+            @String{ pub = "Ox" # "ford {Press}" }
+            @STRING(series = {Lecture  Notes})
+            @preamble{ "\newcommand{\noop}[1]{}" }
+            @comment{ jabref-meta: ignored }
+            @Article{Fontaine2020-aa,
+              AUTHOR = {Jean de la Fontaine and van der Waals, Jr., J. D. and {Barnes and Noble, Inc.}},
+              Title = "A {Study} of
+                 {\'E}tienne's   work",
+              year = 2020,
+              month = mar,
+              publisher = pub,
+              note = series # " " # {vol. } # 3,
+              keywords = {alpha; Beta;  alpha ; gamma},
+            }
+            @book(Paren2019-bb, title = {Paren (entry)}, editor = "Smith, {John Paul} and Mc{D}onald, R", date = {2019-05})
+            @misc{Empty-cc, title = {}, author = {}}
+            """
+        )
+        expected = bibliography_module._bibliography_entries(bibtex.Parser().parse_string(bib_text))
+        for block_size in (3, 64, 4096):
+            entries = [
+                bibliography_module._record_entry(record)
+                for record in bibliography_module.iter_bibtex_records(io.StringIO(bib_text), block_size)
+            ]
+            self.assertEqual([entry.citekey for entry in entries], list(expected))
+            self.assertEqual([entry.as_dict() for entry in entries], [entry.as_dict() for entry in expected.values()])
+
+        entry = expected["Fontaine2020-aa"]
+        self.assertEqual([person.surname for person in entry.authors], ["Fontaine", "Waals", "{Barnes and Noble, Inc.}"])
+        self.assertEqual(entry.publisher, "Oxford {Press}")
+
+    def test_syntax_errors_fall_back_to_pybtex(self):
+        bib_text = '@article(Quote2020-aa, title = "Closing ) inside quotes", year = 2020)\n'
+        entries = bibliography_module._parse_bibliography_text(bib_text)
+        self.assertEqual(entries["Quote2020-aa"].title, "Closing ) inside quotes")
+
+        with mock.patch.object(bibliography_module, "iter_bibtex_records", side_effect=bibliography_module.BibtexSyntaxError("boom")):
+            entries = bibliography_module._parse_bibliography_text(bib_text)
+        self.assertEqual(list(entries), ["Quote2020-aa"])
+
+    def test_sharded_parse_matches_serial_parse(self):
+        bib_text = "@string{pub = {Shared Press}}\n\n" + "\n\n".join(
+            f"@book{{Key{index:03d}-aa, title = {{Title {index}}}, publisher = pub, author = {{Smith, Alice}}}}"
+            for index in range(40)
+        )
+        with tempfile.TemporaryDirectory() as tmpdir:
+            bib_path = Path(tmpdir) / "regex-tag.bib"
+            bib_path.write_text(bib_text, encoding="utf-8")
+            serial = parse_bibliography(bib_path)
+            with mock.patch.object(bibliography_module, "PARALLEL_MIN_ENTRIES", 1):
+                sharded = parse_bibliography(bib_path, workers=2)
+
+                bib_path.write_text(bib_text + "\n\n@misc{key003-AA, title = {Again}}\n", encoding="utf-8")
+                with self.assertRaises(DuplicateCitekeyError) as raised:
+                    parse_bibliography(bib_path, workers=2)
+            with self.assertRaises(DuplicateCitekeyError):
+                parse_bibliography(bib_path)
+
+        self.assertEqual(
+            [entry.as_dict() for entry in sharded.entries.values()],
+            [entry.as_dict() for entry in serial.entries.values()],
+        )
+        self.assertEqual(sharded.get("Key039-aa").publisher, "Shared Press")
+        self.assertIs(sharded.get("Key000-aa").authors[0], sharded.get("Key039-aa").authors[0])
+        self.assertEqual(raised.exception.citekeys, ["key003-AA"])
+
+    def test_snapshot_is_reused_until_bibliography_changes(self):
+        bib_text = textwrap.dedent(
+            """
+            @ARTICLE{Fickett1996-aa,
+              title = {Finding genes by computer - the state of the art},
+              author = {Fickett, James W},
+              date = {1996}
+            }
+            """
+        )
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            bib_path = root / "regex-tag.bib"
+            bib_path.write_text(bib_text, encoding="utf-8")
+            cache_dir = root / "cache"
+            first = parse_bibliography(bib_path, cache_dir)
+            self.assertTrue(snapshot_path(cache_dir).exists())
+
+            with mock.patch("lit_wiki.bibliography._parse_bibliography_file") as reparse:
+                cached = parse_bibliography(bib_path, cache_dir)
+                os.utime(bib_path, ns=(0, 0))
+                touched = parse_bibliography(bib_path, cache_dir)
+            reparse.assert_not_called()
+            self.assertEqual(list(cached.entries), list(first.entries))
+            self.assertEqual(list(touched.entries), list(first.entries))
+
+            bib_path.write_text(bib_text.replace("Fickett1996-aa", "Fickett1996-bb"), encoding="utf-8")
+            updated = parse_bibliography(bib_path, cache_dir)
+            self.assertEqual(list(updated.entries), ["Fickett1996-bb"])
+
+    def test_incremental_reparse_only_touches_changed_entries(self):
+        bib_text = textwrap.dedent(
+            """
+            @ARTICLE{Fickett1996-aa,
+              title = {Finding genes by computer - the state of the art},
+              author = {Fickett, James W},
+              date = {1996}
+            }
+
+            @BOOK{Daniels2013-pa,
+              title = {Example EPUB Source},
+              author = {Daniels, Harry and Edwards, Anne},
+              date = {2013}
+            }
+            """
+        )
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            bib_path = root / "regex-tag.bib"
+            bib_path.write_text(bib_text, encoding="utf-8")
+            cache_dir = root / "cache"
+            registry_path = cache_dir / "bibliography_registry.sqlite"
+            initial = write_registry(parse_bibliography(bib_path, cache_dir), registry_path)
+            self.assertEqual(initial.added, ["Fickett1996-aa", "Daniels2013-pa"])
+
+            edited = bib_text.replace("Example EPUB Source", "Example EPUB Source, Revised")
+            edited += "\n@MISC{Extra2020-aa,\n  title = {Extra Entry},\n  date = {2020}\n}\n"
+            bib_path.write_text(edited, encoding="utf-8")
+            with mock.patch.object(
+                bibliography_module,
+                "_parse_bibliography_text",
+                wraps=bibliography_module._parse_bibliography_text,
+            ) as parse_text:
+                bibliography = parse_bibliography(bib_path, cache_dir)
+            parsed_text = parse_text.call_args.args[0]
+            self.assertNotIn("Fickett1996-aa", parsed_text)
+            self.assertIn("Daniels2013-pa", parsed_text)
+            self.assertEqual(bibliography.get("Daniels2013-pa").title, "Example EPUB Source, Revised")
+            self.assertEqual(list(bibliography.entries), ["Fickett1996-aa", "Daniels2013-pa", "Extra2020-aa"])
+
+            changes = write_registry(bibliography, registry_path)
+            self.assertEqual(changes.added, ["Extra2020-aa"])
+            self.assertEqual(changes.changed, ["Daniels2013-pa"])
+            self.assertEqual(changes.removed, [])
+            self.assertFalse(write_registry(bibliography, registry_path).has_changes)
+            self.assertEqual(read_registry_entry(registry_path, "Daniels2013-pa")["title"], "Example EPUB Source, Revised")
+
+            bib_path.write_text(edited.replace("@ARTICLE{Fickett1996-aa", "@ARTICLE{Renamed1996-aa"), encoding="utf-8")
+            changes = write_registry(parse_bibliography(bib_path, cache_dir), registry_path)
+            self.assertEqual((changes.added, changes.changed, changes.removed), (["Renamed1996-aa"], [], ["Fickett1996-aa"]))
+            self.assertIsNone(read_registry_entry(registry_path, "Fickett1996-aa"))
+            self.assertEqual(read_registry_entry(registry_path, "Renamed1996-aa")["authors"][0]["surname"], "Fickett")
+
+    def test_incremental_reparse_rejects_citekeys_that_differ_only_in_case(self):
+        bib_text = "@MISC{A1,\n  title = {First},\n  date = {2020}\n}\n"
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            bib_path = root / "regex-tag.bib"
+            bib_path.write_text(bib_text, encoding="utf-8")
+            cache_dir = root / "cache"
+            parse_bibliography(bib_path, cache_dir)
+
+            bib_path.write_text(bib_text + "\n@MISC{a1,\n  title = {Second},\n  date = {2021}\n}\n", encoding="utf-8")
+            with self.assertRaises(DuplicateCitekeyError) as raised:
+                parse_bibliography(bib_path, cache_dir)
+            self.assertEqual(raised.exception.citekeys, ["a1"])
+            with self.assertRaises(DuplicateCitekeyError):
+                parse_bibliography(bib_path)
+
+    def test_macro_edit_changes_entry_digests(self):
+        bib_text = textwrap.dedent(
+            """
+            @STRING{press = {Old Press}}
+
+            @BOOK{Daniels2013-pa,
+              title = {Example EPUB Source},
+              publisher = press,
+              date = {2013}
+            }
+            """
+        )
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            bib_path = root / "regex-tag.bib"
+            bib_path.write_text(bib_text, encoding="utf-8")
+            cache_dir = root / "cache"
+            before = dict(parse_bibliography(bib_path, cache_dir).entry_digests)
+
+            bib_path.write_text(bib_text.replace("Old Press", "New Press"), encoding="utf-8")
+            after = parse_bibliography(bib_path, cache_dir)
+
+            self.assertEqual(after.get("Daniels2013-pa").publisher, "New Press")
+            self.assertNotEqual(after.entry_digests["Daniels2013-pa"], before["Daniels2013-pa"])
+
+    def test_registry_tracks_positions_and_macro_edits(self):
+        bib_text = textwrap.dedent(
+            """
+            @STRING{press = {Old Press}}
+
+            @BOOK{Daniels2013-pa,
+              title = {Example EPUB Source},
+              publisher = press,
+              date = {2013}
+            }
+
+            @ARTICLE{Fickett1996-aa,
+              title = {Finding genes by computer - the state of the art},
+              date = {1996}
+            }
+            """
+        )
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            bib_path = root / "regex-tag.bib"
+            bib_path.write_text(bib_text, encoding="utf-8")
+            cache_dir = root / "cache"
+            registry_path = cache_dir / "bibliography_registry.sqlite"
+            self.assertIsNone(read_registry_entry(registry_path, "Daniels2013-pa"))
+            initial = write_registry(parse_bibliography(bib_path, cache_dir), registry_path)
+            self.assertEqual((initial.added, initial.changed, initial.removed), (["Daniels2013-pa", "Fickett1996-aa"], [], []))
+
+            bib_path.write_text(bib_text.replace("Old Press", "New Press"), encoding="utf-8")
+            changes = write_registry(parse_bibliography(bib_path, cache_dir), registry_path)
+            self.assertEqual((changes.added, changes.changed, changes.removed), ([], ["Daniels2013-pa"], []))
+            self.assertEqual(read_registry_entry(registry_path, "Daniels2013-pa")["publisher"], "New Press")
+            self.assertIsNone(read_registry_entry(registry_path, "Missing2000-aa"))
+
+            book, article = bib_text.replace("Old Press", "New Press").split("@ARTICLE")
+            macro, book = book.split("@BOOK")
+            bib_path.write_text(f"{macro}@ARTICLE{article}\n@BOOK{book}", encoding="utf-8")
+            bibliography = parse_bibliography(bib_path, cache_dir)
+            self.assertEqual(list(bibliography.entries), ["Fickett1996-aa", "Daniels2013-pa"])
+            changes = write_registry(bibliography, registry_path)
+            self.assertEqual((changes.added, changes.changed, changes.removed), ([], [], []))
+            with closing(sqlite3.connect(registry_path)) as connection:
+                positions = dict(connection.execute("SELECT citekey, position FROM entries"))
+            self.assertEqual(positions, {"Fickett1996-aa": 0, "Daniels2013-pa": 1})
+            self.assertFalse(write_registry(bibliography, registry_path).has_changes)
+
+    def test_bib_show_prints_the_registry_entry(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            (root / "regex-tag.bib").write_text(
+                "@STRING{press = {Old Press}}\n\n@BOOK{Daniels2013-pa,\n  title = {Example},\n  publisher = press,\n  date = {2013}\n}\n",
+                encoding="utf-8",
+            )
+            config = load_config(root)
+            parser = build_parser()
+            outputs = []
+            for argv in (["bib", "sync"], ["bib", "show", "--citekey", "Daniels2013-pa"], ["bib", "show", "--citekey", "Missing2000-aa"]):
+                stdout = io.StringIO()
+                with redirect_stdout(stdout):
+                    outputs.append((_run(parser, parser.parse_args(argv), config), stdout.getvalue()))
+
+            self.assertEqual(outputs[1][0], 0)
+            self.assertEqual(json.loads(outputs[1][1])["publisher"], "Old Press")
+            self.assertEqual(outputs[2][0], 1)
+            self.assertIn("Missing2000-aa is not in", outputs[2][1])
+
+    def test_surname_and_coauthor_indexes(self):
+        entries = {
+            "Smith2020-aa": BibliographyEntry(
+                citekey="Smith2020-aa",
+                title="Second",
+                entry_type="article",
+                year="2020",
+                date="2020",
+                abstract="",
+                keywords=[],
+                authors=[PersonRecord("Alice Smith", "[[Alice Smith]]", "Smith"), PersonRecord("Bob Brown", "[[Bob Brown]]", "Brown")],
+            ),
+            "Smith2010-aa": BibliographyEntry(
+                citekey="Smith2010-aa",
+                title="First",
+                entry_type="article",
+                year="2010",
+                date="2010",
+                abstract="",
+                keywords=[],
+                authors=[PersonRecord("Alice Smith", "[[Alice Smith]]", "Smith")],
+            ),
+            "Other2015-aa": BibliographyEntry(
+                citekey="Other2015-aa",
+                title="Unrelated",
+                entry_type="book",
+                year="2015",
+                date="2015",
+                abstract="",
+                keywords=[],
+                authors=[PersonRecord("Carol Other", "[[Carol Other]]", "Other")],
+            ),
+        }
+        bibliography = BibliographyIndex(entries)
+        self.assertEqual([entry.citekey for entry in bibliography.same_author_entries("Smith2020-aa")], ["Smith2010-aa"])
+        self.assertEqual(bibliography.coauthors("Smith"), [("brown", 1)])
+
+        bibliography.remove("Smith2020-aa")
+        self.assertEqual(bibliography.coauthors("Smith"), [])
+        self.assertEqual([entry.citekey for entry in bibliography.entries_by_surname("SMITH")], ["Smith2010-aa"])
+
+    def test_query_combines_facet_indexes(self):
+        def entry(citekey: str, entry_type: str, year: str, keywords: list[str], **fields: str) -> BibliographyEntry:
+            return BibliographyEntry(
+                citekey=citekey,
+                title=citekey,
+                entry_type=entry_type,
+                year=year,
+                date=year,
+                abstract="",
+                keywords=keywords,
+                **fields,
+            )
+
+        bibliography = BibliographyIndex(
+            {
+                "Bim2016-aa": entry("Bim2016-aa", "article", "2016", ["BIM", "Learning"], journaltitle="Automation in Construction"),
+                "Bim2012-aa": entry("Bim2012-aa", "article", "2012", ["BIM"]),
+                "Book2018-aa": entry("Book2018-aa", "book", "2018", ["bim"], publisher="Routledge", isbn="978-0-415-12345-6"),
+                "Undated-aa": entry("Undated-aa", "misc", "", ["BIM"]),
+            }
+        )
+
+        def citekeys(**criteria) -> list[str]:
+            return [item.citekey for item in bibliography.query(BibliographyQuery(**criteria))]
+
+        self.assertEqual(citekeys(year_from=2015, year_to=2020, keywords=["BIM"], entry_types=["article"]), ["Bim2016-aa"])
+        self.assertEqual(citekeys(keywords=["BIM"]), ["Bim2016-aa", "Bim2012-aa", "Book2018-aa", "Undated-aa"])
+        self.assertEqual(citekeys(year_to=2016), ["Bim2016-aa", "Bim2012-aa"])
+        self.assertEqual(citekeys(entry_types=["Book", "misc"]), ["Book2018-aa", "Undated-aa"])
+        self.assertEqual(citekeys(journaltitle="automation in construction"), ["Bim2016-aa"])
+        self.assertEqual(citekeys(publisher="ROUTLEDGE", isbn="9780415123456"), ["Book2018-aa"])
+        self.assertEqual(citekeys(keywords=["BIM", "Learning"]), ["Bim2016-aa"])
+        self.assertEqual(citekeys(keywords=["BIM"], limit=2), ["Bim2016-aa", "Bim2012-aa"])
+
+        bibliography.upsert(entry("Bim2016-aa", "inproceedings", "2016", ["Learning"]))
+        bibliography.remove("Bim2012-aa")
+        self.assertEqual(citekeys(keywords=["BIM"], entry_types=["article"]), [])
+        self.assertEqual(citekeys(year_from=2010), ["Bim2016-aa", "Book2018-aa"])
+        self.assertNotIn("article", bibliography.facet_index["entry_type"])
@@ -54,3 +54,18 @@ class TestConfigResolution(unittest.TestCase):
         self.assertEqual(config.fallback_providers[0].model, "gpt-5.4")
         self.assertEqual(config.fallback_providers[1].backend, "gemini")
         self.assertEqual(config.fallback_providers[1].model, "gemini-3-flash-preview")
+
+    def test_artifact_patterns_are_validated(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            (root / "config.yaml").write_text(
+                'artifact_patterns:\n  boilerplate: ["^page \\\\d+ of \\\\d+$"]\n  contamination: ["draft only"]\n',
+                encoding="utf-8",
+            )
+            config = load_config(root)
+            self.assertEqual(config.artifact_patterns.boilerplate, [r"^page \d+ of \d+$"])
+            self.assertEqual(config.artifact_patterns.contamination, ["draft only"])
+
+            (root / "config.yaml").write_text('artifact_patterns:\n  boilerplate: ["(unclosed"]\n', encoding="utf-8")
+            with self.assertRaisesRegex(ValueError, "artifact_patterns.boilerplate"):
+                load_config(root)
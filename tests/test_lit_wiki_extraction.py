@@ -1,6 +1,65 @@
+import os
+import re
+import tempfile
 import unittest
+from dataclasses import replace
+from pathlib import Path
+from unittest import mock
 
-from lit_wiki.extraction import _clean_extracted_text
+from lit_wiki import extraction, pdf_backends, scanner
+from lit_wiki.extraction import (
+    EXTRACTOR_VERSION,
+    _clean_extracted_text,
+    _extract_pdf_text,
+    evict_extraction_cache,
+    extract_to_file,
+    extract_to_markdown,
+    extraction_cache_path,
+    iter_clean_text,
+)
+from lit_wiki.models import PdfBackendScore
+from lit_wiki.pdf_backends import (
+    PdfBackend,
+    _pdf_page_ranges,
+    calibrate_pdf_backends,
+    has_text_layer,
+    load_pdf_calibration,
+    pdf_calibration_digest,
+    plan_pdf_backends,
+    save_pdf_calibration,
+)
+from lit_wiki.scanner import (
+    CONTROL_CHARS_RE,
+    DEFAULT_BOILERPLATE_PATTERNS,
+    PatternScanner,
+    boilerplate_scanner,
+    contamination_scanner,
+)
+from lit_wiki.utils import file_sha256
+
+CLEANING_FIXTURES = Path(__file__).parent / "fixtures" / "cleaning"
+
+
+def _text_pdf(pages: list[str]) -> bytes:
+    objects = [b"", b"", b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for text in pages:
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects))
+        page_ids.append(len(objects))
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (" ".join(f"{page} 0 R" for page in page_ids).encode(), len(page_ids))
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    output += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(output)
 
 
 class TestExtractionCleanup(unittest.TestCase):
@@ -19,3 +78,289 @@ class TestExtractionCleanup(unittest.TestCase):
         self.assertNotIn("All use subject to https://about.jstor.org/terms", cleaned)
         self.assertIn("On Two Metaphors for Learning", cleaned)
         self.assertIn("The article text remains.", cleaned)
+
+    def test_streamed_blocks_match_whole_text_cleaning(self):
+        raw = (
+            "\n\nStable URL: https://www.jstor.org/stable/1\r\n"
+            "Learning in the work-\nplace and in   com-\r\nmunities of prac\u00adtice.\n"
+            "\n\n\n&amp; caf\u00c3\u00a9 <b>bold</b> &amp;\x0c\n"
+            "https://example.org/skip\n"
+            "Last -\nline\t\twith   tabs.   \n\n\n"
+        ) * 40
+        expected = _clean_extracted_text(raw)
+        with mock.patch.object(extraction, "CLEAN_BLOCK_CHARS", 7):
+            for size in (1, 3, 50, 1000):
+                chunks = [raw[start:start + size] for start in range(0, len(raw), size)]
+                self.assertEqual("".join(iter_clean_text(chunks)), expected)
+        self.assertIn("workplace", expected)
+        self.assertIn("communities of practice.", expected)
+        self.assertNotIn("example.org", expected)
+
+    def test_extract_to_file_streams_the_cleaned_text(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            source = root / "source.md"
+            body = "".join(f"Paragraph {number} line one\nline two.\n\n" for number in range(2000))
+            source.write_text(f"---\ncitation-key: A\n---\n{body}", encoding="utf-8")
+
+            with mock.patch.object(extraction, "CLEAN_BLOCK_CHARS", 1024):
+                text = extract_to_file(source, root / "extracted" / "A.md")
+
+            self.assertEqual(text, _clean_extracted_text(body))
+            self.assertEqual((root / "extracted" / "A.md").read_text(encoding="utf-8"), text)
+            self.assertEqual(list((root / "extracted").iterdir()), [root / "extracted" / "A.md"])
+
+
+class TestCleaningGoldenOutput(unittest.TestCase):
+    def test_samples_match_recorded_output(self):
+        # Raw .txt samples keep their CR line endings, so they are decoded from bytes.
+        samples = sorted(path for path in CLEANING_FIXTURES.iterdir() if path.is_file())
+        self.assertGreaterEqual(len(samples), 5)
+        for source in samples:
+            with self.subTest(sample=source.name):
+                if source.suffix == ".txt":
+                    cleaned = _clean_extracted_text(source.read_bytes().decode("utf-8"))
+                else:
+                    cleaned = extract_to_markdown(source)
+                expected = (CLEANING_FIXTURES / "expected" / f"{source.stem}.md").read_text(encoding="utf-8")
+                self.assertEqual(cleaned, expected)
+
+    def test_ftfy_runs_once_and_only_on_lines_that_need_it(self):
+        raw = "Plain ASCII line.\nCaf\u00c3\u00a9 needs fixing.\nAnother plain line.\n"
+        with mock.patch.object(extraction, "fix_text", wraps=extraction.fix_text) as fix:
+            cleaned = _clean_extracted_text(raw)
+        self.assertEqual(cleaned, "Plain ASCII line. Café needs fixing. Another plain line.")
+        self.assertEqual([call.args[0] for call in fix.call_args_list], ["Caf\u00c3\u00a9 needs fixing."])
+
+
+class TestPatternScanner(unittest.TestCase):
+    def test_dropped_lines_match_a_search_per_pattern(self):
+        # Dotless i, long s and the Kelvin sign match ASCII letters under IGNORECASE.
+        patterns = DEFAULT_BOILERPLATE_PATTERNS + (r"kiss\s+me", r"^\d+ pages?$", r"ABC(?-i:DEF)")
+        lines = [
+            "JSTOR is a not-for-profit service that helps",
+            "j\u017ftor is a not-for-profit service",
+            "\u212aISS   ME",
+            "k\u0131ss me",
+            "12 PAGES",
+            "abcDEF",
+            "abcdef",
+            "",
+            "HTTPS://example.org",
+            "https://example.org",
+            "Downloaded from 1.2.3.4 on Thu, 09 Apr 2026 UTC",
+            "\u0130stanbul in the text.",
+        ]
+        compiled = [re.compile(pattern, re.IGNORECASE | re.MULTILINE) for pattern in patterns]
+        expected = [line for line in lines if not line or not any(pattern.search(line) for pattern in compiled)]
+        self.assertEqual(PatternScanner(patterns).drop_matching_lines(lines), expected)
+        self.assertEqual(expected, ["abcdef", "", "HTTPS://example.org", "\u0130stanbul in the text."])
+
+    def test_literal_scan_finds_overlapping_and_nested_literals(self):
+        # "jstorus" holds "jstor" and "torus" overlapping; "abcdez" holds "abc" at the same start.
+        patterns = (r"jstor\d", r"torus$", r"abcdez$", r"^abc")
+        lines = ["jstorus", "abcdez and more", "plain text"]
+        expected = ["plain text"]
+        self.assertEqual(PatternScanner(patterns).drop_matching_lines(lines), expected)
+        self.assertTrue(PatternScanner(patterns).search("one\nabcdez and more"))
+        with mock.patch.object(scanner, "sre_parse", None):
+            self.assertEqual(scanner.required_literal(r"jstor\d"), "")
+            self.assertEqual(PatternScanner(patterns).drop_matching_lines(lines), expected)
+
+    def test_custom_boilerplate_changes_text_and_cache_key(self):
+        raw = "Page 3 of 40\nThe article text remains.\n"
+        cleaned = _clean_extracted_text(raw, boilerplate_scanner((r"^page \d+ of \d+$",)))
+        self.assertEqual(cleaned, "The article text remains.")
+        self.assertEqual(_clean_extracted_text(raw), "Page 3 of 40 The article text remains.")
+        cache_dir = Path("cache")
+        self.assertNotEqual(extraction_cache_path(cache_dir, "abc", ["^page"]), extraction_cache_path(cache_dir, "abc"))
+
+    def test_publish_checks_read_the_whole_document(self):
+        text = "Clean paragraph.\n\nAnother one.\n\nThis Content Downloaded From 1.2.3.4"
+        self.assertTrue(contamination_scanner().search(text))
+        self.assertFalse(contamination_scanner().search("Clean paragraph."))
+        self.assertTrue(contamination_scanner((r"draft only",)).search("A DRAFT ONLY copy."))
+        self.assertIsNotNone(CONTROL_CHARS_RE.search("tab\tand\x0cform feed"))
+        self.assertIsNone(CONTROL_CHARS_RE.search("tab\tnewline\ncarriage\r"))
+
+
+class TestExtractionCache(unittest.TestCase):
+    def test_unchanged_source_is_linked_from_cache(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            source = root / "source.md"
+            source.write_text("---\ncitation-key: A\n---\nCached body text.", encoding="utf-8")
+            raw_hash = file_sha256(source)
+            cache_dir = root / "cache" / "extraction"
+
+            first = extract_to_file(source, root / "extracted" / "A.md", raw_hash, cache_dir, 2**20)
+            with mock.patch.object(extraction, "iter_extracted_text", side_effect=AssertionError("re-extracted")):
+                second = extract_to_file(source, root / "extracted" / "B.md", raw_hash, cache_dir, 2**20)
+
+            cached = extraction_cache_path(cache_dir, raw_hash)
+            self.assertEqual(cached.name, f"{raw_hash}-{EXTRACTOR_VERSION}.md")
+            self.assertEqual(first, "Cached body text.")
+            self.assertEqual(second, first)
+            self.assertEqual((root / "extracted" / "B.md").read_text(encoding="utf-8"), first)
+            self.assertTrue(os.path.samefile(cached, root / "extracted" / "B.md"))
+
+            (root / "extracted" / "B.md").unlink()
+            self.assertEqual(cached.read_text(encoding="utf-8"), first)
+
+    def test_eviction_removes_least_recently_used_entries(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache_dir = Path(tmpdir)
+            for number, name in enumerate(["old", "middle", "new"]):
+                entry = cache_dir / f"{name}-{EXTRACTOR_VERSION}.md"
+                entry.write_text("x" * 100, encoding="utf-8")
+                os.utime(entry, ns=(number * 10**9, number * 10**9))
+
+            evicted = evict_extraction_cache(cache_dir, 250)
+
+            self.assertEqual([path.name for path in evicted], [f"old-{EXTRACTOR_VERSION}.md"])
+            self.assertEqual(sorted(path.name for path in cache_dir.iterdir()), [f"middle-{EXTRACTOR_VERSION}.md", f"new-{EXTRACTOR_VERSION}.md"])
+
+
+class TestParallelPdfExtraction(unittest.TestCase):
+    def test_page_ranges_cover_every_page_once(self):
+        ranges = _pdf_page_ranges(1000, 4)
+        self.assertEqual(ranges[0][0], 0)
+        self.assertEqual(ranges[-1][1], 1000)
+        self.assertTrue(all(left[1] == right[0] for left, right in zip(ranges, ranges[1:])))
+        self.assertEqual(_pdf_page_ranges(10, 4), [(0, 10)])
+
+    def test_parallel_extraction_preserves_page_order(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = Path(tmpdir) / "book.pdf"
+            source.write_bytes(_text_pdf([f"Page {number} of the book" for number in range(1, 8)] + [""]))
+            with mock.patch.object(pdf_backends, "PDF_MIN_PAGES_PER_TASK", 2):
+                serial = _extract_pdf_text(source, workers=1)
+                parallel = _extract_pdf_text(source, workers=3)
+            self.assertEqual(parallel, serial)
+            self.assertEqual(serial.split(), " ".join(f"Page {number} of the book" for number in range(1, 8)).split())
+
+
+
+def _fake_backend(name: str, text: str) -> PdfBackend:
+    return PdfBackend(name, lambda path, workers=1: [text], lambda: True)
+
+
+class TestPdfBackends(unittest.TestCase):
+    def test_text_layer_is_detected_from_page_fonts(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            text_pdf = Path(tmpdir) / "text.pdf"
+            scanned_pdf = Path(tmpdir) / "scanned.pdf"
+            text_pdf.write_bytes(_text_pdf(["Some words"]))
+            scanned_pdf.write_bytes(_text_pdf(["Some words"]).replace(b"/Resources << /Font << /F1 3 0 R >> >> ", b""))
+            self.assertTrue(has_text_layer(text_pdf))
+            self.assertFalse(has_text_layer(scanned_pdf))
+
+    def test_plan_picks_quality_for_small_files_and_speed_for_large_ones(self):
+        backends = {name: _fake_backend(name, "") for name in ("pypdf", "pdftotext", "pdfminer")}
+        calibration = {
+            "pypdf": PdfBackendScore("pypdf", 2, 1.0, 4_000_000, 50.0, 0.90),
+            "pdftotext": PdfBackendScore("pdftotext", 2, 0.2, 20_000_000, 250.0, 0.92),
+            "pdfminer": PdfBackendScore("pdfminer", 2, 4.0, 1_000_000, 12.0, 0.95),
+        }
+        with tempfile.TemporaryDirectory() as tmpdir:
+            small = Path(tmpdir) / "small.pdf"
+            small.write_bytes(_text_pdf(["Some words"]))
+            large = Path(tmpdir) / "large.pdf"
+            large.write_bytes(_text_pdf(["Some words"]) + b" " * 4096)
+            with mock.patch.dict(pdf_backends.PDF_BACKENDS, backends, clear=True), mock.patch.object(
+                pdf_backends, "PDF_LARGE_FILE_BYTES", 4096
+            ):
+                self.assertEqual(plan_pdf_backends(small), ["pypdf", "pdftotext", "pdfminer"])
+                self.assertEqual(plan_pdf_backends(small, calibration)[0], "pdfminer")
+                self.assertEqual(plan_pdf_backends(large, calibration)[0], "pdftotext")
+                self.assertEqual(plan_pdf_backends(small, calibration, "pypdf")[0], "pypdf")
+
+    def test_calibration_scores_text_and_extraction_uses_the_pick(self):
+        clean = "The article text remains readable on every page of the sample."
+        backends = {
+            "pypdf": _fake_backend("pypdf", clean.replace(" ", "")),
+            "pdfminer": _fake_backend("pdfminer", clean),
+        }
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            source = root / "paper.pdf"
+            source.write_bytes(_text_pdf(["Some words"]))
+            with mock.patch.dict(pdf_backends.PDF_BACKENDS, backends, clear=True):
+                scores = calibrate_pdf_backends([source])
+                calibration_file = root / "pdf_backends.json"
+                save_pdf_calibration(calibration_file, scores, "2026-01-01T00:00:00+00:00")
+                calibration = load_pdf_calibration(calibration_file)
+                output = root / "extracted" / "A.md"
+                text = extract_to_file(source, output, "abc", root / "cache", 2**20, pdf_calibration_file=calibration_file)
+                auto_entry = extraction_cache_path(
+                    root / "cache", "abc", pdf_backend=f"auto-{pdf_calibration_digest(calibration_file)}"
+                )
+
+                # A new calibration that prefers pypdf takes effect for the already cached file.
+                save_pdf_calibration(calibration_file, [replace(score, quality=1 - score.quality) for score in scores], "later")
+                recalibrated = extract_to_file(source, output, "abc", root / "cache", 2**20, pdf_calibration_file=calibration_file)
+
+            self.assertEqual(calibration["pdfminer"].quality, 1.0)
+            self.assertLess(calibration["pypdf"].quality, 0.2)
+            self.assertEqual(text, clean)
+            self.assertTrue(os.path.samefile(extraction_cache_path(root / "cache", "abc", pdf_backend="pdfminer"), auto_entry))
+            self.assertEqual(recalibrated, clean.replace(" ", ""))
+
+    def test_pdf_pages_are_pulled_as_the_text_is_written(self):
+        page_text = "\n".join(["A line of page text."] * (extraction.CLEAN_BLOCK_CHARS // 10))
+        pulled: list[int] = []
+
+        def pages(path, workers=1):
+            for number in range(4):
+                pulled.append(number)
+                yield page_text
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = Path(tmpdir) / "paper.pdf"
+            source.write_bytes(_text_pdf(["Some words"]))
+            with mock.patch.dict(pdf_backends.PDF_BACKENDS, {"pypdf": PdfBackend("pypdf", pages, lambda: True)}, clear=True):
+                blocks, backend = extraction.iter_extracted_text(source, pdf_backends=["pypdf"])
+                first = next(blocks)
+                pulled_before_rest = len(pulled)
+                text = first + "".join(blocks)
+
+        self.assertEqual(backend, "pypdf")
+        self.assertLess(pulled_before_rest, 4)
+        self.assertEqual(text, _clean_extracted_text("\n\n".join([page_text] * 4)))
+
+    def test_failing_backend_falls_through_to_the_next(self):
+        def broken(path, workers=1):
+            raise RuntimeError("pdftotext failed")
+
+        backends = {
+            "pdftotext": PdfBackend("pdftotext", broken, lambda: True),
+            "pypdf": _fake_backend("pypdf", "Text from the fallback."),
+        }
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = Path(tmpdir) / "paper.pdf"
+            source.write_bytes(_text_pdf(["Some words"]))
+            with mock.patch.dict(pdf_backends.PDF_BACKENDS, backends, clear=True):
+                self.assertEqual(extract_to_markdown(source, pdf_backends=["pdftotext", "pypdf"]), "Text from the fallback.")
+                with self.assertRaisesRegex(RuntimeError, "pdftotext: pdftotext failed"):
+                    extract_to_markdown(source, pdf_backends=["pdftotext"])
+
+    def test_cache_is_keyed_on_the_backend_that_produced_the_text(self):
+        backends = {
+            "pdfminer": _fake_backend("pdfminer", ""),
+            "pypdf": _fake_backend("pypdf", "Text only pypdf finds."),
+        }
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            source = root / "paper.pdf"
+            source.write_bytes(_text_pdf(["Some words"]))
+            cache_dir = root / "cache"
+            with mock.patch.dict(pdf_backends.PDF_BACKENDS, backends, clear=True):
+                first = extract_to_file(source, root / "A.md", "abc", cache_dir, 2**20, pdf_backend="pdfminer")
+                with mock.patch.object(extraction, "plan_pdf_backends", side_effect=AssertionError("planned")):
+                    second = extract_to_file(source, root / "B.md", "abc", cache_dir, 2**20, pdf_backend="pdfminer")
+
+            self.assertEqual(first, "Text only pypdf finds.")
+            self.assertEqual(second, first)
+            produced = extraction_cache_path(cache_dir, "abc", pdf_backend="pypdf")
+            self.assertEqual(produced.read_text(encoding="utf-8"), first)
+            self.assertTrue(os.path.samefile(produced, extraction_cache_path(cache_dir, "abc", pdf_backend="pdfminer")))
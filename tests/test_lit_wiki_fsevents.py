@@ -0,0 +1,53 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from lit_wiki.fsevents import InotifyWatcher, PollingWatcher, SettleTracker, open_watcher
+
+
+class TestSettleTracker(unittest.TestCase):
+    def test_reports_a_path_once_its_size_stops_changing(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            now = [0.0]
+            tracker = SettleTracker(settle_seconds=2.0, clock=lambda: now[0])
+            path = Path(tmpdir) / "arriving.pdf"
+            path.write_bytes(b"%PDF-1.4 partial")
+
+            self.assertEqual(tracker.ready([path]), [])
+            now[0] = 1.5
+            with path.open("ab") as handle:
+                handle.write(b" more bytes")
+            self.assertEqual(tracker.ready([path]), [])
+            self.assertEqual(tracker.next_deadline(), 2.0)
+            now[0] = 3.0
+            self.assertEqual(tracker.ready([path]), [])
+            now[0] = 3.5
+            self.assertEqual(tracker.ready([path]), [path])
+
+            self.assertEqual(tracker.ready([]), [])
+            self.assertIsNone(tracker.next_deadline())
+
+
+class TestWatchers(unittest.TestCase):
+    @unittest.skipUnless(sys.platform.startswith("linux"), "inotify is Linux only")
+    def test_inotify_reports_new_files(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            directory = Path(tmpdir)
+            watcher = open_watcher([directory])
+            try:
+                self.assertIsInstance(watcher, InotifyWatcher)
+                self.assertEqual(watcher.wait(0.01), set())
+                (directory / "new.md").write_text("text", encoding="utf-8")
+                self.assertIn(directory / "new.md", watcher.wait(1.0))
+            finally:
+                watcher.close()
+
+    def test_polling_watcher_waits_at_most_its_interval(self):
+        watcher = PollingWatcher([], interval=0.01)
+        self.assertEqual(watcher.wait(5.0), set())
+        watcher.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
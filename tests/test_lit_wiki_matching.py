@@ -76,3 +76,19 @@ class TestDeterministicMatching(unittest.TestCase):
         self.assertEqual(result.citekey, "Daniels2013-pa")
         self.assertFalse(result.needs_review)
 
+
+    def test_matches_truncated_pdf_title_through_fuzzy_index(self):
+        pdf_path = self.root / "Finding genes by computer_Fickett_1996.pdf"
+        pdf_path.write_bytes(b"%PDF-1.4 test")
+        result = match_source(pdf_path, self.bibliography)
+        self.assertEqual(result.citekey, "Fickett1996-aa")
+        self.assertIn("fuzzy title", result.reason)
+        self.assertFalse(result.needs_review)
+
+    def test_fuzzy_pdf_match_with_wrong_year_needs_review(self):
+        pdf_path = self.root / "Finding genes by computr - state of the art_Fickett_2001.pdf"
+        pdf_path.write_bytes(b"%PDF-1.4 test")
+        result = match_source(pdf_path, self.bibliography)
+        self.assertEqual(result.citekey, "Fickett1996-aa")
+        self.assertTrue(result.needs_review)
+        self.assertLess(result.confidence, 0.9)
@@ -0,0 +1,68 @@
+import json
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from lit_wiki.metrics import enable_metrics, read_metrics, span, submit_with_context, summarize_metrics
+
+
+class TestMetrics(unittest.TestCase):
+    def tearDown(self):
+        enable_metrics(None)
+
+    def test_spans_inherit_labels_and_append_json_lines(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "metrics.jsonl"
+            enable_metrics(path)
+            with span("extract", citekey="Doe2020-aa", format="pdf"):
+                with span("extract.clean"):
+                    pass
+            with span("bibliography.load"):
+                pass
+            enable_metrics(None)
+
+            events = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+            self.assertEqual([event["stage"] for event in events], ["extract.clean", "extract", "bibliography.load"])
+            self.assertEqual(events[0]["format"], "pdf")
+            self.assertEqual(events[0]["citekey"], "Doe2020-aa")
+            self.assertNotIn("format", events[2])
+
+    def test_thread_pool_work_keeps_the_caller_labels(self):
+        def generate():
+            with span("generate.llm", provider="local"):
+                pass
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "metrics.jsonl"
+            enable_metrics(path)
+            with ThreadPoolExecutor(max_workers=1) as pool, span("generate", citekey="Doe2020-aa", format="pdf"):
+                submit_with_context(pool, generate).result()
+            enable_metrics(None)
+
+            event = json.loads(path.read_text(encoding="utf-8").splitlines()[0])
+            self.assertEqual(event["stage"], "generate.llm")
+            self.assertEqual((event["citekey"], event["format"], event["provider"]), ("Doe2020-aa", "pdf", "local"))
+
+    def test_disabled_metrics_write_nothing(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            enable_metrics(None)
+            with span("extract"):
+                pass
+            self.assertEqual(read_metrics(Path(tmpdir) / "metrics.jsonl"), [])
+
+    def test_summary_reports_nearest_rank_percentiles_per_stage_and_format(self):
+        events = [{"stage": "extract", "format": "pdf", "seconds": float(value), "at": 0.0} for value in range(1, 21)]
+        events.append({"stage": "extract", "format": "markdown", "seconds": 0.5, "at": 0.0})
+
+        by_format = {(item.stage, item.source_format): item for item in summarize_metrics(events)}
+        pdf = by_format[("extract", "pdf")]
+        self.assertEqual((pdf.count, pdf.p50_seconds, pdf.p95_seconds, pdf.total_seconds), (20, 10.0, 19.0, 210.0))
+        self.assertEqual(by_format[("extract", "markdown")].count, 1)
+
+        combined = summarize_metrics(events, by_format=False)
+        self.assertEqual([(item.stage, item.source_format, item.count) for item in combined], [("extract", "", 21)])
+
+
+if __name__ == "__main__":
+    unittest.main()
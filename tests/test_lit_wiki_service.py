@@ -1,11 +1,32 @@
+import json
 import tempfile
 import textwrap
+import threading
+import time
 import unittest
 from pathlib import Path
+from unittest import mock
 
+from lit_wiki import providers, service
+from lit_wiki.bibfile import DuplicateCitekeyError
 from lit_wiki.config import load_config
+from lit_wiki.journal import WatchJournal
+from lit_wiki.models import ApprovalRequest, GenerationOutcome, IngestJob, PendingApproval, ProviderUsage, SourceRecord
 from lit_wiki.registry import SourceRegistry
-from lit_wiki.service import extract_source, ingest_source, process_watch_folder, register_source, run_lint, sync_bibliography
+from lit_wiki.session import PipelineSession
+from lit_wiki.service import (
+    InvalidPendingApproval,
+    extract_source,
+    ingest_batch,
+    ingest_source,
+    list_pending_approvals,
+    process_watch_folder,
+    register_source,
+    review_pending_approvals,
+    run_lint,
+    serve_watch_folder,
+    sync_bibliography,
+)
 
 
 class TestServiceWorkflow(unittest.TestCase):
@@ -66,6 +87,76 @@ class TestServiceWorkflow(unittest.TestCase):
             self.assertIn('type: "[[@article]]"', note_text)
             self.assertTrue((root / "wiki" / "index.md").exists())
 
+    def test_session_defers_registry_writes_until_flush(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            self._write_template(root)
+            self._write_basic_bib(root)
+            source_path = root / "input.md"
+            source_path.write_text("---\ncitation-key: Fickett1996-aa\n---\nFinding genes by computer.", encoding="utf-8")
+            config = load_config(root)
+
+            session = PipelineSession(config)
+            sync_bibliography(config, session)
+            register_source(config, source_path, session=session)
+            extract_source(config, "Fickett1996-aa", session=session)
+            ingest_source(config, "Fickett1996-aa", session=session)
+            self.assertIsNone(SourceRegistry.load(config.registry_file).get("Fickett1996-aa"))
+
+            session.flush()
+            record = SourceRegistry.load(config.registry_file).get("Fickett1996-aa")
+            assert record is not None
+            self.assertEqual(record.processing_state, "ingested")
+            self.assertTrue(record.registered_at)
+
+    def test_failed_bibliography_resync_keeps_the_loaded_index(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            self._write_basic_bib(root)
+            config = load_config(root)
+            session = PipelineSession(config)
+            loaded, _changes = session.sync_bibliography()
+
+            bib_path = root / "regex-tag.bib"
+            bib_path.write_text(bib_path.read_text(encoding="utf-8") * 2, encoding="utf-8")
+            with self.assertRaises(DuplicateCitekeyError):
+                session.sync_bibliography()
+            with mock.patch("lit_wiki.session.parse_bibliography", side_effect=AssertionError("re-parsed")):
+                self.assertIs(session.bibliography, loaded)
+            self.assertIsNotNone(session.bibliography.get("Fickett1996-aa"))
+
+    def test_batch_ingest_skips_sources_with_unchanged_fingerprint(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            self._write_template(root)
+            self._write_basic_bib(root)
+            source_path = root / "input.md"
+            source_path.write_text("---\ncitation-key: Fickett1996-aa\n---\nFinding genes by computer.", encoding="utf-8")
+            config = load_config(root)
+            sync_bibliography(config)
+            register_source(config, source_path)
+            extract_source(config, "Fickett1996-aa")
+
+            first = ingest_batch(config)
+            self.assertEqual([path.name for path in first.ingested], ["Fickett1996-aa_wiki.md"])
+            record = SourceRegistry.load(config.registry_file).get("Fickett1996-aa")
+            assert record is not None
+            self.assertTrue(record.ingest_fingerprint)
+
+            second = ingest_batch(config)
+            self.assertEqual(second.ingested, [])
+            self.assertEqual(second.skipped, ["Fickett1996-aa"])
+            self.assertEqual(len(ingest_batch(config, force=True).ingested), 1)
+
+            source_path.write_text("---\ncitation-key: Fickett1996-aa\n---\nFinding genes by computer, revised.", encoding="utf-8")
+            extract_source(config, "Fickett1996-aa")
+            self.assertEqual(len(ingest_batch(config).ingested), 1)
+
+            bib_path = root / "regex-tag.bib"
+            bib_path.write_text(bib_path.read_text(encoding="utf-8").replace("surveyed", "reviewed"), encoding="utf-8")
+            self.assertEqual(len(ingest_batch(config).ingested), 1)
+            self.assertEqual(ingest_batch(config).skipped, ["Fickett1996-aa"])
+
     def test_watch_folder_archives_success_and_failure(self):
         with tempfile.TemporaryDirectory() as tmpdir:
             root = Path(tmpdir)
@@ -120,6 +211,218 @@ class TestServiceWorkflow(unittest.TestCase):
             assert record is not None
             self.assertTrue(record.source_path.endswith("watch/processed/valid.md"))
 
+    def test_staged_watch_pipeline_processes_files_in_parallel_stages(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            self._write_template(root)
+            (root / "regex-tag.bib").write_text(
+                "".join(
+                    f"@ARTICLE{{Author{number}2001-aa, title = {{Study number {number} of genes}}, "
+                    f"author = {{Author{number}, Ann}}, date = {{2001}}}}\n"
+                    for number in range(6)
+                ),
+                encoding="utf-8",
+            )
+            (root / "config.yaml").write_text(
+                textwrap.dedent(
+                    """
+                    show_completion_dialog: false
+                    watch_dir: "watch"
+                    watch_pipeline:
+                      extract_workers: 2
+                      provider_workers: 2
+                      queue_size: 1
+                    """
+                ),
+                encoding="utf-8",
+            )
+            watch_dir = root / "watch"
+            watch_dir.mkdir()
+            for number in range(6):
+                (watch_dir / f"source-{number}.md").write_text(
+                    f"---\ncitation-key: Author{number}2001-aa\n---\nStudy number {number} of genes.",
+                    encoding="utf-8",
+                )
+            (watch_dir / "unknown.md").write_text("---\ncitation-key: Missing1999-xx\n---\nUnknown.", encoding="utf-8")
+
+            config = load_config(root)
+            self.assertEqual(config.watch_pipeline.extract_workers, 2)
+            summary = process_watch_folder(config)
+
+            self.assertEqual(summary.success_count, 6)
+            self.assertEqual(summary.fail_count, 1)
+            self.assertEqual(summary.markdown_count, 7)
+            self.assertTrue((root / "watch" / "other" / "unknown.md").exists())
+            registry = SourceRegistry.load(config.registry_file)
+            self.assertEqual(len(registry.by_state("ingested")), 6)
+            for number in range(6):
+                record = registry.get(f"Author{number}2001-aa")
+                assert record is not None
+                self.assertTrue(record.source_path.endswith(f"watch/processed/source-{number}.md"))
+                self.assertTrue((root / "wiki" / "sources" / f"Author{number}2001-aa_wiki.md").exists())
+
+    def test_watch_serve_processes_arrivals_and_resyncs_bibliography(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            self._write_template(root)
+            self._write_basic_bib(root)
+            (root / "config.yaml").write_text(
+                'show_completion_dialog: false\nwatch_serve:\n  settle_seconds: 0.1\n  poll_interval: 0.05\n',
+                encoding="utf-8",
+            )
+            config = load_config(root)
+            stop = threading.Event()
+            batches = []
+            messages = []
+            server = threading.Thread(
+                target=serve_watch_folder,
+                args=(config, stop),
+                kwargs={"on_batch": batches.append, "report": messages.append},
+            )
+            server.start()
+
+            def wait_for(condition) -> bool:
+                deadline = time.monotonic() + 10
+                while time.monotonic() < deadline:
+                    if condition():
+                        return True
+                    time.sleep(0.02)
+                return False
+
+            try:
+                self.assertTrue(wait_for(lambda: messages))
+                (config.watch_dir / "fickett.md").write_text(
+                    "---\ncitation-key: Fickett1996-aa\n---\nGene finding is surveyed.", encoding="utf-8"
+                )
+                self.assertTrue(wait_for(lambda: (config.processed_dir / "fickett.md").exists()))
+
+                with config.bibliography_file.open("a", encoding="utf-8") as handle:
+                    handle.write("\n@ARTICLE{Burge1997-aa,\n  title = {Prediction of complete gene structures},\n  date = {1997}\n}\n")
+                self.assertTrue(wait_for(lambda: any("Re-synced 2" in message for message in messages)))
+                (config.watch_dir / "burge.md").write_text(
+                    "---\ncitation-key: Burge1997-aa\n---\nGene structures are predicted.", encoding="utf-8"
+                )
+                self.assertTrue(wait_for(lambda: (config.processed_dir / "burge.md").exists()))
+            finally:
+                stop.set()
+                server.join(10)
+            self.assertFalse(server.is_alive())
+            self.assertEqual(sum(batch.success_count for batch in batches), 2)
+            self.assertTrue((config.wiki_sources_dir / "Burge1997-aa_wiki.md").exists())
+
+    def test_watch_run_resumes_from_journal_after_crash(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            self._write_template(root)
+            self._write_basic_bib(root)
+            (root / "config.yaml").write_text("show_completion_dialog: false\nwatch_dir: watch\nextraction_cache_max_mb: 0\n", encoding="utf-8")
+            watch_dir = root / "watch"
+            watch_dir.mkdir()
+            (watch_dir / "resume.md").write_text("---\ncitation-key: Fickett1996-aa\n---\nFinding genes by computer.", encoding="utf-8")
+            config = load_config(root)
+
+            with mock.patch("lit_wiki.service._publish_ingest", side_effect=KeyboardInterrupt):
+                with self.assertRaises(KeyboardInterrupt):
+                    process_watch_folder(config)
+            journal = WatchJournal.load(config.watch_journal_file)
+            self.assertEqual(journal.stage(watch_dir / "resume.md"), "generated")
+
+            with mock.patch("lit_wiki.service._extract_record", side_effect=AssertionError("re-extracted")), mock.patch(
+                "lit_wiki.service._generate_ingest", side_effect=AssertionError("re-generated")
+            ):
+                summary = process_watch_folder(config)
+
+            self.assertEqual(summary.success_count, 1)
+            self.assertTrue((root / "wiki" / "sources" / "Fickett1996-aa_wiki.md").exists())
+            self.assertFalse(config.watch_journal_file.exists())
+
+    def test_watch_run_replays_wiki_bookkeeping_lost_in_a_crash(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            self._write_template(root)
+            self._write_basic_bib(root)
+            (root / "config.yaml").write_text("show_completion_dialog: false\nwatch_dir: watch\nextraction_cache_max_mb: 0\n", encoding="utf-8")
+            watch_dir = root / "watch"
+            watch_dir.mkdir()
+            (watch_dir / "crash.md").write_text("---\ncitation-key: Fickett1996-aa\n---\nFinding genes by computer.", encoding="utf-8")
+            config = load_config(root)
+
+            with mock.patch("lit_wiki.wiki.WikiBatch.apply", side_effect=KeyboardInterrupt):
+                with self.assertRaises(KeyboardInterrupt):
+                    process_watch_folder(config)
+            self.assertFalse((watch_dir / "crash.md").exists())
+            self.assertFalse((root / "wiki" / "index.md").exists())
+            self.assertTrue(config.wiki_batch_file.exists())
+
+            summary = process_watch_folder(config)
+
+            self.assertEqual(summary.success_count, 0)
+            self.assertIn("sources/Fickett1996-aa_wiki.md", (root / "wiki" / "index.md").read_text(encoding="utf-8"))
+            self.assertIn("Fickett1996-aa", (root / "wiki" / "log.md").read_text(encoding="utf-8"))
+            self.assertFalse(config.wiki_batch_file.exists())
+
+    def test_chunk_summaries_are_reused_from_journal(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            self._write_template(root)
+            self._write_basic_bib(root)
+            (root / "config.yaml").write_text(
+                textwrap.dedent(
+                    """
+                    provider:
+                      primary:
+                        backend: "openai_compatible"
+                        model: "local-model"
+                        api_base: "http://127.0.0.1:9"
+                      budget:
+                        max_input_chars_per_request: 20
+                    """
+                ),
+                encoding="utf-8",
+            )
+            config = load_config(root)
+            journal = WatchJournal.load(config.watch_journal_file)
+            entry = PipelineSession(config).bibliography.get("Fickett1996-aa")
+            requests: list[dict] = []
+
+            def fake_request(provider, api_key, payload):
+                requests.append(payload)
+                if "chunk_index" in payload["messages"][1]["content"]:
+                    return {"bullet_points": ["a chunk bullet"]}
+                raise RuntimeError("final request failed")
+
+            text = "Finding genes by computer is discussed in detail across several chunks."
+            with mock.patch("lit_wiki.providers._openai_compatible_request", side_effect=fake_request):
+                with self.assertRaises(RuntimeError):
+                    providers._run_openai_compatible(config.primary_provider, config, entry, text, [], journal)
+                chunk_requests = len(requests) - 1
+                requests.clear()
+                resumed = WatchJournal.load(config.watch_journal_file)
+                with self.assertRaises(RuntimeError):
+                    providers._run_openai_compatible(config.primary_provider, config, entry, text, [], resumed)
+
+            self.assertEqual(chunk_requests, 4)
+            self.assertEqual(len(requests), 1)
+
+    def test_compaction_keeps_only_chunk_summaries_of_unfinished_items(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            stuck, finished = root / "stuck.md", root / "finished.md"
+            stuck.write_text("stuck", encoding="utf-8")
+            finished.write_text("finished", encoding="utf-8")
+            journal = WatchJournal.load(root / "watch_journal.jsonl")
+            journal.record(stuck, "prepared", citekey="Stuck2020-aa", raw_hash="a")
+            journal.record(finished, "prepared", citekey="Done2020-aa", raw_hash="b")
+            journal.record_chunk_summary("stuck-chunk", ["kept"], "Stuck2020-aa")
+            journal.record_chunk_summary("done-chunk", ["dropped"], "Done2020-aa")
+            journal.record(finished, "done")
+
+            journal.compact()
+            reloaded = WatchJournal.load(root / "watch_journal.jsonl")
+
+            self.assertEqual(reloaded.chunk_summaries, {"stuck-chunk": ["kept"]})
+            self.assertEqual(list(reloaded.unfinished()), [str(stuck)])
+
     def test_watch_folder_requests_fallback_and_approves_one_file(self):
         with tempfile.TemporaryDirectory() as tmpdir:
             root = Path(tmpdir)
@@ -178,6 +481,153 @@ class TestServiceWorkflow(unittest.TestCase):
             self.assertEqual(record.processing_state, "ingested")
             self.assertTrue(config.budget_ledger_file.exists())
 
+    def test_approved_fallback_rechecks_the_budget_before_running(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            self._write_basic_bib(root)
+            config = load_config(root)
+            session = PipelineSession(config)
+            entry = session.bibliography.get("Fickett1996-aa")
+            record = SourceRecord(
+                citekey="Fickett1996-aa",
+                source_path=str(root / "input.md"),
+                source_format="markdown",
+                raw_hash="abc",
+                match_reason="markdown citation-key",
+                confidence=1.0,
+                needs_review=False,
+            )
+            usage = ProviderUsage("fallback_api", "fallback-model", 1, 100, 50, 150)
+            request = ApprovalRequest(
+                "Fickett1996-aa", "input.md", "escalated", "local-model", "fallback_api", "fallback-model", 1, usage, 0, 0
+            )
+            outcome = GenerationOutcome(
+                status="needs_approval", sections=None, provider_name="", provider_model="", approval_request=request
+            )
+            # Another source's spend landed after this one was generated.
+            session.ledger["total_tokens"] = config.budget_policy.max_tokens_per_day
+
+            with mock.patch("lit_wiki.service.run_approved_fallback", side_effect=AssertionError("fallback ran")):
+                with self.assertRaisesRegex(ValueError, "daily token cap exceeded"):
+                    service._publish_ingest(config, IngestJob(entry, record, "text"), outcome, lambda request: "approve", session)
+            self.assertEqual((record.processing_state, record.escalation_reason), ("needs_review", "daily token cap exceeded"))
+
+    def _write_two_prompted_sources(self, root: Path):
+        self._write_template(root)
+        (root / "regex-tag.bib").write_text(
+            textwrap.dedent(
+                """
+                @ARTICLE{Fickett1996-aa,
+                  title = {Finding genes by computer - the state of the art},
+                  author = {Fickett, James W},
+                  date = {1996}
+                }
+                @ARTICLE{Burge1997-aa,
+                  title = {Prediction of complete gene structures in human genomic DNA},
+                  author = {Burge, Chris},
+                  date = {1997}
+                }
+                """
+            ),
+            encoding="utf-8",
+        )
+        (root / "config.yaml").write_text(
+            textwrap.dedent(
+                """
+                show_completion_dialog: false
+                watch_dir: "watch"
+                provider:
+                  primary:
+                    backend: "openai_compatible"
+                    model: "local-model"
+                    api_base: ""
+                  fallbacks:
+                    - name: "fallback_api"
+                      backend: "heuristic"
+                      model: "fallback-model"
+                  approval:
+                    required: true
+                    default_decision: "prompt"
+                watch_pipeline:
+                  provider_workers: 2
+                """
+            ),
+            encoding="utf-8",
+        )
+        watch_dir = root / "watch"
+        watch_dir.mkdir()
+        for name, citekey in (("fickett.md", "Fickett1996-aa"), ("burge.md", "Burge1997-aa")):
+            (watch_dir / name).write_text(
+                f"---\ncitation-key: {citekey}\n---\nGene finding by computer is discussed in detail.",
+                encoding="utf-8",
+            )
+        return load_config(root)
+
+    def test_watch_folder_defers_prompted_approvals_to_batch_review(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            config = self._write_two_prompted_sources(root)
+            with mock.patch("lit_wiki.watch.shutil.which", return_value=None), mock.patch(
+                "lit_wiki.service.resolve_fallback_approval"
+            ) as prompt:
+                summary = process_watch_folder(config)
+            prompt.assert_not_called()
+            self.assertEqual(summary.deferred_count, 2)
+            self.assertEqual(summary.success_count, 0)
+            self.assertEqual(sorted(path.name for path in config.pending_dir.iterdir()), ["burge.md", "fickett.md"])
+            pending = list_pending_approvals(config)
+            self.assertEqual(sorted(item.citekey for item in pending), ["Burge1997-aa", "Fickett1996-aa"])
+            self.assertEqual(pending[0].outcome.approval_request.fallback_provider, "fallback_api")
+
+            review = review_pending_approvals(config, approve=["Fickett1996-aa"], skip=["Burge1997-aa"])
+            self.assertEqual([path.name for path in review.ingested], ["Fickett1996-aa_wiki.md"])
+            self.assertEqual(review.skipped, ["Burge1997-aa"])
+            self.assertEqual(list_pending_approvals(config), [])
+            self.assertTrue((config.processed_dir / "fickett.md").exists())
+            self.assertTrue((config.other_dir / "burge.md").exists())
+            registry = SourceRegistry.load(config.registry_file)
+            approved = registry.get("Fickett1996-aa")
+            skipped = registry.get("Burge1997-aa")
+            assert approved is not None and skipped is not None
+            self.assertEqual((approved.processing_state, approved.provider), ("ingested", "fallback_api"))
+            self.assertEqual(approved.source_path, str(config.processed_dir / "fickett.md"))
+            self.assertEqual((skipped.processing_state, skipped.approval_decision), ("needs_review", "skip"))
+
+    def test_approval_review_carries_on_after_a_provider_error(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            config = self._write_two_prompted_sources(root)
+            with mock.patch("lit_wiki.watch.shutil.which", return_value=None):
+                process_watch_folder(config)
+            run_fallback = service.run_approved_fallback
+
+            def flaky_fallback(config, entry, *args, **kwargs):
+                if entry.citekey == "Fickett1996-aa":
+                    raise TimeoutError("fallback timed out")
+                return run_fallback(config, entry, *args, **kwargs)
+
+            with mock.patch("lit_wiki.service.run_approved_fallback", side_effect=flaky_fallback):
+                review = review_pending_approvals(config, approve=["Fickett1996-aa", "Burge1997-aa"], skip=[])
+
+            self.assertEqual([path.name for path in review.ingested], ["Burge1997-aa_wiki.md"])
+            self.assertIn("fallback timed out", review.failed["Fickett1996-aa"])
+            self.assertEqual(list_pending_approvals(config), [])
+            self.assertTrue((config.other_dir / "fickett.md").exists())
+            self.assertTrue((config.processed_dir / "burge.md").exists())
+            failed = SourceRegistry.load(config.registry_file).get("Fickett1996-aa")
+            assert failed is not None
+            self.assertEqual(failed.processing_state, "needs_review")
+            self.assertEqual(failed.source_path, str(config.other_dir / "fickett.md"))
+
+    def test_pending_approval_without_request_is_an_error(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config = load_config(Path(tmpdir))
+            registry = SourceRegistry.load(config.registry_file)
+            outcome = GenerationOutcome(status="needs_approval", sections=None, provider_name="", provider_model="")
+            registry.add_pending_approval(PendingApproval(citekey="Broken2020-aa", outcome=outcome))
+            with self.assertRaisesRegex(InvalidPendingApproval, "Broken2020-aa"):
+                list_pending_approvals(config)
+
     def test_watch_folder_skips_when_approval_denied(self):
         with tempfile.TemporaryDirectory() as tmpdir:
             root = Path(tmpdir)
@@ -383,3 +833,54 @@ class TestServiceWorkflow(unittest.TestCase):
             note_text = note_path.read_text(encoding="utf-8")
             self.assertIn("No bibliography-matched cited references found yet.", note_text)
             self.assertNotIn("[[@Future2022-aa]]", note_text)
+
+
+class TestSourceRegistry(unittest.TestCase):
+    def _record(self, citekey: str, processing_state: str) -> SourceRecord:
+        return SourceRecord(
+            citekey=citekey,
+            source_path=f"/tmp/{citekey}.md",
+            source_format="markdown",
+            raw_hash="abc",
+            match_reason="manual citekey",
+            confidence=1.0,
+            needs_review=False,
+            processing_state=processing_state,
+        )
+
+    def test_upsert_keeps_registration_time_and_indexes_state(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            registry = SourceRegistry.load(Path(tmpdir) / "source_registry.sqlite")
+            first = registry.upsert(self._record("Alpha2001-aa", "registered"))
+            registry.upsert(self._record("Beta2002-bb", "registered"))
+            updated = self._record("Alpha2001-aa", "ingested")
+            updated.registered_at = ""
+            registry.upsert(updated)
+
+            reopened = SourceRegistry.load(Path(tmpdir) / "source_registry.sqlite")
+            record = reopened.get("Alpha2001-aa")
+            assert record is not None
+            self.assertEqual(record.processing_state, "ingested")
+            self.assertEqual(record.registered_at, first.registered_at)
+            self.assertEqual([item.citekey for item in reopened.by_state("registered")], ["Beta2002-bb"])
+            self.assertEqual(list(reopened.records), ["Alpha2001-aa", "Beta2002-bb"])
+            self.assertIsNone(reopened.get("Missing1999-xx"))
+            with self.assertRaises(TypeError):
+                reopened.records["Gamma2003-cc"] = self._record("Gamma2003-cc", "registered")
+            self.assertFalse(hasattr(reopened, "save"))
+
+    def test_load_migrates_legacy_json_registry(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            legacy = self._record("Alpha2001-aa", "needs_review")
+            legacy.registered_at = "2024-01-01T00:00:00+00:00"
+            (root / "source_registry.json").write_text(
+                json.dumps({"sources": {legacy.citekey: legacy.as_dict()}}),
+                encoding="utf-8",
+            )
+
+            registry = SourceRegistry.load(root / "source_registry.sqlite")
+            record = registry.get("Alpha2001-aa")
+            assert record is not None
+            self.assertEqual(record.as_dict(), legacy.as_dict())
+            self.assertEqual([item.citekey for item in registry.by_state("needs_review")], ["Alpha2001-aa"])
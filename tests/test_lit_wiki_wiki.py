@@ -0,0 +1,94 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from lit_wiki.bibliography import BibliographyIndex
+from lit_wiki.config import load_config
+from lit_wiki.models import BibliographyEntry, PersonRecord
+from lit_wiki.wiki import (
+    WikiBatch,
+    _concept_index_line,
+    _entity_index_line,
+    _source_index_line,
+    _with_index_line,
+    _with_index_lines,
+    ensure_concept_pages,
+    ensure_person_pages,
+    update_index,
+    update_log,
+    update_overview,
+)
+
+
+def _entry(citekey: str, title: str, authors: list[str]) -> BibliographyEntry:
+    return BibliographyEntry(
+        citekey=citekey,
+        title=title,
+        entry_type="article",
+        year="2020",
+        date="2020",
+        abstract="",
+        keywords=[],
+        authors=[PersonRecord(display_name=name, wiki_link=f"[[{name}]]", surname=name.split()[-1]) for name in authors],
+    )
+
+
+class TestWikiBatch(unittest.TestCase):
+    def test_batched_index_lines_match_sequential_updates(self):
+        content = (
+            "# Wiki Index\n\n## Sources\n"
+            "- [Old title](sources/Doe2020-aa_wiki.md) — stale suffix\n\n"
+            "## Entities\n- [Jane Doe](entities/Jane Doe.md) — person\n"
+        )
+        entries = [
+            _entry("Doe2020-aa", "Old title", ["Jane Doe", "Max (Ed.) Roe"]),
+            _entry("Roe2021-bb", "Genes (revisited)", ["Max (Ed.) Roe"]),
+            _entry("Doe2020-aa", "Old title", ["Jane Doe"]),
+        ]
+        updates = []
+        for entry in entries:
+            updates.extend(_entity_index_line(person) for person in entry.authors)
+            updates.append(_concept_index_line("Gene Finding"))
+            updates.append(_source_index_line(entry))
+
+        expected = content
+        for update in updates:
+            expected = _with_index_line(expected, *update)
+        self.assertEqual(_with_index_lines(content, updates), expected)
+        self.assertIn("\n## Concepts\n- [Gene Finding](concepts/Gene Finding.md) — concept\n", expected)
+
+    def test_batch_writes_the_same_wiki_files_as_per_source_updates(self):
+        entries = [
+            _entry("Doe2020-aa", "Finding genes", ["Jane Doe"]),
+            _entry("Roe2021-bb", "Aligning sequences", ["Max Roe", "Jane Doe"]),
+        ]
+        bibliography = BibliographyIndex({entry.citekey: entry for entry in entries})
+        sections = {"see_also_links": ["[[Gene Finding]]", "[[@Doe2020-aa]]"]}
+        outputs = []
+        for batched in (False, True):
+            with tempfile.TemporaryDirectory() as tmpdir:
+                config = load_config(Path(tmpdir))
+                config.wiki_sources_dir.mkdir(parents=True)
+                batch = WikiBatch(config)
+                for entry in entries:
+                    (config.wiki_sources_dir / f"{entry.citekey}_wiki.md").write_text("note", encoding="utf-8")
+                    if batched:
+                        batch.add_source(entry, sections)
+                        continue
+                    ensure_person_pages(config, entry)
+                    ensure_concept_pages(config, entry, sections)
+                    update_index(config, entry)
+                    update_log(config, entry)
+                    update_overview(config, bibliography)
+                if batched:
+                    self.assertFalse((config.wiki_dir / "index.md").exists())
+                    batch.apply(bibliography)
+                outputs.append(
+                    {str(path.relative_to(config.wiki_dir)): path.read_text(encoding="utf-8") for path in config.wiki_dir.rglob("*.md")}
+                )
+        self.assertEqual(outputs[0], outputs[1])
+        self.assertIn("entities/Jane Doe.md", outputs[1])
+
+
+if __name__ == "__main__":
+    unittest.main()